@@ -8,7 +8,8 @@ LOG_FILE="logs/poller.log"
 case "$1" in
     start)
         echo "Starting NASCAR live data poller..."
-        python3 $POLLER_SCRIPT &
+        # Output is already in $LOG_FILE; don't let a full stdout pipe stall it
+        python3 $POLLER_SCRIPT > /dev/null 2>&1 &
         echo "Poller started in background (PID: $!)"
         echo "View logs: tail -f $LOG_FILE"
         ;;
@@ -23,10 +24,25 @@ case "$1" in
         echo "Restarting NASCAR live data poller..."
         pkill -f "livePoller.py"
         sleep 2
-        python3 $POLLER_script &
+        python3 $POLLER_SCRIPT > /dev/null 2>&1 &
         echo "Poller restarted (PID: $!)"
         ;;
 
+    reload)
+        echo "Telling poller to re-check schedules..."
+        pkill -HUP -f "livePoller.py"
+        ;;
+
+    force)
+        echo "Forcing poller into live polling (manual override)..."
+        pkill -USR1 -f "livePoller.py"
+        ;;
+
+    auto)
+        echo "Returning poller to schedule-driven polling..."
+        pkill -USR2 -f "livePoller.py"
+        ;;
+
     status)
         if pgrep -f "livePoller.py" > /dev/null; then
             PID=$(pgrep -f "livePoller.py")
@@ -67,12 +83,15 @@ case "$1" in
     *)
         echo "NASCAR Live Data Poller Management"
         echo ""
-        echo "Usage: ./poller.sh {start|stop|restart|status|logs|install|uninstall}"
+        echo "Usage: ./poller.sh {start|stop|restart|reload|force|auto|status|logs|install|uninstall}"
         echo ""
         echo "Commands:"
         echo "  start      - Start poller in background"
         echo "  stop       - Stop poller"
         echo "  restart    - Restart poller"
+        echo "  reload     - Re-check schedules now (after editing schedules/*.csv)"
+        echo "  force      - Start live polling regardless of schedule"
+        echo "  auto       - Return to schedule-driven polling"
         echo "  status     - Check if poller is running"
         echo "  logs       - View live logs"
         echo "  install    - Install as systemd service (auto-start on boot)"
@@ -1,10 +1,27 @@
 # pylon.py
+"""
+Terminal scoring pylon
 
+Two loops share one latest-value slot:
+
+- Ingest thread: reads the live snapshot, schedules and standings, decides
+  the mode and builds the idle layouts. Wakes on each new snapshot and
+  never touches the terminal, so slow disks or a bad standings file can't
+  stall the screen.
+- Render loop: paced by a monotonic FrameClock, takes whatever the slot
+  holds, scrolls and draws. It never does I/O and reports missed frames
+  and jitter in a footer.
+"""
+
+import threading
 import time
+from datetime import datetime
 
+from src.frameClock import FrameClock
 from src.layout import build_live_layout, build_points_layout, build_schedule_layout
+from src.liveSource import LiveDataSource, snapshot_version
 from src.loader import load_all_schedules, load_json
-from src.state import determine_state
+from src.state import get_mode_controller
 from src.views.cliView import (
     clear_position_history,
     render_live,
@@ -13,91 +30,210 @@ from src.views.cliView import (
 )
 
 SCROLL_DELAY = 2  # Seconds between screen updates
-scroll = 0
-last_mode = None
+INGEST_INTERVAL = 1  # Longest wait for a new snapshot before re-checking mode
+INGEST_RETRY = 1  # Seconds before retrying a failed ingest pass
+
+mode_controller = get_mode_controller()
+live_source = LiveDataSource()  # Pushed by the poller, or read from liveRace.json
+
+
+class LatestValue:
+    """
+    Single-writer slot holding only the newest value
+
+    publish() swaps in a new (seq, value) tuple with one reference
+    assignment, which is atomic under the GIL - neither side ever waits
+    on the other and old values are simply dropped.
+    """
+
+    def __init__(self):
+        self._item = (0, None)
 
-print("=" * 60)
-print("NASCAR SCORING PYLON")
-print("=" * 60)
-print("🔍 Auto-detecting race status...")
-print("Press Ctrl+C to stop\n")
+    def publish(self, value):
+        self._item = (self._item[0] + 1, value)
 
-while True:
+    def get(self):
+        """(seq, value) - seq is 0 until the first publish"""
+        return self._item
+
+
+def empty_state(mode=None, live_data=None):
+    return {
+        "mode": mode,
+        "live": live_data,
+        "points": None,
+        "pointsError": None,
+        "schedule": None,
+        "scheduleError": None,
+        "error": None,
+        "updated": snapshot_time(live_data),
+    }
+
+
+def snapshot_time(live_data):
+    """Epoch seconds of the snapshot's lastUpdate, None if it has none"""
     try:
-        # Load schedules
-        schedules = load_all_schedules()
+        return datetime.fromisoformat(live_data["lastUpdate"]).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def ingest_once():
+    """One pass over the data sources; returns the new display state"""
+    schedules = load_all_schedules()
+    live_data = live_source.get()
+    mode = mode_controller.get_mode(live_data, schedules)
+    state = empty_state(mode, live_data)
 
-        # Try to load live race data
+    if mode == "IDLE":
         try:
-            liveData = load_json("liveRace.json")
-        except:
-            liveData = None
+            state["points"] = build_points_layout(load_json("standings.json"))
+        except Exception as e:
+            state["pointsError"] = str(e)
+        try:
+            state["schedule"] = build_schedule_layout(schedules)
+        except Exception as e:
+            state["scheduleError"] = str(e)
+
+    return state
+
+
+def ingest_loop(slot, stopped):
+    """Keep the slot current; errors are reported through the state"""
+    state = None
+    while not stopped.is_set():
+        try:
+            state = ingest_once()
+            slot.publish(state)
+            live_source.wait_for_change(snapshot_version(state["live"]), INGEST_INTERVAL)
+        except Exception as e:
+            # Keep showing the last good state, flag the problem
+            state = dict(state or empty_state(), error=str(e))
+            slot.publish(state)
+            stopped.wait(INGEST_RETRY)
+
 
-        # Auto-detect current mode
-        MODE = determine_state(liveData, schedules)
+class Renderer:
+    """Draws one frame per clock tick from the latest state"""
+
+    def __init__(self):
+        self.scroll = 0
+        self.last_mode = None
+
+    def frame(self, state):
+        mode = state["mode"]
 
         # Clear position history when switching modes
-        if MODE != last_mode:
+        if mode != self.last_mode:
             clear_position_history()
-            if last_mode is not None:  # Don't print on startup
-                print(f"\n{'=' * 60}")
-                print(f"🔄 Mode changed: {last_mode} → {MODE}")
+            if self.last_mode is not None:  # Don't print on startup
+                print(f"{'=' * 60}")
+                print(f"🔄 Mode changed: {self.last_mode} → {mode}")
                 print(f"{'=' * 60}\n")
-            last_mode = MODE
+            self.last_mode = mode
+            self.scroll = 0
 
         # ===== LIVE MODE =====
-        if MODE == "LIVE":
-            if not liveData:
+        if mode == "LIVE":
+            live_data = state["live"]
+            if not live_data:
                 print("⚠️  LIVE mode detected but no data file available")
                 print("   Waiting for live race data...")
-                time.sleep(5)
-                continue
+                return
+
+            total_cars = len(live_data.get("cars", []))
+            if total_cars <= 10 or self.scroll >= total_cars - 10:
+                self.scroll = 0
 
-            layout = build_live_layout(liveData, scrollOffset=scroll, visibleRows=10)
+            layout = build_live_layout(live_data, scrollOffset=self.scroll, visibleRows=10)
             render_live(layout)
 
             # Handle scrolling for positions 11+
-            total_cars = len(liveData.get("cars", []))
             if total_cars > 10:
-                scroll += 1
-                if scroll >= total_cars - 10:
-                    scroll = 0
-            else:
-                scroll = 0
+                self.scroll = (self.scroll + 1) % (total_cars - 10)
 
         # ===== IDLE MODE =====
-        elif MODE == "IDLE":
+        elif mode == "IDLE":
             # Alternate between points and schedule every 10 seconds
             cycle_time = int(time.time() / 10) % 2
 
             if cycle_time == 0:
-                # Show points standings
-                try:
-                    data = load_json("standings.json")
-                    layout = build_points_layout(data)
-                    render_points(layout)
-                except Exception as e:
-                    print(f"⚠️  Error loading standings: {e}")
+                if state["points"]:
+                    render_points(state["points"])
+                else:
+                    print(f"⚠️  Error loading standings: {state['pointsError']}")
                     print("   Check that data/standings.json exists")
             else:
-                # Show schedule
-                try:
-                    layout = build_schedule_layout(schedules)
-                    render_schedule(layout)
-                except Exception as e:
-                    print(f"⚠️  Error loading schedule: {e}")
+                if state["schedule"]:
+                    render_schedule(state["schedule"])
+                else:
+                    print(f"⚠️  Error loading schedule: {state['scheduleError']}")
+
+
+def format_age(seconds):
+    seconds = max(seconds, 0)
+    if seconds < 120:
+        return f"{seconds:.0f}s"
+    if seconds < 7200:
+        return f"{seconds / 60:.0f}m"
+    return f"{seconds / 3600:.0f}h"
+
+
+def render_footer(clock, state):
+    stats = clock.stats()
+    # Age of the snapshot itself - a stalled poller shows up here even
+    # though the ingest thread keeps re-reading the same file
+    updated = state["updated"]
+    data = "no live data" if updated is None else f"data {format_age(time.time() - updated)} old"
+    line = (
+        f"frame {stats['frames']}  missed {stats['missed']}  "
+        f"jitter p95 {stats['jitterP95Ms']:.1f} ms  {data}"
+    )
+    print(f"\n\033[2m{line}\033[0m")
+    if state["error"]:
+        print(f"⚠️  Data refresh failing: {state['error']}")
+
+
+def main():
+    print("=" * 60)
+    print("NASCAR SCORING PYLON")
+    print("=" * 60)
+    print("🔍 Auto-detecting race status...")
+    print("Press Ctrl+C to stop\n")
+
+    slot = LatestValue()
+    stopped = threading.Event()
+    threading.Thread(target=ingest_loop, args=(slot, stopped), daemon=True).start()
+
+    clock = FrameClock(1 / SCROLL_DELAY)
+    renderer = Renderer()
+
+    # Nothing to draw until the first ingest pass lands
+    while slot.get()[1] is None:
+        time.sleep(0.05)
 
-        # Update display
-        time.sleep(SCROLL_DELAY)
-        print("\033c", end="")  # Clear screen
+    try:
+        while True:
+            clock.wait()
+            state = slot.get()[1]
+            print("\033c", end="")  # Clear screen
+            try:
+                renderer.frame(state)
+            except Exception as e:
+                print(f"\n❌ Unexpected error: {e}")
+            render_footer(clock, state)
 
     except KeyboardInterrupt:
+        stopped.set()
+        stats = clock.stats()
         print("\n\n" + "=" * 60)
         print("🏁 Shutting down NASCAR Pylon...")
+        print(
+            f"   {stats['frames']} frames, {stats['missed']} missed, "
+            f"jitter p95 {stats['jitterP95Ms']:.1f} ms / max {stats['jitterMaxMs']:.1f} ms"
+        )
         print("=" * 60)
-        break
 
-    except Exception as e:
-        print(f"\n❌ Unexpected error: {e}")
-        print("   Retrying in 5 seconds...")
-        time.sleep(5)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+# src/driverRegistry.py
+"""
+Driver identity
+
+One place that knows who is driving which car. Built from the NASCAR
+points feeds (tools/autoUpdateStandings.py refreshes it) and stored in
+data/drivers.json. Loaded once into indexed structures:
+
+- by NASCAR driver id
+- by car number, per series (numbers are reused across series)
+- by normalized full name and last name (for scraped sources)
+
+Keys are interned when the registry is built, so lookups from the live
+feed (car number strings, integer driver ids) are plain dict hits with
+no per-row normalization. Name normalization is only for sources that
+have nothing better than a name.
+"""
+
+import json
+import re
+import sys
+import unicodedata
+
+from .fileUtils import atomic_write_json
+from .loader import DATA_DIR
+
+REGISTRY_FILE = DATA_DIR / "drivers.json"
+
+_NAME_SUFFIXES = {"jr", "sr", "ii", "iii", "iv"}
+_NON_ALNUM = re.compile(r"[^a-z0-9 ]+")
+
+
+def normalize_name(name):
+    """
+    Canonical form of a driver name for matching
+
+    "Ricky Stenhouse Jr." -> "ricky stenhouse", "Daniel Suárez" ->
+    "daniel suarez", "Ty Dillon(i)" -> "ty dillon"
+    """
+    name = (name or "").replace("(i)", " ")
+    name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    words = _NON_ALNUM.sub(" ", name.lower()).split()
+    while len(words) > 1 and words[-1] in _NAME_SUFFIXES:
+        words.pop()
+    return sys.intern(" ".join(words))
+
+
+class Driver:
+    """One driver's identity (immutable once registered)"""
+
+    __slots__ = ("driverId", "series", "car", "firstName", "lastName", "fullName", "key")
+
+    def __init__(self, driverId, series, car, firstName, lastName):
+        self.driverId = driverId
+        self.series = sys.intern(series)
+        self.car = sys.intern(str(car))
+        self.firstName = sys.intern(firstName or "")
+        self.lastName = sys.intern(lastName or "")
+        self.fullName = sys.intern(f"{self.firstName} {self.lastName}".strip())
+        # Stable join key: the NASCAR id, or (series, car) for unknown drivers
+        self.key = driverId if driverId is not None else (self.series, self.car)
+
+    def to_dict(self):
+        return {
+            "driverId": self.driverId,
+            "series": self.series,
+            "car": self.car,
+            "firstName": self.firstName,
+            "lastName": self.lastName,
+        }
+
+    def __repr__(self):
+        return f"Driver({self.driverId}, {self.series} #{self.car} {self.fullName})"
+
+
+class DriverRegistry:
+    """Indexed driver identities, reloaded when data/drivers.json changes"""
+
+    def __init__(self, path=REGISTRY_FILE):
+        self.path = path
+        self.updated = None
+        self._mtime = None
+        self._clear()
+
+    def _clear(self):
+        self.by_id = {}  # driverId -> Driver
+        self.by_car = {}  # series -> {car number -> Driver}
+        self.by_name = {}  # normalized full name -> [Driver]
+        self.by_last = {}  # normalized last name -> [Driver]
+
+    def __len__(self):
+        return sum(len(cars) for cars in self.by_car.values())
+
+    # -------------------------
+    # Building
+    # -------------------------
+
+    def add(self, driver):
+        """
+        Index one driver
+
+        Replaces the same driver's entry in that series (changed cars) and
+        whoever had that car in that series. Drivers running several
+        series have one entry per series sharing the same id.
+        """
+        cars = self.by_car.setdefault(driver.series, {})
+        if driver.driverId is not None:
+            for other in list(cars.values()):
+                if other.driverId == driver.driverId:
+                    self._unindex(other)
+        previous = cars.get(driver.car)
+        if previous is not None:
+            self._unindex(previous)
+
+        if driver.driverId is not None:
+            self.by_id[driver.driverId] = driver
+        cars[driver.car] = driver
+        self.by_name.setdefault(normalize_name(driver.fullName), []).append(driver)
+        self.by_last.setdefault(normalize_name(driver.lastName), []).append(driver)
+
+    def _unindex(self, driver):
+        if self.by_id.get(driver.driverId) is driver:
+            # Fall back to the same driver's entry in another series
+            others = [
+                d for cars in self.by_car.values() for d in cars.values()
+                if d.driverId == driver.driverId and d is not driver
+            ]
+            if others:
+                self.by_id[driver.driverId] = others[0]
+            else:
+                del self.by_id[driver.driverId]
+        cars = self.by_car.get(driver.series, {})
+        if cars.get(driver.car) is driver:
+            del cars[driver.car]
+        for index, name in ((self.by_name, driver.fullName), (self.by_last, driver.lastName)):
+            bucket = index.get(normalize_name(name), [])
+            if driver in bucket:
+                bucket.remove(driver)
+
+    def load_data(self, data):
+        """Rebuild the indexes from a drivers.json document"""
+        self._clear()
+        for row in data.get("drivers", []):
+            self.add(Driver(
+                row.get("driverId"), row["series"], row["car"],
+                row.get("firstName"), row.get("lastName"),
+            ))
+        self.updated = data.get("updated")
+
+    def to_data(self):
+        drivers = sorted(
+            {id(d): d for cars in self.by_car.values() for d in cars.values()}.values(),
+            key=lambda d: (d.series, d.car),
+        )
+        return {"updated": self.updated, "drivers": [d.to_dict() for d in drivers]}
+
+    def update_from_points_feed(self, series, feed):
+        """
+        Merge one series' points feed rows (car_no, driver_id, names)
+
+        Returns:
+            int: number of drivers added or changed
+        """
+        changed = 0
+        for row in feed or []:
+            car = row.get("car_no")
+            if not car:
+                continue
+            driverId = row.get("driver_id")
+            first = row.get("driver_first_name", "")
+            last = row.get("driver_last_name") or row.get("driver_name", "")
+            existing = self.by_car.get(series, {}).get(str(car))
+            if (
+                existing is not None
+                and existing.driverId == driverId
+                and existing.lastName == last
+                and (existing.firstName == first or not first)
+            ):
+                continue
+            if not first and existing is not None and existing.driverId == driverId:
+                first = existing.firstName
+            self.add(Driver(driverId, series, car, first, last))
+            changed += 1
+        return changed
+
+    def save(self, updated=None):
+        self.updated = updated or self.updated
+        atomic_write_json(self.path, self.to_data())
+        try:
+            self._mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            pass
+
+    @property
+    def version(self):
+        """Changes whenever the registry is reloaded (for dependent caches)"""
+        return self._mtime
+
+    def refresh(self):
+        """Reload from disk only when the file has changed"""
+        try:
+            mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            return False
+
+        if mtime != self._mtime:
+            try:
+                with open(self.path) as f:
+                    self.load_data(json.load(f))
+                self._mtime = mtime
+            except (OSError, ValueError):
+                return False
+        return True
+
+    # -------------------------
+    # Lookups
+    # -------------------------
+
+    def resolve(self, series, car=None, driverId=None):
+        """
+        Driver for a live/standings row: series + car, checked against the
+        driver id when one is given (falls back to the id alone if the car
+        changed hands since the registry was refreshed)
+
+        Returns:
+            Driver or None
+        """
+        if car is not None:
+            driver = self.by_car.get(series, {}).get(car)
+            if driver is not None and (driverId is None or driver.driverId in (None, driverId)):
+                return driver
+        if driverId is not None:
+            return self.by_id.get(driverId)
+        return None
+
+    def key(self, series, car=None, driverId=None):
+        """
+        Join key for a row: the registered driver's key, else (series, car)
+
+        An id the registry doesn't know is not used on its own - the other
+        side of a join (standings without ids, or live data with them)
+        would key the same driver by car number and never match.
+        """
+        driver = self.resolve(series, car, driverId)
+        if driver is not None:
+            return driver.key
+        if car is None:
+            return driverId
+        return (series, car)
+
+    def find_name(self, name, series=None):
+        """
+        Driver for a free-text name (scraped pages)
+
+        Full-name matches win; a last name alone only matches when it is
+        unambiguous within the series ("Dillon" is not, "Ty Dillon" is).
+        """
+        normalized = normalize_name(name)
+        for index in (self.by_name, self.by_last):
+            candidates = {
+                d.key: d for d in index.get(normalized, ())
+                if series is None or d.series == series
+            }
+            if len(candidates) == 1:
+                return next(iter(candidates.values()))
+            if candidates:
+                return None  # Ambiguous
+        return None
+
+
+_registry = None
+
+
+def get_registry():
+    """Process-wide registry, re-checked against data/drivers.json on each call"""
+    global _registry
+    if _registry is None:
+        _registry = DriverRegistry()
+    _registry.refresh()
+    return _registry
@@ -0,0 +1,25 @@
+# src/fileUtils.py
+
+import json
+import os
+from pathlib import Path
+
+
+def atomic_write_text(path, text, encoding="utf-8"):
+    """
+    Write a file so readers only ever see the old or the new contents
+
+    The data goes to a temp file in the same directory which is then
+    renamed over the target (rename is atomic on POSIX and Windows).
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    with open(tmp, "w", encoding=encoding) as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def atomic_write_json(path, data, indent=2):
+    """Serialize data to JSON and write it atomically"""
+    atomic_write_text(path, json.dumps(data, indent=indent))
@@ -0,0 +1,73 @@
+# src/frameClock.py
+"""
+Fixed-rate frame scheduling
+
+Deadlines are laid out on the monotonic clock (start + n * period) rather
+than sleeping a fixed amount after each frame, so time spent rendering
+doesn't accumulate as drift. A frame that finishes too late to make the
+next deadline skips ahead and counts the deadlines it missed.
+"""
+
+import time
+from collections import deque
+
+JITTER_SAMPLES = 600  # Lateness samples kept for the stats
+
+
+class FrameClock:
+    """Paces a render loop at `fps` and tracks missed frames and jitter"""
+
+    def __init__(self, fps, clock=time.monotonic, sleep=time.sleep):
+        self.fps = fps
+        self.period = 1.0 / fps
+        self.clock = clock
+        self.sleep = sleep
+        self.frames = 0
+        self.missed = 0
+        self.lateness = deque(maxlen=JITTER_SAMPLES)  # Seconds past each deadline
+        self.started = None
+        self._deadline = None
+
+    def wait(self):
+        """
+        Sleep until the next frame deadline
+
+        Returns:
+            int: deadlines skipped because the previous frame overran
+        """
+        now = self.clock()
+        if self._deadline is None:
+            self.started = self._deadline = now
+
+        remaining = self._deadline - now
+        if remaining > 0:
+            self.sleep(remaining)
+            now = self.clock()
+
+        late = now - self._deadline
+        self.lateness.append(late)
+        skipped = int(late // self.period)
+        self.missed += skipped
+        self._deadline += (skipped + 1) * self.period
+        self.frames += 1
+        return skipped
+
+    def stats(self):
+        """Frame count, achieved rate, missed frames and jitter (ms)"""
+        late = sorted(self.lateness)
+        elapsed = (self.clock() - self.started) if self.started is not None else 0.0
+
+        def pct(p):
+            if not late:
+                return 0.0
+            return late[min(int(len(late) * p / 100), len(late) - 1)] * 1000
+
+        return {
+            "fps": self.fps,
+            "frames": self.frames,
+            "actualFps": self.frames / elapsed if elapsed > 0 else 0.0,
+            "missed": self.missed,
+            "jitterP50Ms": pct(50),
+            "jitterP95Ms": pct(95),
+            "jitterMaxMs": late[-1] * 1000 if late else 0.0,
+        }
@@ -0,0 +1,344 @@
+# src/gapHistory.py
+"""
+Gap-to-leader history for charts
+
+GapHistory keeps one row per snapshot in a dense [polls x cars] float32
+matrix (grown by doubling, so recording a snapshot is one row write). A
+chart doesn't need every poll - a 500-lap race is thousands of points per
+car - so downsample() reduces the whole field with
+Largest-Triangle-Three-Buckets to a fixed point budget, and SeriesCache
+keeps the encoded result per (race, snapshot version, budget).
+
+Finished races can be charted from their archive (src/raceArchive.py)
+through GapHistory.from_archive().
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+import numpy as np
+
+from .liveSource import snapshot_version
+from .raceArchive import ARCHIVE_DIR, open_race_archive, race_identity, race_key
+
+DEFAULT_BUDGET = 200  # Points per car when the request doesn't say
+MAX_BUDGET = 1000
+MIN_BUDGET = 3  # First, last and at least one bucket
+CACHE_SIZE = 32  # Encoded series kept (races x versions x budgets)
+INITIAL_ROWS = 256
+INITIAL_CARS = 48
+FOLLOW_INTERVAL = 5  # Longest wait for a snapshot before re-checking
+NEW_RACE_GAP = 6 * 3600  # Seconds without snapshots after which the same track is a new race
+
+
+def lttb(x, y, budget):
+    """
+    Largest-Triangle-Three-Buckets over every column of y at once
+
+    All columns share x, so bucket boundaries are shared and each bucket
+    is one vectorized step across the field. NaNs (car not scored) are
+    forward-filled for the selection; the chosen rows are reported as-is
+    and callers drop the NaN ones.
+
+    Args:
+        x: [n] increasing sample positions
+        y: [n x cars] values
+        budget: points to keep per column
+
+    Returns:
+        [points x cars] row indices into y (points = min(n, budget))
+    """
+    n, ncols = y.shape
+    if n <= budget:
+        return np.repeat(np.arange(n)[:, None], ncols, axis=1)
+
+    filled = _fill_missing(np.asarray(y, dtype=np.float64))
+    x = np.asarray(x, dtype=np.float64)
+    cols = np.arange(ncols)
+
+    # budget - 2 buckets between the fixed first and last rows
+    edges = np.linspace(1, n - 1, budget - 1).astype(np.int64)
+    selected = np.empty((budget, ncols), dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    prev_x = np.full(ncols, x[0])
+    prev_y = filled[0]
+    for b in range(budget - 2):
+        lo, hi = edges[b], edges[b + 1]
+        if b + 2 < len(edges):
+            next_lo, next_hi = edges[b + 1], edges[b + 2]
+        else:
+            next_lo, next_hi = n - 1, n
+        avg_x = x[next_lo:next_hi].mean()
+        avg_y = filled[next_lo:next_hi].mean(axis=0)
+
+        bucket_x = x[lo:hi, None]
+        area = np.abs(
+            (prev_x - avg_x) * (filled[lo:hi] - prev_y)
+            - (prev_x - bucket_x) * (avg_y - prev_y)
+        )
+        pick = lo + area.argmax(axis=0)
+        selected[b + 1] = pick
+        prev_x = x[pick]
+        prev_y = filled[pick, cols]
+
+    return selected
+
+
+def _fill_missing(y):
+    """Forward-fill NaNs down each column (leading NaNs take the first value)"""
+    valid = ~np.isnan(y)
+    rows = np.where(valid, np.arange(len(y))[:, None], 0)
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    filled = np.take_along_axis(y, rows, axis=0)
+
+    first = valid.argmax(axis=0)
+    leading = np.arange(len(y))[:, None] < first
+    filled = np.where(leading, y[first, np.arange(y.shape[1])], filled)
+    return np.nan_to_num(filled, nan=0.0)  # Columns that are all NaN
+
+
+class GapHistory:
+    """Per-car gap to leader for one race, one row per snapshot"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._follower = None
+        self.reset()
+
+    def reset(self, race=None, identity=None):
+        self.race = race
+        self.identity = identity  # (series, track) the race key was pinned for
+        self.version = ""
+        self.cars = []  # Column -> car number
+        self.drivers = []  # Column -> latest driver name
+        self._columns = {}  # car number -> column
+        self._rows = 0
+        self._times = np.empty(INITIAL_ROWS, dtype=np.float64)
+        self._laps = np.empty(INITIAL_ROWS, dtype=np.int16)
+        self._gaps = np.full((INITIAL_ROWS, INITIAL_CARS), np.nan, dtype=np.float32)
+        self._start = None
+
+    def __len__(self):
+        return self._rows
+
+    def record(self, snapshot, now=None):
+        """
+        Add one live snapshot (ignored if its version was already recorded)
+
+        Returns:
+            bool: True if a row was added
+        """
+        version = snapshot_version(snapshot)
+        if not snapshot or not snapshot.get("cars") or version == self.version:
+            return False
+
+        with self._lock:
+            now = _snapshot_time(snapshot) if now is None else now
+            # The key is pinned at a race's first snapshot, so a race that
+            # runs past midnight keeps its history
+            identity = race_identity(snapshot)
+            last = self._start + self._times[self._rows - 1] if self._rows else None
+            if identity != self.identity or (last is not None and now - last > NEW_RACE_GAP):
+                self.reset(race_key(snapshot), identity)
+
+            row = self._rows
+            if row == len(self._times):
+                self._grow_rows()
+            for car in snapshot["cars"]:
+                number = str(car.get("car", ""))
+                column = self._columns.get(number)
+                if column is None:
+                    column = self._add_column(number)
+                self.drivers[column] = car.get("driver")
+                interval = car.get("interval")
+                if car.get("position") == 1:
+                    interval = 0.0  # The leader has no interval
+                # Lapped cars report laps down as a negative delta - not a time gap
+                if interval is not None and interval >= 0:
+                    self._gaps[row, column] = interval
+
+            if self._start is None:
+                self._start = now
+            self._times[row] = now - self._start
+            self._laps[row] = snapshot.get("lap", 0) or 0
+            self._rows = row + 1
+            self.version = version
+        return True
+
+    def _add_column(self, number):
+        column = len(self.cars)
+        if column == self._gaps.shape[1]:
+            grown = np.full((self._gaps.shape[0], column * 2), np.nan, dtype=np.float32)
+            grown[:, :column] = self._gaps
+            self._gaps = grown
+        self._columns[number] = column
+        self.cars.append(number)
+        self.drivers.append(None)
+        return column
+
+    def _grow_rows(self):
+        size = len(self._times) * 2
+        self._times = np.resize(self._times, size)
+        self._laps = np.resize(self._laps, size)
+        grown = np.full((size, self._gaps.shape[1]), np.nan, dtype=np.float32)
+        grown[:self._rows] = self._gaps[:self._rows]
+        self._gaps = grown
+
+    def matrices(self):
+        """
+        Copy of the recorded history
+
+        Returns:
+            dict with race, version, cars, drivers, times [polls] (seconds
+            since the first poll), laps [polls] and gaps [polls x cars]
+        """
+        with self._lock:
+            rows, ncars = self._rows, len(self.cars)
+            return {
+                "race": self.race,
+                "version": self.version,
+                "cars": list(self.cars),
+                "drivers": list(self.drivers),
+                "times": self._times[:rows].copy(),
+                "laps": self._laps[:rows].copy(),
+                "gaps": self._gaps[:rows, :ncars].copy(),
+            }
+
+    def follow(self, source):
+        """
+        Record every snapshot `source` (a LiveDataSource) delivers, in a
+        thread - started once, later calls are no-ops
+        """
+        def run():
+            while True:
+                try:
+                    data = source.wait_for_change(self.version, FOLLOW_INTERVAL)
+                    self.record(data)
+                except Exception as e:
+                    print(f"⚠️  Gap history: {e}")
+                    time.sleep(FOLLOW_INTERVAL)
+
+        with self._lock:
+            if self._follower is None:
+                self._follower = threading.Thread(target=run, daemon=True)
+                self._follower.start()
+        return self
+
+    @staticmethod
+    def from_archive(archive):
+        """History matrices (as matrices() returns) for an archived race"""
+        times = np.asarray(archive["timestamps"], dtype=np.float64)
+        gaps = np.array(archive["gap"], dtype=np.float32)
+        position = np.asarray(archive["position"])
+        gaps[position == 1] = 0.0
+        gaps[gaps < 0] = np.nan
+        return {
+            "race": archive.name,
+            "version": "archive",
+            "cars": list(archive.cars),
+            "drivers": [None] * len(archive.cars),
+            "times": times - times[0] if len(times) else times,
+            "laps": np.asarray(archive["lap"]),
+            "gaps": gaps,
+        }
+
+
+def _snapshot_time(snapshot):
+    try:
+        return datetime.fromisoformat(snapshot["lastUpdate"]).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return datetime.now().timestamp()
+
+
+def clamp_budget(budget):
+    if budget is None:
+        return DEFAULT_BUDGET
+    return max(MIN_BUDGET, min(int(budget), MAX_BUDGET))
+
+
+def downsample(history, budget):
+    """
+    LTTB-downsampled series for every car
+
+    Args:
+        history: dict as returned by GapHistory.matrices()
+
+    Returns:
+        dict with race, version, budget, polls and per car the driver and
+        parallel t (seconds since the first poll) / lap / gap lists
+    """
+    times, laps, gaps = history["times"], history["laps"], history["gaps"]
+    cars = {}
+    if len(times) and gaps.shape[1]:
+        selected = lttb(times, gaps, budget)
+        for column, number in enumerate(history["cars"]):
+            rows = selected[:, column]
+            rows = rows[~np.isnan(gaps[rows, column])]
+            if not len(rows):
+                continue
+            cars[number] = {
+                "driver": history["drivers"][column],
+                "t": np.round(times[rows], 1).tolist(),
+                "lap": laps[rows].tolist(),
+                "gap": np.round(gaps[rows, column].astype(np.float64), 3).tolist(),
+            }
+
+    return {
+        "race": history["race"],
+        "version": history["version"],
+        "budget": budget,
+        "polls": int(len(times)),
+        "cars": cars,
+    }
+
+
+class SeriesCache:
+    """Small LRU of encoded downsampled series keyed by (race, version, budget)"""
+
+    def __init__(self, encode, size=CACHE_SIZE):
+        self.encode = encode
+        self.size = size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, race, version, budget, load):
+        """
+        Encoded series for the key, calling load() for the history on a miss
+        """
+        key = (race, version, budget)
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return body
+
+        body = self.encode(downsample(load(), budget))
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = body
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        return body
+
+
+def archive_path(race, archive_dir=ARCHIVE_DIR):
+    """Path of an archived race, or None for names that aren't race keys"""
+    if not race or not re.fullmatch(r"[\w.-]+", race):
+        return None
+    path = archive_dir / f"{race}.npz"
+    return path if path.exists() else None
+
+
+def load_archived_history(race, archive_dir=ARCHIVE_DIR):
+    path = archive_path(race, archive_dir)
+    if path is None:
+        return None
+    return GapHistory.from_archive(open_race_archive(path))
@@ -0,0 +1,76 @@
+# src/heartbeat.py
+"""
+Poller heartbeat
+
+A tiny status record the poller rewrites on every poll (and on each idle
+wakeup) so health checks don't have to parse liveRace.json.
+"""
+
+import json
+import time
+
+from .fileUtils import atomic_write_text
+from .loader import DATA_DIR
+
+HEARTBEAT_FILE = DATA_DIR / "heartbeat.json"
+STALE_AFTER = 30  # Seconds without a successful poll before data counts as stale
+
+
+def publish_heartbeat(record, path=HEARTBEAT_FILE):
+    """Atomically write the heartbeat record (adds the write time)"""
+    record = dict(record, updated=time.time())
+    atomic_write_text(path, json.dumps(record, separators=(",", ":")))
+
+
+class HeartbeatReader:
+    """
+    Cached view of the poller heartbeat
+
+    The file is only re-read when its mtime changes, so serving a status
+    request costs a single stat() call.
+    """
+
+    def __init__(self, path=HEARTBEAT_FILE):
+        self.path = path
+        self.record = None
+        self._mtime = None
+
+    def read(self):
+        """Latest heartbeat record, or None if the poller never wrote one"""
+        try:
+            mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            self.record, self._mtime = None, None
+            return None
+
+        if mtime != self._mtime:
+            try:
+                with open(self.path) as f:
+                    self.record = json.load(f)
+                self._mtime = mtime
+            except (OSError, ValueError):
+                pass  # Keep the previous record
+        return self.record
+
+    def status(self, now=None):
+        """
+        Heartbeat plus derived ages
+
+        dataAge: seconds since the last successful poll
+        heartbeatAge: seconds since the poller last wrote anything
+        """
+        if now is None:
+            now = time.time()
+
+        record = self.read()
+        if record is None:
+            return {"poller": "unknown", "dataAge": None, "stale": True}
+
+        lastSuccess = record.get("lastSuccessEpoch")
+        dataAge = round(now - lastSuccess, 1) if lastSuccess else None
+
+        status = dict(record)
+        status["dataAge"] = dataAge
+        status["heartbeatAge"] = round(now - record.get("updated", now), 1)
+        status["stale"] = dataAge is None or dataAge > STALE_AFTER
+        return status
@@ -0,0 +1,177 @@
+# src/lapStore.py
+"""
+Append-only lap times per car
+
+The lap-times feed repeats every lap of every car on each fetch. Instead
+of rebuilding per-car lists each time, LapStore remembers how many laps it
+holds per car and only appends the tail it hasn't seen. Storage is two
+compact arrays per car (lap number as array('H'), time as array('f')), so
+memory grows by 6 bytes per lap and nothing else.
+
+Queries view the arrays through np.frombuffer (no copy). Views must not
+outlive the query: an array can't grow while a buffer export is alive.
+"""
+
+from array import array
+
+import numpy as np
+
+DEFAULT_AVERAGE_LAPS = 5
+
+
+class CarLaps:
+    """Lap numbers and times for one car"""
+
+    __slots__ = ("laps", "times", "position")
+
+    def __init__(self):
+        self.laps = array("H")
+        self.times = array("f")
+        self.position = None
+
+    def __len__(self):
+        return len(self.times)
+
+    @property
+    def last_lap(self):
+        return self.laps[-1] if self.laps else 0
+
+    def append_new(self, rows):
+        """
+        Append rows (feed dicts with Lap / LapTime) newer than what we hold
+
+        Fast path: the feed lists laps in order, so the unseen tail starts
+        at our length. Falls back to filtering by lap number if it doesn't.
+
+        Returns:
+            int: laps appended
+        """
+        held = len(self.laps)
+        last = self.last_lap
+        if held and len(rows) >= held and rows[held - 1].get("Lap") == last:
+            tail = rows[held:]
+        else:
+            tail = [row for row in rows if (row.get("Lap") or 0) > last]
+
+        added = 0
+        for row in tail:
+            lap, time = row.get("Lap"), row.get("LapTime")
+            if lap is None or not time or lap <= self.last_lap:
+                continue
+            self.laps.append(lap)
+            self.times.append(time)
+            added += 1
+        return added
+
+    def nbytes(self):
+        return self.laps.itemsize * len(self.laps) + self.times.itemsize * len(self.times)
+
+
+class LapStore:
+    """Every car's laps for one race, fed incrementally"""
+
+    def __init__(self):
+        self.cars = {}  # car number -> CarLaps
+        self.ingests = 0
+        self.appended = 0  # Laps appended by the last ingest
+
+    def reset(self):
+        self.cars = {}
+        self.ingests = 0
+        self.appended = 0
+
+    def ingest(self, feed):
+        """
+        Take a lap-times document ({"laps": [{"Number", "RunningPos", "Laps"}]})
+
+        Returns:
+            int: new laps stored
+        """
+        added = 0
+        for row in (feed or {}).get("laps", []):
+            number = str(row.get("Number", ""))
+            car = self.cars.get(number)
+            if car is None:
+                car = self.cars[number] = CarLaps()
+            car.position = row.get("RunningPos", car.position)
+            added += car.append_new(row.get("Laps") or [])
+        self.ingests += 1
+        self.appended = added
+        return added
+
+    def nbytes(self):
+        return sum(car.nbytes() for car in self.cars.values())
+
+    # -------------------------
+    # Queries
+    # -------------------------
+
+    def best_lap(self, number):
+        """(lap, time) of a car's fastest lap, or None"""
+        car = self.cars.get(number)
+        if not car:
+            return None
+        index = int(np.frombuffer(car.times, dtype=np.float32).argmin())
+        return car.laps[index], round(car.times[index], 3)
+
+    def last_average(self, number, n=DEFAULT_AVERAGE_LAPS):
+        """Mean of a car's last n lap times, or None"""
+        car = self.cars.get(number)
+        if not car:
+            return None
+        return round(float(np.frombuffer(car.times, dtype=np.float32)[-n:].mean()), 3)
+
+    def running_order(self):
+        """Car numbers by running position (cars without one last)"""
+        return sorted(
+            (number for number, car in self.cars.items() if len(car)),
+            key=lambda number: (self.cars[number].position is None, self.cars[number].position or 0),
+        )
+
+    def summary(self, n=DEFAULT_AVERAGE_LAPS, order=None):
+        """
+        Per-car lap stats in running order
+
+        Last lap, best lap, last-n average, and the last-lap and average
+        delta to the car ahead (positive = slower than the car ahead),
+        computed for the whole field at once.
+
+        Returns:
+            dict: car number -> fields
+        """
+        order = [number for number in (order or self.running_order()) if self.cars.get(number)]
+        if not order:
+            return {}
+
+        last = np.empty(len(order), dtype=np.float64)
+        best = np.empty(len(order), dtype=np.float64)
+        best_index = np.empty(len(order), dtype=np.int64)
+        average = np.empty(len(order), dtype=np.float64)
+        for i, number in enumerate(order):
+            times = np.frombuffer(self.cars[number].times, dtype=np.float32)
+            last[i] = times[-1]
+            best_index[i] = times.argmin()
+            best[i] = times[best_index[i]]
+            average[i] = times[-n:].mean()
+            del times  # Release the buffer export before anything appends
+
+        last_delta = np.concatenate(([np.nan], np.diff(last)))
+        average_delta = np.concatenate(([np.nan], np.diff(average)))
+
+        def value(x):
+            return None if np.isnan(x) else round(float(x), 3)
+
+        result = {}
+        for i, number in enumerate(order):
+            car = self.cars[number]
+            result[number] = {
+                "lastLap": car.last_lap,
+                "lastLapTime": value(last[i]),
+                "bestLap": car.laps[int(best_index[i])],
+                "bestLapTime": value(best[i]),
+                f"avg{n}": value(average[i]),
+                "lapsTimed": len(car),
+                "deltaAhead": value(last_delta[i]),
+                f"avg{n}DeltaAhead": value(average_delta[i]),
+            }
+        return result
@@ -1,7 +1,7 @@
 # src/layout.py
 
-from datetime import datetime
-from .scheduleUtils import countdown_to
+import time
+from .scheduleUtils import countdown_to, race_start_epoch
 
 BATTLE_THRESHOLD = 0.15  # seconds
 
@@ -19,6 +19,15 @@ def annotate_battles(cars):
     return cars
 
 
+def live_header(data):
+    return {
+        "flag": data["flag"],
+        "lap": data["lap"],
+        "total": data["lapsTotal"],
+        "lapsToGo": data.get("lapsToGo", 0)
+    }
+
+
 def build_live_layout(data, scrollOffset=0, visibleRows=10):
     cars = annotate_battles(data["cars"])
 
@@ -27,17 +36,27 @@ def build_live_layout(data, scrollOffset=0, visibleRows=10):
 
     return {
         "mode": "LIVE",
-        "header": {
-            "flag": data["flag"],
-            "lap": data["lap"],
-            "total": data["lapsTotal"],
-            "lapsToGo": data.get("lapsToGo", 0)
-        },
+        "header": live_header(data),
         "fixed": topFixed,
         "scrolling": scrolling
     }
 
 
+def build_full_field_layout(data, fixedRows=10):
+    """
+    Whole running order in one payload
+
+    The client keeps the first `fixedRows` cars pinned and scrolls the rest
+    itself, so it only needs a new payload when the snapshot changes.
+    """
+    return {
+        "mode": "LIVE",
+        "header": live_header(data),
+        "fixedRows": fixedRows,
+        "cars": annotate_battles(data["cars"])
+    }
+
+
 # =========================
 # CUP POINTS STANDINGS
 # =========================
@@ -52,12 +71,26 @@ def build_points_layout(data):
     }
 
 
+def build_projected_points_layout(projection):
+    """Points layout from the poller's live projection (liveProjection.json)"""
+    return {
+        "mode": "POINTS",
+        "header": {
+            "title": f"NASCAR {projection['series']} SERIES POINTS AS THEY RUN",
+            "lap": projection.get("lap", 0),
+            "flag": projection.get("flag", "UNKNOWN"),
+            "projected": True
+        },
+        "drivers": projection["drivers"]
+    }
+
+
 # =========================
 # SCHEDULE + NEXT CUP RACE
 # =========================
 
 def build_schedule_layout(allSchedules):
-    now = datetime.now()
+    now = time.time()
     rows = []
     nextCupRace = None
 
@@ -65,11 +98,7 @@ def build_schedule_layout(allSchedules):
         series = sched.get("series", "UNKNOWN")
 
         for race in sched.get("races", []):
-            raceDt = datetime.fromisoformat(
-                f"{race['date']} {race.get('startTime', '00:00')}"
-            )
-
-            if raceDt >= now:
+            if race_start_epoch(race) >= now:
                 rows.append({
                     "date": race["date"],
                     "time": race.get("startTime", ""),
@@ -115,7 +144,7 @@ def build_idle_layout(standingsData, allSchedules):
     drivers = standingsData["drivers"][:10]
     
     # Get next 5 races
-    now = datetime.now()
+    now = time.time()
     upcomingRaces = []
     nextCupRace = None
     
@@ -123,11 +152,7 @@ def build_idle_layout(standingsData, allSchedules):
         series = sched.get("series", "UNKNOWN")
         
         for race in sched.get("races", []):
-            raceDt = datetime.fromisoformat(
-                f"{race['date']} {race.get('startTime', '00:00')}"
-            )
-            
-            if raceDt >= now:
+            if race_start_epoch(race) >= now:
                 upcomingRaces.append({
                     "date": race["date"],
                     "time": race.get("startTime", ""),
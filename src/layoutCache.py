@@ -0,0 +1,351 @@
+# src/layoutCache.py
+"""
+Pre-encoded layouts shared between web worker processes
+
+In prefork mode (webDisplay.py --workers N) a single builder process turns
+each new snapshot into ready-to-send JSON bodies - the /api/live payload,
+every scroll window of /api/data, both idle screens and the projected
+points - and writes them once into a shared memory segment. Workers never
+build layouts: they copy the bundle out of shared memory and unpickle it
+once per snapshot, then serve bytes.
+
+The segment is guarded by a seqlock: the writer bumps a counter to an odd
+value before writing and to the next even value after, and readers retry
+if the counter was odd or changed while they copied. Readers never block
+the writer and there is exactly one writer.
+
+Memory ordering: Python can't issue fences, and the builder and workers
+are separate processes, so nothing orders the payload stores against the
+counter stores on a weakly ordered CPU (ARM, e.g. a Raspberry Pi). The
+header therefore also carries a CRC-32 of the payload, computed by the
+writer. A reader only accepts a copy whose counter was even and unchanged
+across the copy and whose CRC matches, so a torn read is retried whatever
+order the stores became visible in.
+
+After each write the builder also writes a byte to every worker's wake
+pipe (ChangePipes). Long-polling requests block on a condition that a
+per-worker watcher thread signals, instead of re-checking the segment on
+a timer.
+"""
+
+import json
+import os
+import pickle
+import struct
+import threading
+import time
+import zlib
+from datetime import datetime
+from multiprocessing import shared_memory
+
+from .layout import (
+    build_full_field_layout,
+    build_live_layout,
+    build_points_layout,
+    build_projected_points_layout,
+    build_schedule_layout,
+)
+from .liveSource import snapshot_version
+from .raceEvents import events_since
+from .loader import load_all_schedules, load_json
+
+SEGMENT_SIZE = 32 * 1024 * 1024  # Upper bound; only touched pages use RAM
+HEADER = struct.Struct("<QQI")  # seqlock counter, payload length, payload CRC-32
+VISIBLE_ROWS = 10
+IDLE_REBUILD_INTERVAL = 10  # Seconds - schedule countdowns move with the clock
+CHECK_INTERVAL = 1.0  # Seconds the builder waits for a snapshot before re-checking mode
+READ_POLL_INTERVAL = 0.05  # Seconds between seqlock checks (only without a wake pipe)
+
+
+def encode(obj):
+    """Same JSON Flask's jsonify produces (compact, sorted keys)"""
+    return json.dumps(obj, separators=(",", ":"), sort_keys=True).encode("utf-8") + b"\n"
+
+
+def build_bundle(mode, live_data, projection, schedules, events=None, gaps=None):
+    """
+    Encode every response the read endpoints can send for this state
+
+    Returns:
+        dict with "mode", "version", "live" (/api/live body), "data"
+        (list of /api/data bodies, one per scroll offset), "idle"
+        (points/schedule /api/data bodies), "projection", "events"
+        (the race event log, filtered per request by workers) and "gaps"
+        (gap history matrices, downsampled per request by workers)
+    """
+    timestamp = datetime.now().isoformat()
+    version = snapshot_version(live_data)
+    bundle = {
+        "mode": mode,
+        "version": version,
+        "built": time.time(),
+        "data": [],
+        "idle": {},
+        "events": events_since(events),
+        "gaps": gaps,
+    }
+
+    live_layout = None
+    if mode == "LIVE" and live_data:
+        live_layout = build_full_field_layout(live_data)
+        total_cars = len(live_data.get("cars", []))
+        offsets = range(max(total_cars - VISIBLE_ROWS, 1))
+        bundle["data"] = [
+            encode({
+                "mode": mode,
+                "timestamp": timestamp,
+                "data": build_live_layout(live_data, scrollOffset=offset, visibleRows=VISIBLE_ROWS),
+            })
+            for offset in offsets
+        ]
+    elif mode == "IDLE":
+        for name, build in (
+            ("points", lambda: build_points_layout(load_json("standings.json"))),
+            ("schedule", lambda: build_schedule_layout(schedules)),
+        ):
+            try:
+                layout = build()
+            except Exception:
+                layout = None
+            bundle["idle"][name] = encode({"mode": mode, "timestamp": timestamp, "data": layout})
+
+    bundle["live"] = encode({
+        "mode": mode,
+        "timestamp": timestamp,
+        "version": version,
+        "data": live_layout,
+    })
+    bundle["projection"] = encode({
+        "mode": mode,
+        "data": build_projected_points_layout(projection) if projection else None,
+    })
+    return bundle
+
+
+class ChangePipes:
+    """
+    One wake pipe per worker slot, created before anything forks
+
+    The builder writes a byte to every pipe after each bundle; a worker
+    reads only its slot's pipe. The supervisor keeps all ends open, so a
+    respawned worker takes over its slot's pipe and the builder never
+    sees a broken pipe. Writes are non-blocking: a full pipe already has a
+    wakeup pending.
+    """
+
+    def __init__(self, slots):
+        self.pipes = [os.pipe() for _ in range(slots)]
+        for _, write_fd in self.pipes:
+            os.set_blocking(write_fd, False)
+
+    def notify(self):
+        for _, write_fd in self.pipes:
+            try:
+                os.write(write_fd, b"\0")
+            except BlockingIOError:
+                pass
+
+    def keep_writers(self):
+        """In the builder: close every read end"""
+        for read_fd, _ in self.pipes:
+            os.close(read_fd)
+
+    def keep_reader(self, slot):
+        """In a worker: close everything but its own read end; returns it"""
+        for index, (read_fd, write_fd) in enumerate(self.pipes):
+            os.close(write_fd)
+            if index != slot:
+                os.close(read_fd)
+        return self.pipes[slot][0]
+
+    def close(self):
+        for read_fd, write_fd in self.pipes:
+            os.close(read_fd)
+            os.close(write_fd)
+
+
+class SharedLayoutWriter:
+    """Single writer side of the seqlocked segment"""
+
+    def __init__(self, size=SEGMENT_SIZE, notify=None):
+        self.shm = shared_memory.SharedMemory(create=True, size=size)
+        self.seq = 0
+        self.notify = notify  # Called after each complete write
+        HEADER.pack_into(self.shm.buf, 0, 0, 0, 0)
+
+    def resume(self):
+        """
+        Continue the counter already in the segment
+
+        A respawned builder must not restart at 0 - readers would take a
+        reused counter value for a bundle they already hold. A counter left
+        odd by a builder that died mid-write is made even first, so the
+        next write starts odd again.
+        """
+        seq = HEADER.unpack_from(self.shm.buf, 0)[0]
+        self.seq = seq + seq % 2
+
+    def write(self, bundle):
+        payload = pickle.dumps(bundle, protocol=pickle.HIGHEST_PROTOCOL)
+        if HEADER.size + len(payload) > self.shm.size:
+            raise ValueError(f"layout bundle too large ({len(payload)} bytes)")
+
+        buf = self.shm.buf
+        crc = zlib.crc32(payload)
+        self.seq += 1  # Odd: write in progress
+        HEADER.pack_into(buf, 0, self.seq, len(payload), crc)
+        buf[HEADER.size:HEADER.size + len(payload)] = payload
+        self.seq += 1  # Even: consistent
+        HEADER.pack_into(buf, 0, self.seq, len(payload), crc)
+        if self.notify:
+            self.notify()
+
+    def close(self):
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedLayoutReader:
+    """
+    Worker side: latest bundle, unpickled once per new write
+
+    Built from the writer's segment before forking, so workers just keep
+    the inherited mapping. Call listen() in the worker with its wake pipe
+    so long-polls sleep until the builder writes.
+    """
+
+    def __init__(self, shm):
+        self.shm = shm
+        self._seq = None
+        self._bundle = None
+        self._cond = None
+
+    def sequence(self):
+        return HEADER.unpack_from(self.shm.buf, 0)[0]
+
+    def listen(self, fd):
+        """Start the watcher thread that wakes waiters when `fd` is written"""
+        self._cond = threading.Condition()
+
+        def watch():
+            while True:
+                if not os.read(fd, 4096):
+                    return  # All writers gone
+                with self._cond:
+                    self._cond.notify_all()
+
+        threading.Thread(target=watch, daemon=True).start()
+        return self
+
+    def get(self):
+        """Latest complete bundle (None until the builder's first write)"""
+        buf = self.shm.buf
+        while True:
+            seq, length, crc = HEADER.unpack_from(buf, 0)
+            if seq == self._seq:
+                return self._bundle
+            if seq == 0:
+                return None
+            if seq % 2:
+                time.sleep(0)  # Writer mid-update
+                continue
+            payload = bytes(buf[HEADER.size:HEADER.size + length])
+            if HEADER.unpack_from(buf, 0)[0] != seq or zlib.crc32(payload) != crc:
+                time.sleep(0)
+                continue  # Overwritten while copying, or stores not visible yet - retry
+            self._bundle = pickle.loads(payload)
+            self._seq = seq
+            return self._bundle
+
+    def wait_for_version(self, version, timeout):
+        """Block until the bundle's snapshot version differs (or timeout)"""
+        deadline = time.monotonic() + timeout
+        seq = self.sequence()
+        bundle = self.get()
+        while bundle is None or bundle["version"] == version:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if self._cond is not None:
+                with self._cond:
+                    self._cond.wait_for(lambda: self.sequence() != seq, remaining)
+            else:
+                time.sleep(min(READ_POLL_INTERVAL, remaining))
+            seq = self.sequence()
+            bundle = self.get()
+        return bundle
+
+
+class LayoutBuilder:
+    """
+    Keeps the shared bundle current (run() in the builder process)
+
+    Rebuilds when the live snapshot, the mode, the projection or the event
+    log changes, and every IDLE_REBUILD_INTERVAL seconds while idle.
+    """
+
+    def __init__(
+        self, writer, live_source, projection_source, mode_controller,
+        events_source=None, gap_history=None,
+    ):
+        self.writer = writer
+        self.live_source = live_source
+        self.projection_source = projection_source
+        self.events_source = events_source
+        self.gap_history = gap_history
+        self.mode_controller = mode_controller
+        self.builds = 0
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def build_once(self):
+        live_data = self.live_source.get()
+        schedules = load_all_schedules()
+        mode = self.mode_controller.get_mode(live_data, schedules)
+        events = self.events_source.get() if self.events_source else None
+        gaps = None
+        if self.gap_history is not None:
+            self.gap_history.record(live_data)
+            gaps = self.gap_history.matrices()
+        bundle = build_bundle(mode, live_data, self.projection_source.get(), schedules, events, gaps)
+        self.writer.write(bundle)
+        self.builds += 1
+        return bundle
+
+    def start(self):
+        """Keep rebuilding in the background (call build_once() first)"""
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+
+    def run(self):
+        """Rebuild loop; blocks until stop()"""
+        last_key = None
+        last_build = 0.0
+        while not self._stopped.is_set():
+            version = snapshot_version(self.live_source.get())
+            live_data = self.live_source.wait_for_change(version, CHECK_INTERVAL)
+            try:
+                mode = self.mode_controller.get_mode(live_data, load_all_schedules())
+                projection = self.projection_source.get()
+                events = self.events_source.get() if self.events_source else None
+                key = (
+                    snapshot_version(live_data),
+                    mode,
+                    snapshot_version(projection),
+                    (events or {}).get("lastId"),
+                )
+                idle_due = mode != "LIVE" and time.monotonic() - last_build >= IDLE_REBUILD_INTERVAL
+                if key != last_key or idle_due:
+                    self.build_once()
+                    last_key = key
+                    last_build = time.monotonic()
+            except Exception as e:
+                print(f"⚠️  Layout build failed: {e}")
+                self._stopped.wait(CHECK_INTERVAL)
@@ -0,0 +1,116 @@
+# src/liveSource.py
+"""
+Where displays get the live snapshot from
+
+Prefers snapshots pushed by the poller over the pub/sub socket and falls
+back to the JSON file (re-read only when its mtime changes) whenever the
+poller isn't reachable or hasn't published anything yet.
+"""
+
+import json
+import time
+
+from .loader import DATA_DIR
+from .pubsub import SnapshotSubscriber
+
+FILE_POLL_INTERVAL = 0.25  # Seconds between mtime checks while waiting
+
+_subscriber = None
+
+
+def get_subscriber():
+    """Process-wide subscriber to the poller's socket (started on first use)"""
+    global _subscriber
+    if _subscriber is None:
+        _subscriber = SnapshotSubscriber().start()
+    return _subscriber
+
+
+def snapshot_version(data):
+    """
+    Identifies a snapshot: the poller's seq, else its lastUpdate
+
+    Returns "" when there is no data so it can be round-tripped through a
+    query string.
+    """
+    if not data:
+        return ""
+    return str(data.get("seq") or data.get("lastUpdate") or "")
+
+
+class LiveDataSource:
+    """Latest value of one poller output (e.g. liveRace.json / topic "live")"""
+
+    def __init__(self, filename="liveRace.json", topic="live", subscriber=None):
+        self.path = DATA_DIR / filename
+        self.topic = topic
+        self._subscriber = subscriber
+        self._data = None
+        self._mtime = None
+
+    @property
+    def subscriber(self):
+        """
+        The pub/sub client, started on first use
+
+        Module-level sources (webDisplay.py, pylon.py) are built at import;
+        starting the socket thread lazily keeps imports thread-free.
+        """
+        if self._subscriber is None:
+            self._subscriber = get_subscriber()
+        return self._subscriber
+
+    def get(self):
+        """Latest data, or None if there is none"""
+        if self.subscriber.connected:
+            _, data = self.subscriber.latest(self.topic)
+            if data is not None:
+                return data
+        return self._read_file()
+
+    def seq(self):
+        """Sequence number of the latest pushed snapshot (None when file-backed)"""
+        if self.subscriber.connected:
+            return self.subscriber.latest(self.topic)[0]
+        return None
+
+    def wait_for_change(self, version, timeout):
+        """
+        Block until the snapshot's version differs from `version`
+
+        Wakes on the pushed message when connected to the poller, otherwise
+        checks the file's mtime every FILE_POLL_INTERVAL seconds.
+
+        Returns:
+            Latest data (unchanged if the timeout expired)
+        """
+        deadline = time.monotonic() + timeout
+        data = self.get()
+
+        while snapshot_version(data) == version:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if self.subscriber.connected:
+                self.subscriber.wait_for(self.topic, self.seq(), remaining)
+            else:
+                time.sleep(min(FILE_POLL_INTERVAL, remaining))
+            data = self.get()
+
+        return data
+
+    def _read_file(self):
+        try:
+            mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            self._data, self._mtime = None, None
+            return None
+
+        if mtime != self._mtime:
+            try:
+                with open(self.path) as f:
+                    self._data = json.load(f)
+                self._mtime = mtime
+            except (OSError, ValueError):
+                pass  # Mid-write or corrupt - keep the previous snapshot
+        return self._data
@@ -1,6 +1,8 @@
 import json
 from pathlib import Path
 
+from .scheduleCache import load_compiled_schedules
+
 DATA_DIR = Path("data")
 
 def load_json(filename):
@@ -8,10 +10,10 @@ def load_json(filename):
         return json.load(f)
 
 def load_all_schedules():
-    schedules = []
-    for fname in ["sched.json", "schedOR.json", "schedTruck.json"]:
-        try:
-            schedules.append(load_json(fname))
-        except FileNotFoundError:
-            pass
-    return schedules
\ No newline at end of file
+    """
+    All series schedules, compiled from schedules/*.csv
+
+    Served from the compiled schedule cache (see scheduleCache.py), so
+    per-tick calls don't re-read or re-parse anything.
+    """
+    return load_compiled_schedules()["schedules"]
\ No newline at end of file
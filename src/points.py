@@ -0,0 +1,178 @@
+# src/points.py
+"""
+Live projected points
+
+Joins the live running order against standings.json to show
+"points as they run" and the projected championship order.
+Stage points are not included - the live feed only gives us
+running position, so projections cover race finish points only.
+"""
+
+import json
+from functools import lru_cache
+
+from .driverRegistry import get_registry
+from .loader import DATA_DIR
+
+STANDINGS_FILE = DATA_DIR / "standings.json"
+
+WINNER_POINTS = 40  # 1st place
+RUNNER_UP_POINTS = 35  # 2nd place, then -1 per position down to 1
+
+
+@lru_cache(maxsize=8)
+def points_table(fieldSize=40):
+    """
+    Race points for each finishing position (index 0 = P1)
+
+    Cached per field size so each snapshot is a plain tuple lookup.
+    """
+    table = [WINNER_POINTS]
+    for pos in range(2, fieldSize + 1):
+        table.append(max(RUNNER_UP_POINTS - (pos - 2), 1))
+    return tuple(table)
+
+
+def is_points_eligible(driverName):
+    """Drivers marked (i) in the live feed are not running for these points"""
+    return not driverName.endswith("(i)")
+
+
+class PointsProjector:
+    """
+    Projects championship points from live running order
+
+    Rows are joined through the driver registry (driver id, else car
+    number). The key -> standings-row index is built once per standings
+    or registry change, so each snapshot costs a single pass over the field.
+    """
+
+    def __init__(self, standingsPath=STANDINGS_FILE, registry=None):
+        self.standingsPath = standingsPath
+        self.registry = registry
+        self.standings = None
+        self.series = None
+        self.hasPoints = False
+        self._index = {}
+        self._mtime = None
+        self._registryVersion = None
+        self._joinWarned = False
+
+    def load_standings(self, standings):
+        """Build the driver-key index from a standings.json document"""
+        drivers = standings.get("drivers", [])
+        registry = self.registry or get_registry()
+        self.standings = standings
+        self.series = standings.get("series", "CUP")
+        self.hasPoints = all("points" in d for d in drivers)
+
+        index = {}
+        for row in drivers:
+            # Older CSV-converted standings only have pointsBack, which
+            # still ranks correctly as a negative offset from the leader
+            base = row["points"] if self.hasPoints else -row.get("pointsBack", 0)
+            number = str(row["car"])
+            key = registry.key(self.series, number, row.get("driverId"))
+            index[key] = (number, row["position"], row["driver"], base)
+        self._index = index
+        self._registryVersion = registry.version
+        self._joinWarned = False
+
+    def refresh(self):
+        """Reload standings only when the file (or the registry) has changed"""
+        try:
+            mtime = self.standingsPath.stat().st_mtime
+        except FileNotFoundError:
+            return False
+
+        registry = self.registry or get_registry()
+        registry.refresh()
+        if mtime != self._mtime or registry.version != self._registryVersion:
+            with open(self.standingsPath) as f:
+                self.load_standings(json.load(f))
+            self._mtime = mtime
+        return True
+
+    def project(self, liveData):
+        """
+        Compute projected points for one live snapshot
+
+        Returns:
+            dict or None: projection, or None if no standings are loaded
+            for the series that is racing
+        """
+        if self.standings is None:
+            return None
+        if liveData.get("series", "CUP") != self.series:
+            return None
+
+        cars = liveData.get("cars", [])
+        table = points_table(max(len(cars), 40))
+        index = self._index
+        key_for = (self.registry or get_registry()).key
+        series = self.series
+        seen = set()
+        rows = []
+
+        for car in cars:
+            number = str(car.get("car", ""))
+            key = key_for(series, number, car.get("driverId"))
+            standing = index.get(key)
+            running = car.get("position", len(rows) + 1)
+            racePoints = (
+                table[running - 1] if is_points_eligible(car.get("driver", "")) else 0
+            )
+
+            if standing:
+                seen.add(key)
+                _, standingsPos, driver, base = standing
+            else:
+                standingsPos, driver, base = None, car.get("driver", ""), 0
+
+            rows.append({
+                "car": number,
+                "driver": driver,
+                "runningPosition": running,
+                "standingsPosition": standingsPos,
+                "racePoints": racePoints,
+                "points": base + racePoints,
+            })
+
+        # A field that matches no standings row means the two sides were
+        # keyed differently - every driver would drop to race points only
+        if cars and index and not seen and not self._joinWarned:
+            print(f"⚠️  Points: no live car matched the {series} standings")
+            self._joinWarned = True
+
+        # Drivers in the standings who aren't in this race keep their points
+        for key, (number, standingsPos, driver, base) in index.items():
+            if key not in seen:
+                rows.append({
+                    "car": number,
+                    "driver": driver,
+                    "runningPosition": None,
+                    "standingsPosition": standingsPos,
+                    "racePoints": 0,
+                    "points": base,
+                })
+
+        rows.sort(key=lambda r: (-r["points"], r["standingsPosition"] or 999))
+
+        leaderPoints = rows[0]["points"] if rows else 0
+        for pos, row in enumerate(rows, 1):
+            row["position"] = pos
+            row["pointsBack"] = leaderPoints - row["points"]
+            row["change"] = (
+                row["standingsPosition"] - pos if row["standingsPosition"] else 0
+            )
+            if not self.hasPoints:
+                del row["points"]
+
+        return {
+            "series": self.series,
+            "lap": liveData.get("lap", 0),
+            "flag": liveData.get("flag", "UNKNOWN"),
+            "lastUpdate": liveData.get("lastUpdate"),
+            "standingsUpdated": self.standings.get("lastUpdated"),
+            "drivers": rows,
+        }
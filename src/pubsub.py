@@ -0,0 +1,262 @@
+# src/pubsub.py
+"""
+Local pub/sub over a Unix domain socket
+
+The poller hosts a SnapshotPublisher and pushes every new snapshot to all
+connected displays (pylon.py, webDisplay.py, LED controllers) as soon as
+it is published - no filesystem polling, no extra disk I/O per consumer.
+
+Wire format: 4-byte big-endian length, then a UTF-8 JSON object
+{"topic": ..., "seq": ..., "data": ...}. Each message is encoded once
+and the same bytes are fanned out to every subscriber.
+
+Backpressure: each subscriber has a small bounded queue. Snapshots are
+latest-wins, so when a slow subscriber's queue is full the oldest message
+is dropped; a subscriber that blocks a send for SEND_TIMEOUT seconds is
+disconnected (it will reconnect and get the latest snapshot).
+"""
+
+import json
+import os
+import socket
+import struct
+import threading
+from collections import deque
+
+from .loader import DATA_DIR
+
+SOCKET_PATH = DATA_DIR / "pylon.sock"
+HEADER = struct.Struct("!I")
+MAX_MESSAGE_SIZE = 16 * 1024 * 1024
+SUBSCRIBER_QUEUE = 8  # Messages buffered per subscriber
+SEND_TIMEOUT = 5  # Seconds a subscriber may stall a send before it's dropped
+RECONNECT_DELAY = 2  # Seconds between subscriber reconnect attempts
+
+
+def encode_message(topic, data, seq=None):
+    """Frame one message for the wire"""
+    body = json.dumps({"topic": topic, "seq": seq, "data": data}, separators=(",", ":"))
+    body = body.encode("utf-8")
+    return HEADER.pack(len(body)) + body
+
+
+def _recv_exact(conn, size):
+    chunks = []
+    while size:
+        chunk = conn.recv(min(size, 65536))
+        if not chunk:
+            raise ConnectionError("publisher closed the connection")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def read_message(conn):
+    """Read one framed message from a socket"""
+    (size,) = HEADER.unpack(_recv_exact(conn, HEADER.size))
+    if size > MAX_MESSAGE_SIZE:
+        raise ValueError(f"message too large ({size} bytes)")
+    return json.loads(_recv_exact(conn, size))
+
+
+class _Subscriber:
+    """One connected consumer with its own bounded send queue and thread"""
+
+    def __init__(self, conn, publisher):
+        self.conn = conn
+        self.publisher = publisher
+        self.queue = deque(maxlen=SUBSCRIBER_QUEUE)
+        self.cond = threading.Condition()
+        self.closed = False
+        self.dropped = 0
+        self.conn.settimeout(SEND_TIMEOUT)
+        self.thread = threading.Thread(target=self._send_loop, daemon=True)
+
+    def offer(self, frame):
+        """Queue a frame without ever blocking the publisher"""
+        with self.cond:
+            if len(self.queue) == self.queue.maxlen:
+                self.dropped += 1  # deque discards the oldest frame
+            self.queue.append(frame)
+            self.cond.notify()
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify()
+        try:
+            self.conn.close()
+        except OSError:
+            pass
+
+    def _send_loop(self):
+        try:
+            while True:
+                with self.cond:
+                    while not self.queue and not self.closed:
+                        self.cond.wait()
+                    if self.closed:
+                        return
+                    frame = self.queue.popleft()
+                self.conn.sendall(frame)
+        except OSError:
+            pass  # Timed out or disconnected
+        finally:
+            self.publisher._remove(self)
+            self.close()
+
+
+class SnapshotPublisher:
+    """Unix-socket server that fans snapshots out to subscribers"""
+
+    def __init__(self, path=SOCKET_PATH):
+        self.path = path
+        self.server = None
+        self.subscribers = set()
+        self.latest = {}  # topic -> last frame, replayed to new subscribers
+        self.published = 0
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Bind the socket and start accepting subscribers"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.unlink(self.path)  # Left over from a previous run
+        except FileNotFoundError:
+            pass
+
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(str(self.path))
+        self.server.listen(16)
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+
+    def stop(self):
+        if self.server:
+            self.server.close()
+            self.server = None
+        with self._lock:
+            subscribers = list(self.subscribers)
+            self.subscribers.clear()
+        for sub in subscribers:
+            sub.close()
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def publish(self, topic, data, seq=None):
+        """Encode once and queue for every subscriber (never blocks)"""
+        frame = encode_message(topic, data, seq)
+        with self._lock:
+            self.latest[topic] = frame
+            subscribers = list(self.subscribers)
+        for sub in subscribers:
+            sub.offer(frame)
+        self.published += 1
+
+    @property
+    def subscriber_count(self):
+        return len(self.subscribers)
+
+    def _remove(self, sub):
+        with self._lock:
+            self.subscribers.discard(sub)
+
+    def _accept_loop(self):
+        while self.server:
+            try:
+                conn, _ = self.server.accept()
+            except OSError:
+                return  # Server socket closed
+
+            sub = _Subscriber(conn, self)
+            with self._lock:
+                self.subscribers.add(sub)
+                # Catch new subscribers up with the current state
+                for frame in self.latest.values():
+                    sub.offer(frame)
+            sub.thread.start()
+
+
+class SnapshotSubscriber:
+    """
+    Background client that keeps the latest message of each topic
+
+    Connects (and reconnects) to the poller's socket on its own thread;
+    readers just call latest(topic) or block in wait_for().
+    """
+
+    def __init__(self, path=SOCKET_PATH, on_message=None):
+        self.path = path
+        self.on_message = on_message
+        self.connected = False
+        self.received = 0
+        self._latest = {}  # topic -> (seq, data)
+        self._cond = threading.Condition()
+        self._stopped = threading.Event()
+        self._conn = None
+        self._thread = None
+
+    def start(self):
+        if self._thread is None and hasattr(socket, "AF_UNIX"):
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self._conn:
+            try:
+                self._conn.close()
+            except OSError:
+                pass
+
+    def latest(self, topic):
+        """(seq, data) of the newest message on a topic, or (None, None)"""
+        return self._latest.get(topic, (None, None))
+
+    def wait_for(self, topic, after_seq, timeout):
+        """
+        Block until a message newer than after_seq arrives on topic
+
+        Returns:
+            (seq, data) - the latest message, which may still be the old
+            one if the timeout expired
+        """
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self._latest.get(topic, (None,))[0] not in (None, after_seq),
+                timeout,
+            )
+            return self.latest(topic)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                conn.connect(str(self.path))
+            except OSError:
+                conn.close()  # Otherwise every retry leaks an fd
+                self._stopped.wait(RECONNECT_DELAY)
+                continue
+
+            self._conn = conn
+            self.connected = True
+            try:
+                while not self._stopped.is_set():
+                    message = read_message(conn)
+                    topic = message.get("topic")
+                    with self._cond:
+                        self._latest[topic] = (message.get("seq"), message.get("data"))
+                        self.received += 1
+                        self._cond.notify_all()
+                    if self.on_message:
+                        self.on_message(message)
+            except (OSError, ValueError):
+                pass
+            finally:
+                self.connected = False
+                self._conn = None
+                conn.close()
+
+            self._stopped.wait(RECONNECT_DELAY)
@@ -0,0 +1,311 @@
+# src/raceArchive.py
+"""
+Per-race NumPy archives
+
+The poller records every snapshot of the race in progress and, once the
+checkered flag falls, compacts that history into a single .npz file with
+[polls x cars] matrices. Archives are written uncompressed so they can be
+memory-mapped straight out of the zip container for season-wide queries.
+"""
+
+import os
+import re
+import struct
+import zipfile
+from array import array
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from .driverRegistry import get_registry
+
+ARCHIVE_DIR = Path("data") / "archive"
+
+# Matrix name -> dtype. Missing samples are 0 for the integer matrices
+# and NaN for the float matrices.
+MATRICES = {
+    "position": np.int16,
+    "gap": np.float32,
+    "laps": np.int16,
+    "speed": np.float32,
+}
+
+_ZIP_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+
+
+def race_identity(snapshot):
+    """What tells one race from another: (series, track)"""
+    return snapshot.get("series", "CUP"), snapshot.get("track", "Unknown")
+
+
+def race_key(snapshot):
+    """
+    Build a file-friendly key for the race a snapshot belongs to
+
+    The date comes from the snapshot, so compute it once per race (from
+    its first snapshot) - a race that runs past midnight must keep its key.
+    """
+    date = (snapshot.get("lastUpdate") or datetime.now().isoformat())[:10]
+    track = re.sub(r"[^a-z0-9]+", "-", snapshot.get("track", "unknown").lower())
+    return f"{date}_{snapshot.get('series', 'CUP')}_{track.strip('-')}"
+
+
+class RaceRecorder:
+    """Accumulates poll snapshots for the race in progress"""
+
+    def __init__(self, archive_dir=ARCHIVE_DIR):
+        self.archive_dir = Path(archive_dir)
+        self.reset()
+
+    def reset(self):
+        """Forget the current race"""
+        self.race_key = None
+        self.series = None
+        self.track = None
+        self.archived = False
+        self.car_index = {}  # car number -> matrix column
+        self.driver_ids = {}  # matrix column -> NASCAR driver id
+        self.timestamps = array("d")
+        self.leader_laps = array("h")
+        self.polls = []  # per poll: (columns, position, gap, laps, speed)
+
+    def record(self, snapshot):
+        """Append one parsed live snapshot (output of _parse_live_feed)"""
+        # Keyed once per race: only a different series/track starts a new one
+        if self.race_key is None or race_identity(snapshot) != (self.series, self.track):
+            self.reset()
+            self.race_key = race_key(snapshot)
+            self.series, self.track = race_identity(snapshot)
+
+        if self.archived:
+            return
+
+        columns = array("h")
+        position = array("h")
+        gap = array("f")
+        laps = array("h")
+        speed = array("f")
+
+        for car in snapshot.get("cars", []):
+            number = str(car.get("car", ""))
+            col = self.car_index.get(number)
+            if col is None:
+                col = self.car_index[number] = len(self.car_index)
+                if car.get("driverId") is not None:
+                    self.driver_ids[col] = car["driverId"]
+
+            interval = car.get("interval")
+            lastLapSpeed = car.get("lastLapSpeed")
+
+            columns.append(col)
+            position.append(car.get("position") or 0)
+            gap.append(0.0 if interval is None else interval)
+            laps.append(car.get("lapsCompleted") or 0)
+            speed.append(np.nan if lastLapSpeed is None else lastLapSpeed)
+
+        try:
+            stamp = datetime.fromisoformat(snapshot["lastUpdate"]).timestamp()
+        except (KeyError, TypeError, ValueError):
+            stamp = datetime.now().timestamp()
+
+        self.timestamps.append(stamp)
+        self.leader_laps.append(snapshot.get("lap", 0) or 0)
+        self.polls.append((columns, position, gap, laps, speed))
+
+    def build_matrices(self):
+        """Densify the recorded polls into [polls x cars] matrices"""
+        shape = (len(self.polls), len(self.car_index))
+        matrices = {}
+        for name, dtype in MATRICES.items():
+            fill = np.nan if np.issubdtype(dtype, np.floating) else 0
+            matrices[name] = np.full(shape, fill, dtype=dtype)
+
+        for row, (columns, *values) in enumerate(self.polls):
+            cols = np.frombuffer(columns, dtype=np.int16)
+            for name, column_values in zip(MATRICES, values):
+                matrices[name][row, cols] = column_values
+
+        return matrices
+
+    def archive(self):
+        """
+        Write the recorded race to ARCHIVE_DIR/<race_key>.npz
+
+        Returns:
+            Path of the archive, or None if there was nothing to write
+        """
+        if self.archived or not self.polls:
+            return None
+
+        cars = sorted(self.car_index, key=self.car_index.get)
+        arrays = self.build_matrices()
+        arrays["cars"] = np.array(cars, dtype="U8")
+        # 0 = driver id unknown (feeds without ids)
+        arrays["driverIds"] = np.array(
+            [self.driver_ids.get(col, 0) for col in range(len(cars))], dtype=np.int32
+        )
+        arrays["timestamps"] = np.frombuffer(self.timestamps, dtype=np.float64)
+        arrays["lap"] = np.frombuffer(self.leader_laps, dtype=np.int16)
+        arrays["series"] = np.array(self.series)
+        arrays["track"] = np.array(self.track)
+
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        path = self.archive_dir / f"{self.race_key}.npz"
+        tmp = path.with_suffix(".npz.tmp")
+
+        # np.savez stores members uncompressed, which is what lets
+        # open_race_archive memory-map them later
+        with open(tmp, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp, path)
+
+        self.archived = True
+        self.polls = []
+        return path
+
+
+class RaceArchive:
+    """Read-only view of one race archive"""
+
+    def __init__(self, path, arrays):
+        self.path = Path(path)
+        self.arrays = arrays
+        self.cars = [str(c) for c in arrays["cars"]]
+        self.series = str(arrays["series"][()])
+        self.track = str(arrays["track"][()])
+        if "driverIds" in arrays:
+            self.driver_ids = [int(i) or None for i in arrays["driverIds"]]
+        else:
+            self.driver_ids = [None] * len(self.cars)  # Archived before ids were kept
+
+    def driver_keys(self, registry=None):
+        """Registry join key per column (driver id, else (series, car))"""
+        registry = registry or get_registry()
+        return [
+            registry.key(self.series, car, driverId)
+            for car, driverId in zip(self.cars, self.driver_ids)
+        ]
+
+    def __getitem__(self, name):
+        return self.arrays[name]
+
+    def __contains__(self, name):
+        return name in self.arrays
+
+    @property
+    def name(self):
+        return self.path.stem
+
+
+def _memmap_member(fp, path, info):
+    """Memory-map a single uncompressed .npy member of a zip file"""
+    fp.seek(info.header_offset)
+    header = _ZIP_LOCAL_HEADER.unpack(fp.read(_ZIP_LOCAL_HEADER.size))
+    name_len, extra_len = header[-2], header[-1]
+    fp.seek(info.header_offset + _ZIP_LOCAL_HEADER.size + name_len + extra_len)
+
+    version = np.lib.format.read_magic(fp)
+    if version == (1, 0):
+        shape, fortran, dtype = np.lib.format.read_array_header_1_0(fp)
+    else:
+        shape, fortran, dtype = np.lib.format.read_array_header_2_0(fp)
+
+    if dtype.hasobject:
+        raise ValueError(f"{info.filename}: object arrays cannot be memory-mapped")
+    if int(np.prod(shape)) == 0:
+        return np.empty(shape, dtype=dtype)
+
+    return np.memmap(
+        path,
+        dtype=dtype,
+        mode="r",
+        shape=shape,
+        order="F" if fortran else "C",
+        offset=fp.tell(),
+    )
+
+
+def open_race_archive(path):
+    """
+    Open a race archive without loading its matrices into RAM
+
+    Uncompressed members are memory-mapped directly from the .npz file;
+    compressed members (e.g. from np.savez_compressed) are read normally.
+    """
+    arrays = {}
+    with zipfile.ZipFile(path) as zf, open(path, "rb") as fp:
+        for info in zf.infolist():
+            name = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+            if info.compress_type == zipfile.ZIP_STORED:
+                arrays[name] = _memmap_member(fp, path, info)
+            else:
+                with zf.open(info) as member:
+                    arrays[name] = np.lib.format.read_array(member)
+    return RaceArchive(path, arrays)
+
+
+def load_season(archive_dir=ARCHIVE_DIR, series=None, year=None):
+    """Open every archived race (optionally filtered by series / year)"""
+    archives = []
+    for path in sorted(Path(archive_dir).glob("*.npz")):
+        date, _, rest = path.stem.partition("_")
+        if year is not None and not date.startswith(str(year)):
+            continue
+        if series is not None and not rest.startswith(f"{series}_"):
+            continue
+        archives.append(open_race_archive(path))
+    return archives
+
+
+# =========================
+# VECTORIZED QUERIES
+# =========================
+
+def laps_led(archive):
+    """Number of distinct laps each car was scored as leader (array per car)"""
+    position = np.asarray(archive["position"])
+    ncars = position.shape[1]
+    leading = position == 1
+    polls = leading.any(axis=1)
+    if not polls.any():
+        return np.zeros(ncars, dtype=np.int64)
+
+    leader = leading[polls].argmax(axis=1)
+    laps = np.asarray(archive["lap"])[polls].astype(np.int64)
+    pairs = np.unique(laps * ncars + leader)
+    return np.bincount(pairs % ncars, minlength=ncars)
+
+
+def average_running_position(archive):
+    """Mean running position per car over the polls it was scored in"""
+    position = np.asarray(archive["position"]).astype(np.float32)
+    position[position <= 0] = np.nan
+    with np.errstate(invalid="ignore"):
+        return np.nanmean(position, axis=0)
+
+
+def final_gaps(archive):
+    """Gap to leader per car at the last recorded poll"""
+    return np.asarray(archive["gap"])[-1]
+
+
+def season_totals(archives, metric=laps_led, by="car"):
+    """
+    Sum a per-car metric across races
+
+    Args:
+        by: "car" to total per car number, "driver" to total per driver
+            (through the driver registry - follows drivers who changed cars)
+
+    Returns:
+        dict: car number (or driver key) -> total, sorted by total descending
+    """
+    totals = {}
+    for archive in archives:
+        values = metric(archive)
+        keys = archive.driver_keys() if by == "driver" else archive.cars
+        for car, value in zip(keys, values.tolist()):
+            if value == value:  # skip NaN
+                totals[car] = totals.get(car, 0) + value
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
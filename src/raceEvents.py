@@ -0,0 +1,182 @@
+# src/raceEvents.py
+"""
+Race events derived from the snapshot stream
+
+The poller hands every new snapshot to RaceEventDetector, which compares
+it with a compact summary of the previous one - the leader, flag, stage
+and one small tuple per car (on track, on DVP, pit stop count) - and
+emits typed events:
+
+    LEAD_CHANGE, FLAG_CHANGE, STAGE_END, OFF_TRACK, DVP, PIT_IN, PIT_OUT
+
+Per-car work is a tuple comparison; only cars whose tuple changed are
+looked at further. Events go into a bounded EventLog (data/raceEvents.json
+and the "events" pub/sub topic) that displays query by id for a ticker.
+"""
+
+from collections import deque
+from datetime import datetime
+
+from .fileUtils import atomic_write_json
+from .loader import DATA_DIR
+
+EVENTS_FILE = DATA_DIR / "raceEvents.json"
+MAX_EVENTS = 500  # Events kept in the log (oldest dropped first)
+
+LEAD_CHANGE = "LEAD_CHANGE"
+FLAG_CHANGE = "FLAG_CHANGE"
+STAGE_END = "STAGE_END"
+OFF_TRACK = "OFF_TRACK"
+DVP = "DVP"
+PIT_IN = "PIT_IN"
+PIT_OUT = "PIT_OUT"
+
+
+def _car_state(car):
+    """Compact per-car state the detector diffs against"""
+    return (
+        bool(car.get("isOnTrack", True)),
+        bool(car.get("isOnDVP", False)),
+        len(car.get("pitStops") or ()),
+    )
+
+
+class RaceEventDetector:
+    """Turns consecutive snapshots into events"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.leader = None
+        self.flag = None
+        self.stage = None
+        self.cars = {}  # car number -> _car_state tuple
+        self.in_pit = set()  # Cars that pitted and haven't come back out
+
+    def update(self, data):
+        """
+        Compare a snapshot with the previous one
+
+        The first snapshot only primes the state (no events).
+
+        Returns:
+            list of event dicts (without ids - EventLog assigns them)
+        """
+        cars = data.get("cars") or []
+        lap = data.get("lap", 0)
+        primed = self.flag is not None
+        events = []
+
+        def event(kind, car=None, **fields):
+            record = {"type": kind, "lap": lap}
+            if car is not None:
+                record["car"] = car.get("car")
+                record["driver"] = car.get("driver")
+            record.update(fields)
+            events.append(record)
+
+        flag = data.get("flag")
+        if primed and flag != self.flag:
+            event(FLAG_CHANGE, previous=self.flag, flag=flag)
+        self.flag = flag
+
+        stage = (data.get("stage") or {}).get("number")
+        if primed and stage is not None and self.stage is not None and stage > self.stage:
+            event(STAGE_END, stage=self.stage)
+        if stage is not None:
+            self.stage = stage
+
+        leader = cars[0] if cars else None
+        if leader is not None:
+            number = leader.get("car")
+            if primed and self.leader is not None and number != self.leader:
+                event(LEAD_CHANGE, leader, previous=self.leader)
+            self.leader = number
+
+        previous_cars = self.cars
+        current = {}
+        for car in cars:
+            number = car.get("car")
+            state = _car_state(car)
+            current[number] = state
+            before = previous_cars.get(number)
+            if before is None or before == state:
+                continue
+
+            on_track, on_dvp, stops = state
+            was_on_track, was_on_dvp, was_stops = before
+            if stops > was_stops:
+                event(PIT_IN, car, stop=stops)
+                if on_track:
+                    # The stop was recorded once the car was already back
+                    # out (or the feed never flagged it off track) - it
+                    # must not stay "in the pit" and hide later OFF_TRACKs
+                    event(PIT_OUT, car, stop=stops)
+                else:
+                    self.in_pit.add(number)
+            elif was_on_track and not on_track and number not in self.in_pit:
+                event(OFF_TRACK, car)
+            if on_track and number in self.in_pit:
+                self.in_pit.discard(number)
+                event(PIT_OUT, car, stop=stops)
+            if on_dvp and not was_on_dvp:
+                event(DVP, car)
+        self.cars = current
+
+        if not primed:
+            return []
+        return events
+
+
+class EventLog:
+    """Bounded, id-addressable event history for one race"""
+
+    def __init__(self, path=EVENTS_FILE, max_events=MAX_EVENTS):
+        self.path = path
+        self.events = deque(maxlen=max_events)
+        self.last_id = 0
+        self.race = None
+
+    def reset(self, race=None):
+        self.events.clear()
+        self.last_id = 0
+        self.race = race
+
+    def extend(self, events):
+        """Stamp events with ids and times; returns them"""
+        now = datetime.now().isoformat(timespec="seconds")
+        for record in events:
+            self.last_id += 1
+            record["id"] = self.last_id
+            record["time"] = now
+            self.events.append(record)
+        return events
+
+    def since(self, event_id=0, limit=None, types=None):
+        return events_since(self.to_data(), event_id, limit, types)
+
+    def to_data(self):
+        return {"race": self.race, "lastId": self.last_id, "events": list(self.events)}
+
+    def save(self):
+        atomic_write_json(self.path, self.to_data())
+
+
+def events_since(log, event_id=0, limit=None, types=None):
+    """
+    Filter an event log document (EventLog.to_data() / raceEvents.json)
+
+    Returns:
+        dict with lastId and the events newer than event_id (oldest first,
+        at most `limit` of the newest)
+    """
+    log = log or {}
+    events = [
+        record for record in log.get("events", [])
+        if record["id"] > event_id and (not types or record["type"] in types)
+    ]
+    if limit:
+        events = events[-limit:]
+    return {"race": log.get("race"), "lastId": log.get("lastId", 0), "events": events}
+
@@ -0,0 +1,228 @@
+# src/scheduleCache.py
+"""
+Compiled schedule cache
+
+Builds data/schedules.cache straight from schedules/*.csv whenever a CSV
+is newer than the cache. The cache is a small pickle holding the three
+schedules with precomputed epoch start times and race windows, a sorted
+window index, and a manifest of source hashes. After the first load the
+result is kept in memory and only re-checked every few seconds.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import time
+from datetime import datetime
+from pathlib import Path
+
+from .scheduleUtils import (
+    RACE_WINDOW_AFTER,
+    RACE_WINDOW_BEFORE,
+    SCHEDULES_DIR,
+    SERIES_CSV,
+    read_schedule_csv,
+)
+
+DATA_DIR = Path("data")
+CACHE_FILE = DATA_DIR / "schedules.cache"
+CACHE_VERSION = 1
+SOURCE_CHECK_INTERVAL = 5  # Seconds between mtime checks of the CSVs
+
+# Process-wide memo: (artifact, cache mtime, monotonic time of last check)
+_memo = {"artifact": None, "mtime": None, "checked": 0.0}
+
+
+def _file_sha256(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _tz_signature():
+    """Epochs depend on the local timezone; rebuild if it changes"""
+    return (time.timezone, time.altzone, time.daylight)
+
+
+def source_files(schedulesDir=SCHEDULES_DIR):
+    """Existing schedule CSVs, in series order"""
+    return [schedulesDir / name for name in SERIES_CSV if (schedulesDir / name).exists()]
+
+
+def compile_schedules(sources):
+    """
+    Compile schedule CSVs into the cache artifact
+
+    Returns:
+        dict with "schedules" (same shape as the old sched*.json files,
+        plus startEpoch/windowStart/windowEnd per race), "index" (sorted
+        window tuples) and "manifest" (source file hashes)
+    """
+    before = RACE_WINDOW_BEFORE.total_seconds()
+    after = RACE_WINDOW_AFTER.total_seconds()
+
+    schedules = []
+    index = []
+    manifest = {}
+
+    for path in sources:
+        series = SERIES_CSV[path.name]["series"]
+        sched = read_schedule_csv(path, series)
+
+        for raceIdx, race in enumerate(sched["races"]):
+            start = datetime.fromisoformat(
+                f"{race['date']} {race.get('startTime') or '00:00'}"
+            ).timestamp()
+            race["startEpoch"] = start
+            race["windowStart"] = start - before
+            race["windowEnd"] = start + after
+            index.append(
+                (race["windowStart"], race["windowEnd"], start, series, len(schedules), raceIdx)
+            )
+
+        schedules.append(sched)
+        manifest[path.name] = _file_sha256(path)
+
+    index.sort()
+
+    return {
+        "version": CACHE_VERSION,
+        "tz": _tz_signature(),
+        "builtAt": time.time(),
+        "manifest": manifest,
+        "schedules": schedules,
+        "index": index,
+    }
+
+
+def _write_cache(artifact, cacheFile):
+    cacheFile.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cacheFile.with_name(f".{cacheFile.name}.tmp")
+    with open(tmp, "wb") as f:
+        pickle.dump(artifact, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, cacheFile)
+
+
+def _read_cache(cacheFile):
+    try:
+        with open(cacheFile, "rb") as f:
+            artifact = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        return None
+
+    if not isinstance(artifact, dict) or artifact.get("version") != CACHE_VERSION:
+        return None
+    if artifact.get("tz") != _tz_signature():
+        return None
+    return artifact
+
+
+def _load_json_schedules():
+    """Fallback for installs that only ship the generated JSON files"""
+    schedules = []
+    for config in SERIES_CSV.values():
+        try:
+            with open(DATA_DIR / config["output"]) as f:
+                schedules.append(json.load(f))
+        except FileNotFoundError:
+            pass
+    return {"version": CACHE_VERSION, "manifest": {}, "schedules": schedules, "index": []}
+
+
+def build_schedule_cache(schedulesDir=SCHEDULES_DIR, cacheFile=CACHE_FILE, force=False):
+    """
+    Return an up-to-date compiled schedule, rebuilding the cache if needed
+
+    The cache is rebuilt when it is missing or unreadable, when the set of
+    CSVs changed, or when any CSV is newer than the cache. If a newer CSV
+    turns out to have identical content (just touched), the cache is
+    re-stamped instead of rebuilt.
+    """
+    sources = source_files(schedulesDir)
+    if not sources:
+        return _load_json_schedules()
+
+    artifact = None if force else _read_cache(cacheFile)
+
+    if artifact is not None and set(artifact["manifest"]) == {p.name for p in sources}:
+        cacheMtime = cacheFile.stat().st_mtime
+        newer = [p for p in sources if p.stat().st_mtime > cacheMtime]
+        if not newer:
+            return artifact
+        if all(_file_sha256(p) == artifact["manifest"][p.name] for p in newer):
+            os.utime(cacheFile)
+            return artifact
+
+    artifact = compile_schedules(sources)
+    _write_cache(artifact, cacheFile)
+    return artifact
+
+
+def load_compiled_schedules(schedulesDir=SCHEDULES_DIR, cacheFile=CACHE_FILE):
+    """
+    Compiled schedule for per-tick use
+
+    Returns the in-memory copy unless SOURCE_CHECK_INTERVAL has passed,
+    in which case the CSVs and cache are stat()ed and reloaded only if
+    something changed (e.g. another process rebuilt the cache).
+    """
+    now = time.monotonic()
+    artifact = _memo["artifact"]
+    if artifact is not None and now - _memo["checked"] < SOURCE_CHECK_INTERVAL:
+        return artifact
+
+    _memo["checked"] = now
+
+    try:
+        cacheMtime = cacheFile.stat().st_mtime
+    except FileNotFoundError:
+        cacheMtime = None
+
+    sources = source_files(schedulesDir)
+    stale = cacheMtime is None or any(p.stat().st_mtime > cacheMtime for p in sources)
+
+    if artifact is None or stale or cacheMtime != _memo["mtime"]:
+        artifact = build_schedule_cache(schedulesDir, cacheFile)
+        _memo["artifact"] = artifact
+        try:
+            _memo["mtime"] = cacheFile.stat().st_mtime
+        except FileNotFoundError:
+            _memo["mtime"] = None
+
+    return artifact
+
+
+def invalidate():
+    """Force the next load_compiled_schedules() call to re-check sources"""
+    _memo["checked"] = 0.0
+
+
+def window_at(index, nowTs):
+    """
+    Race window status at a point in time
+
+    Args:
+        index: "index" list from a compiled schedule
+        nowTs: Unix timestamp
+
+    Returns:
+        tuple: (active index entry or None, timestamp of the next window
+        opening or closing after nowTs, or None if there is none)
+    """
+    active = None
+    nextBoundary = None
+
+    for entry in index:
+        windowStart, windowEnd = entry[0], entry[1]
+        if windowStart > nowTs:
+            # Index is sorted by windowStart: this is the next opening
+            if nextBoundary is None or windowStart < nextBoundary:
+                nextBoundary = windowStart
+            break
+        if nowTs <= windowEnd:
+            if active is None:
+                active = entry
+            if nextBoundary is None or windowEnd < nextBoundary:
+                nextBoundary = windowEnd
+
+    return active, nextBoundary
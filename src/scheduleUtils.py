@@ -2,9 +2,23 @@
 
 from datetime import datetime, timedelta
 from pathlib import Path
+import csv
 import json
 
 DATA_DIR = Path("data")
+SCHEDULES_DIR = Path("schedules")
+
+# Schedule CSV -> series code and legacy JSON output name
+SERIES_CSV = {
+    "cup.csv": {"series": "CUP", "output": "sched.json"},
+    "oreilly.csv": {"series": "OREILLY", "output": "schedOR.json"},  # O'Reilly Auto Parts Series
+    "trucks.csv": {"series": "TRUCKS", "output": "schedTruck.json"},
+}
+
+# A race is "on" from 2 hours before scheduled start to 6 hours after
+# (accounts for pre-race, rain delays and long races)
+RACE_WINDOW_BEFORE = timedelta(hours=2)
+RACE_WINDOW_AFTER = timedelta(hours=6)
 
 
 def load_schedule(filename):
@@ -22,6 +36,47 @@ def parse_race_datetime(race):
     )
 
 
+def race_start_epoch(race):
+    """
+    Scheduled start as a Unix timestamp
+
+    Compiled schedules carry this precomputed; plain JSON schedules
+    fall back to parsing the date strings.
+    """
+    epoch = race.get("startEpoch")
+    if epoch is None:
+        epoch = datetime.fromisoformat(
+            f"{race['date']} {race.get('startTime', '00:00')}"
+        ).timestamp()
+    return epoch
+
+
+def read_schedule_csv(csv_path, series_name):
+    """Read a schedule CSV into our JSON schedule format (camelCase keys)"""
+    races = []
+
+    with open(csv_path, "r", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+
+        for row in reader:
+            race = {
+                "round": int(row["round"]),
+                "raceName": row["raceName"],
+                "track": row["track"],
+                "location": row["location"],
+                "date": row["date"],
+                "day": row["day"],
+                "startTime": row["startTime"],
+                "broadcast": row["broadcast"],
+                "distance": row["distance"],
+                "laps": int(row["laps"]),
+                "isChase": row["isChase"].lower() == "true",
+            }
+            races.append(race)
+
+    return {"series": series_name, "timezone": "ET", "races": races}
+
+
 def find_next_cup_race():
     """
     Returns the next upcoming CUP race only.
@@ -3,9 +3,23 @@
 from datetime import datetime, timedelta
 from pathlib import Path
 import json
+import threading
+import time
+
+from .scheduleCache import load_compiled_schedules, window_at
+from .scheduleUtils import RACE_WINDOW_AFTER, RACE_WINDOW_BEFORE, race_start_epoch
 
 DATA_DIR = Path("data")
 
+# Mode hysteresis: data must be this fresh to enter LIVE...
+FRESH_ENTER_MINUTES = 10
+# ...and this stale before we drop back out of LIVE
+FRESH_EXIT_MINUTES = 12
+# Minimum seconds a mode is held before it may change again
+MIN_MODE_DWELL = 30
+# Re-evaluate at least this often even if nothing is due (schedule edits)
+MAX_MODE_CACHE = 300
+
 
 def is_race_data_fresh(liveRaceData, maxAgeMinutes=10):
     """
@@ -50,26 +64,24 @@ def is_race_scheduled_now(schedules):
     Returns:
         dict or None: Race info if one should be active, None otherwise
     """
-    now = datetime.now()
-    
-    # Check window: 2 hours before scheduled start to 6 hours after
-    # (accounts for delays and long races)
-    WINDOW_BEFORE = timedelta(hours=2)
-    WINDOW_AFTER = timedelta(hours=6)
+    nowTs = datetime.now().timestamp()
+    before = RACE_WINDOW_BEFORE.total_seconds()
+    after = RACE_WINDOW_AFTER.total_seconds()
     
     for sched in schedules:
         for race in sched.get("races", []):
             try:
-                raceTime = datetime.fromisoformat(
-                    f"{race['date']} {race.get('startTime', '00:00')}"
-                )
+                # Compiled schedules carry precomputed epochs and windows
+                start = race_start_epoch(race)
+                windowStart = race.get("windowStart", start - before)
+                windowEnd = race.get("windowEnd", start + after)
                 
                 # Check if we're in the race window
-                if (raceTime - WINDOW_BEFORE) <= now <= (raceTime + WINDOW_AFTER):
+                if windowStart <= nowTs <= windowEnd:
                     return {
                         "series": sched.get("series"),
                         "race": race,
-                        "scheduledTime": raceTime,
+                        "scheduledTime": datetime.fromtimestamp(start),
                         "inWindow": True
                     }
             except:
@@ -143,3 +155,122 @@ def get_mode_with_detection():
         schedules = []
     
     return determine_state(liveData, schedules)
+
+
+class ModeController:
+    """
+    Stateful LIVE/IDLE mode detection
+
+    Instead of re-running the detection every tick, the controller works
+    out the next moment the answer could change (live data going stale,
+    a race window opening or closing) and returns the cached mode until
+    then. A new lastUpdate in the live data also triggers re-evaluation.
+
+    Hysteresis keeps the mode from flapping: entering LIVE needs data
+    fresher than FRESH_ENTER_MINUTES, leaving it needs data older than
+    FRESH_EXIT_MINUTES, and any mode is held for at least MIN_MODE_DWELL.
+    """
+
+    def __init__(self, freshEnterMinutes=FRESH_ENTER_MINUTES,
+                 freshExitMinutes=FRESH_EXIT_MINUTES, minDwell=MIN_MODE_DWELL,
+                 verbose=True):
+        self.freshEnter = freshEnterMinutes * 60
+        self.freshExit = freshExitMinutes * 60
+        self.minDwell = minDwell
+        self.verbose = verbose
+
+        self.mode = None
+        self.reason = None
+        self.race = None  # Active schedule index entry, if any
+        self.changedAt = 0.0
+        self.nextCheck = 0.0
+        self._lastUpdate = None
+        self._hasData = False
+        self._lock = threading.Lock()
+
+    def get_mode(self, liveRaceData=None, schedules=None, now=None):
+        """
+        Current mode ("LIVE" or "IDLE")
+
+        Args:
+            liveRaceData: Live race JSON data (optional)
+            schedules: List of schedule JSON data - only needed when no
+                compiled schedule is available
+            now: Unix timestamp (defaults to time.time())
+        """
+        if now is None:
+            now = time.time()
+
+        lastUpdate = liveRaceData.get("lastUpdate") if liveRaceData else None
+        if (now < self.nextCheck and lastUpdate == self._lastUpdate
+                and bool(liveRaceData) == self._hasData):
+            return self.mode
+
+        with self._lock:
+            return self._evaluate(liveRaceData, lastUpdate, schedules, now)
+
+    def _evaluate(self, liveRaceData, lastUpdate, schedules, now):
+        self._lastUpdate = lastUpdate
+        self._hasData = bool(liveRaceData)
+        deadlines = [now + MAX_MODE_CACHE]
+
+        # Freshness, with a wider threshold once we're already LIVE
+        fresh = False
+        if lastUpdate:
+            try:
+                updated = datetime.fromisoformat(lastUpdate).timestamp()
+                threshold = self.freshExit if self.mode == "LIVE" else self.freshEnter
+                staleAt = updated + threshold
+                fresh = now < staleAt
+                if fresh:
+                    deadlines.append(staleAt)
+            except (TypeError, ValueError):
+                pass
+
+        # Race window (only matters when there is some live data)
+        self.race = None
+        compiled = load_compiled_schedules()
+        if compiled["index"]:
+            self.race, boundary = window_at(compiled["index"], now)
+            if boundary is not None:
+                deadlines.append(boundary)
+        elif schedules:
+            scheduled = is_race_scheduled_now(schedules)
+            if scheduled:
+                self.race = (None, None, None, scheduled["series"], None, None)
+
+        if fresh:
+            desired, reason = "LIVE", "Fresh race data detected"
+        elif liveRaceData and self.race:
+            desired, reason = "LIVE", f"{self.race[3]} race window active"
+        else:
+            desired, reason = "IDLE", "No active race detected"
+
+        if self.mode is not None and desired != self.mode:
+            holdUntil = self.changedAt + self.minDwell
+            if now < holdUntil:
+                # Too soon after the last change - hold and look again later
+                self.nextCheck = holdUntil
+                return self.mode
+
+        if desired != self.mode:
+            self.mode = desired
+            self.changedAt = now
+            if self.verbose:
+                icon = "🏁" if desired == "LIVE" else "⏸️ "
+                print(f"{icon} {desired} MODE: {reason}")
+        self.reason = reason
+
+        self.nextCheck = min(deadlines)
+        return self.mode
+
+
+_controller = None
+
+
+def get_mode_controller():
+    """Process-wide ModeController shared by the displays"""
+    global _controller
+    if _controller is None:
+        _controller = ModeController()
+    return _controller
@@ -0,0 +1,152 @@
+# src/staticAssets.py
+"""
+Content-hashed static assets for the web display
+
+Everything under static/ is read once at startup and served from memory
+under a URL containing a hash of its content (css/pylon.css ->
+/static/css/pylon.3f9a0c1b2d4e.css). Because the URL changes whenever the
+file does, responses can be cached forever (immutable); a display reboot
+then costs nothing but the HTML page.
+
+Text assets get a gzip variant built once up front, so requests never pay
+for compression. url(...) references in CSS are rewritten to the hashed
+names first, so a new font also gives the stylesheet a new URL. A fallback
+source that isn't bundled (fonts not fetched yet) is dropped from its
+@font-face list, so an offline display falls back quietly instead of
+requesting a file that would 404.
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import posixpath
+import re
+from pathlib import Path
+
+STATIC_DIR = Path(__file__).parent.parent / "static"
+STATIC_URL = "/static/"
+HASH_LENGTH = 12
+COMPRESSIBLE = {".css", ".js", ".json", ".svg", ".txt", ".html"}
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+_CSS_URL = re.compile(r"""url\((['"]?)([^'")]+)\1\)""")
+# A later entry in an @font-face src list: ", url(...) format(...)"
+_CSS_FALLBACK_SRC = re.compile(r"""\s*,\s*url\((['"]?)([^'")]+)\1\)(\s*format\([^)]*\))?""")
+
+mimetypes.add_type("font/woff2", ".woff2")
+mimetypes.add_type("application/javascript", ".js")
+
+
+class Asset:
+    """One static file, its hashed URL and precompressed body"""
+
+    def __init__(self, name, body):
+        self.name = name
+        self.body = body
+        self.digest = hashlib.sha256(body).hexdigest()[:HASH_LENGTH]
+        self.etag = f'"{self.digest}"'
+        self.gzip_etag = f'"{self.digest}-gz"'
+        self.mimetype = mimetypes.guess_type(name)[0] or "application/octet-stream"
+
+        stem, ext = posixpath.splitext(name)
+        self.hashed_name = f"{stem}.{self.digest}{ext}"
+        self.url = STATIC_URL + self.hashed_name
+
+        self.gzipped = None
+        if ext in COMPRESSIBLE:
+            packed = gzip.compress(body, compresslevel=9, mtime=0)
+            if len(packed) < len(body):
+                self.gzipped = packed
+
+
+class AssetManifest:
+    """All assets under a directory, addressable by plain or hashed name"""
+
+    def __init__(self, static_dir=STATIC_DIR):
+        self.static_dir = Path(static_dir)
+        self.assets = {}  # plain name -> Asset
+        self.by_hashed = {}  # hashed name -> Asset
+        self.missing = set()  # Relative CSS references with no file behind them
+        self.load()
+
+    def load(self):
+        files = sorted(p for p in self.static_dir.rglob("*") if p.is_file() and not p.name.startswith("."))
+        names = [p.relative_to(self.static_dir).as_posix() for p in files]
+
+        # Binary assets first so stylesheets can point at their hashed names
+        pending = {}
+        for path, name in zip(files, names):
+            if path.suffix == ".css":
+                pending[name] = path.read_bytes()
+            else:
+                self._add(Asset(name, path.read_bytes()))
+
+        for name, body in pending.items():
+            self._add(Asset(name, self._rewrite_css(name, body)))
+
+    def _add(self, asset):
+        self.assets[asset.name] = asset
+        self.by_hashed[asset.hashed_name] = asset
+
+    def _rewrite_css(self, name, body):
+        base = posixpath.dirname(name)
+
+        def bundled(ref):
+            """Asset for a relative reference, None if it isn't bundled"""
+            path = posixpath.normpath(posixpath.join(base, ref))
+            asset = self.assets.get(path)
+            if asset is None:
+                self.missing.add(path)
+            return asset
+
+        def external(ref):
+            return ref.startswith(("data:", "http:", "https:", "/"))
+
+        def drop_missing(match):
+            ref = match.group(2)
+            if external(ref) or bundled(ref):
+                return match.group(0)
+            return ""  # Not bundled (e.g. fonts not fetched) - don't request it
+
+        def replace(match):
+            ref = match.group(2)
+            target = None if external(ref) else bundled(ref)
+            return f"url('{target.url}')" if target else match.group(0)
+
+        css = _CSS_FALLBACK_SRC.sub(drop_missing, body.decode("utf-8"))
+        return _CSS_URL.sub(replace, css).encode("utf-8")
+
+    def url(self, name):
+        """Hashed URL for a plain asset name (plain URL if unknown)"""
+        asset = self.assets.get(name)
+        return asset.url if asset else STATIC_URL + name
+
+    def lookup(self, path):
+        """
+        Find the asset for a request path under /static/
+
+        Returns:
+            (Asset or None, immutable) - immutable is False when the
+            request used the plain, unhashed name
+        """
+        asset = self.by_hashed.get(path)
+        if asset is not None:
+            return asset, True
+        return self.assets.get(path), False
+
+    @property
+    def version(self):
+        """Hash over every asset - changes when any of them does"""
+        digest = hashlib.sha256()
+        for name in sorted(self.assets):
+            digest.update(self.assets[name].hashed_name.encode("utf-8"))
+        return digest.hexdigest()[:HASH_LENGTH]
+
+
+def accepts_gzip(accept_encoding):
+    """True if an Accept-Encoding header allows gzip"""
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
@@ -0,0 +1,335 @@
+# src/views/ledView.py
+"""
+LED matrix raster view
+
+Turns the same layouts the terminal and web views use into RGB frames
+(NumPy uint8 arrays, height x width x 3) for an LED panel of any size.
+
+- Text is drawn with an embedded 5x7 font. Glyph masks and whole text runs
+  are LRU-cached: driver names, car numbers and intervals repeat frame
+  after frame, so a steady leaderboard is mostly cache hits.
+- The panel is split into text rows. Each row is described by a small
+  key (its cells and colors); a row is only re-blitted when its key
+  differs from what that buffer last showed.
+- Frames are double buffered: rendering goes into the back buffer, which
+  is then swapped to the front. Sinks only ever see a finished frame.
+
+Sinks (NullSink, PPMSink, PNGSink) stand in for the panel driver, so the
+view can be exercised headless - see tools/renderLedFrames.py.
+"""
+
+import struct
+import unicodedata
+import zlib
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+GLYPH_WIDTH = 5
+GLYPH_HEIGHT = 7
+CHAR_ADVANCE = GLYPH_WIDTH + 1  # One blank column between characters
+ROW_HEIGHT = GLYPH_HEIGHT + 1  # One blank line between rows
+
+# Column-major 5x7 font: five bytes per glyph, bit 0 is the top pixel.
+# Lowercase is drawn as uppercase (pylon style).
+FONT_5X7 = {
+    " ": "0000000000", "!": "00005F0000", '"': "0007000700", "#": "147F147F14",
+    "$": "242A7F2A12", "%": "2313086462", "&": "3649552250", "'": "0005030000",
+    "(": "001C224100", ")": "0041221C00", "*": "082A1C2A08", "+": "08083E0808",
+    ",": "0050300000", "-": "0808080808", ".": "0060600000", "/": "2010080402",
+    "0": "3E5149453E", "1": "00427F4000", "2": "4261514946", "3": "2141454B31",
+    "4": "1814127F10", "5": "2745454539", "6": "3C4A494930", "7": "0171090503",
+    "8": "3649494936", "9": "064949291E", ":": "0036360000", ";": "0056360000",
+    "<": "0814224100", "=": "1414141414", ">": "0041221408", "?": "0201510906",
+    "@": "3249794136", "A": "7E1111117E", "B": "7F49494936", "C": "3E41414122",
+    "D": "7F4141221C", "E": "7F49494941", "F": "7F09090101", "G": "3E41415132",
+    "H": "7F0808087F", "I": "00417F4100", "J": "2040413F01", "K": "7F08142241",
+    "L": "7F40404040", "M": "7F0204027F", "N": "7F0408107F", "O": "3E4141413E",
+    "P": "7F09090906", "Q": "3E4151215E", "R": "7F09192946", "S": "4649494931",
+    "T": "01017F0101", "U": "3F4040403F", "V": "1F2040201F", "W": "7F2018207F",
+    "X": "6314081463", "Y": "0304780403", "Z": "6151494543", "[": "007F414100",
+    "]": "0041417F00", "_": "4040404040", "|": "00007F0000",
+}
+
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
+GREY = (120, 120, 120)
+YELLOW = (255, 200, 0)
+GREEN = (0, 200, 60)
+RED = (230, 30, 30)
+CYAN = (0, 180, 220)
+ORANGE = (255, 120, 0)
+
+FLAG_COLORS = {
+    "GREEN": GREEN,
+    "YELLOW": YELLOW,
+    "RED": RED,
+    "WHITE": WHITE,
+    "CHECKERED": WHITE,
+    "ORANGE": ORANGE,
+}
+SERIES_COLORS = {"CUP": YELLOW, "OREILLY": GREEN, "TRUCKS": RED}
+PODIUM_COLORS = {1: YELLOW, 2: WHITE, 3: CYAN}
+
+
+@lru_cache(maxsize=128)
+def glyph_mask(char):
+    """7x5 boolean mask for one character (unknown characters draw as '?')"""
+    char = char.upper()
+    if char not in FONT_5X7:
+        char = unicodedata.normalize("NFKD", char).encode("ascii", "ignore").decode("ascii")[:1].upper()
+    columns = bytes.fromhex(FONT_5X7.get(char, FONT_5X7["?"]))
+    bits = np.unpackbits(np.frombuffer(columns, dtype=np.uint8)[:, None], axis=1, bitorder="little")
+    return bits[:, :GLYPH_HEIGHT].T.astype(bool)
+
+
+@lru_cache(maxsize=1024)
+def text_run(text, color):
+    """
+    Pre-rendered RGB strip (GLYPH_HEIGHT x len(text) * CHAR_ADVANCE x 3)
+
+    Cached whole, so repeated strings cost one lookup. Returned arrays are
+    read-only - they are shared between frames.
+    """
+    run = np.zeros((GLYPH_HEIGHT, len(text) * CHAR_ADVANCE, 3), dtype=np.uint8)
+    for i, char in enumerate(text):
+        if char != " ":
+            x = i * CHAR_ADVANCE
+            run[:, x:x + GLYPH_WIDTH][glyph_mask(char)] = color
+    run.flags.writeable = False
+    return run
+
+
+def cache_stats():
+    """Hit/miss counts of the glyph and text-run caches"""
+    stats = {}
+    for name, cached in (("glyphs", glyph_mask), ("textRuns", text_run)):
+        info = cached.cache_info()
+        total = info.hits + info.misses
+        stats[name] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "hitRate": info.hits / total if total else 0.0,
+        }
+    return stats
+
+
+def clear_caches():
+    glyph_mask.cache_clear()
+    text_run.cache_clear()
+
+
+class LedView:
+    """
+    Double-buffered raster renderer for a width x height panel
+
+    Rows are ROW_HEIGHT pixels tall; a row is a tuple of cells
+    (column, text, color). Only rows whose cells changed since that buffer
+    was last drawn are cleared and re-blitted.
+    """
+
+    def __init__(self, width=64, height=32):
+        self.width = width
+        self.height = height
+        self.rows = height // ROW_HEIGHT
+        self.columns = width // CHAR_ADVANCE
+        self.buffers = [np.zeros((height, width, 3), dtype=np.uint8) for _ in range(2)]
+        self.row_keys = [[None] * self.rows for _ in range(2)]
+        self.front = 0
+        self.frames = 0
+        self.rows_blitted = 0
+
+    @property
+    def frame(self):
+        """The last completed frame (do not modify)"""
+        return self.buffers[self.front]
+
+    # -------------------------
+    # Drawing
+    # -------------------------
+
+    def draw(self, rows):
+        """
+        Render a list of rows into the back buffer and swap
+
+        Returns:
+            int: rows re-blitted for this frame
+        """
+        back = 1 - self.front
+        buffer, keys = self.buffers[back], self.row_keys[back]
+        rows = list(rows[:self.rows]) + [()] * (self.rows - len(rows))
+
+        dirty = 0
+        for index, cells in enumerate(rows):
+            if keys[index] == cells:
+                continue
+            y = index * ROW_HEIGHT
+            buffer[y:y + ROW_HEIGHT] = 0
+            for column, text, color in cells:
+                x = max(column * CHAR_ADVANCE, 0)
+                if x >= self.width:
+                    continue
+                run = text_run(text, color)
+                visible = min(run.shape[1], self.width - x)
+                buffer[y:y + GLYPH_HEIGHT, x:x + visible] = run[:, :visible]
+            keys[index] = cells
+            dirty += 1
+
+        self.front = back
+        self.frames += 1
+        self.rows_blitted += dirty
+        return dirty
+
+    def render(self, layout):
+        """Render any build_*_layout() output; returns rows re-blitted"""
+        mode = layout.get("mode")
+        if mode == "LIVE":
+            return self.draw(self.live_rows(layout))
+        if mode == "POINTS":
+            return self.draw(self.points_rows(layout))
+        if mode == "SCHEDULE":
+            return self.draw(self.schedule_rows(layout))
+        return self.draw([])
+
+    # -------------------------
+    # Layouts -> rows
+    # -------------------------
+
+    def _fit(self, text, width):
+        return text[:max(width, 0)]
+
+    def live_rows(self, layout):
+        header = layout["header"]
+        flag = header.get("flag", "")
+        lap = f"{header.get('lap', 0)}/{header.get('total', 0)}"
+        if len(lap) >= self.columns:
+            lap = str(header.get("lap", 0))  # Narrow panel: drop the total
+        if len(lap) >= self.columns:
+            lap = ""
+        flag_cell = (0, self._fit(flag, self.columns - len(lap) - 1 if lap else self.columns),
+                     FLAG_COLORS.get(flag.upper(), GREY))
+        rows = [(flag_cell, (self.columns - len(lap), lap, WHITE)) if lap else (flag_cell,)]
+
+        # Interval column only when the panel is wide enough to keep names readable
+        show_interval = self.columns >= 20
+        name_width = self.columns - 7 - (8 if show_interval else 0)
+        for car in list(layout.get("fixed", [])) + list(layout.get("scrolling", [])):
+            if car.get("isOnDVP"):
+                name_color = ORANGE
+            elif not car.get("isOnTrack", True):
+                name_color = RED
+            else:
+                name_color = WHITE
+            cells = [
+                (0, f"{car['position']:>2}", YELLOW if car.get("battling") else GREY),
+                (3, f"{car['car']:<3}", CYAN),
+                (7, self._fit(str(car["driver"]), name_width), name_color),
+            ]
+            if show_interval:
+                interval = "LEADER" if car.get("interval") is None else f"+{car['interval']:.3f}"
+                cells.append((self.columns - 7, f"{interval:>7}", GREEN))
+            rows.append(tuple(cells))
+        return rows
+
+    def points_rows(self, layout):
+        title = layout.get("header", {}).get("title", "POINTS")
+        rows = [((0, self._fit(title, self.columns), WHITE),)]
+
+        show_back = self.columns >= 18
+        name_width = self.columns - 7 - (6 if show_back else 0)
+        for driver in layout["drivers"]:
+            cells = [
+                (0, f"{driver['position']:>2}", PODIUM_COLORS.get(driver["position"], GREY)),
+                (3, f"{str(driver['car']):<3}", CYAN),
+                (7, self._fit(str(driver["driver"]), name_width), WHITE),
+            ]
+            if show_back:
+                back = "LEAD" if driver.get("pointsBack") == 0 else f"-{driver.get('pointsBack', 0)}"
+                cells.append((self.columns - 5, f"{back:>5}", GREEN))
+            rows.append(tuple(cells))
+        return rows
+
+    def schedule_rows(self, layout):
+        rows = [((0, self._fit(layout["header"], self.columns), YELLOW),)]
+        for race in layout["rows"]:
+            date = race["date"][5:]  # MM-DD
+            rows.append((
+                (0, date, WHITE),
+                (6, self._fit(race.get("track") or race["name"], self.columns - 6), SERIES_COLORS.get(race.get("series"), WHITE)),
+            ))
+        return rows
+
+
+# -------------------------
+# Sinks
+# -------------------------
+
+class NullSink:
+    """Discards frames (for timing the renderer alone)"""
+
+    def __init__(self):
+        self.frames = 0
+
+    def write(self, frame):
+        self.frames += 1
+
+    def close(self):
+        pass
+
+
+class PPMSink:
+    """Writes each frame as a binary PPM (P6): frame_000000.ppm, ..."""
+
+    extension = "ppm"
+
+    def __init__(self, directory, scale=1):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.scale = scale
+        self.frames = 0
+
+    def _path(self):
+        return self.directory / f"frame_{self.frames:06d}.{self.extension}"
+
+    def _scaled(self, frame):
+        if self.scale > 1:
+            frame = frame.repeat(self.scale, axis=0).repeat(self.scale, axis=1)
+        return np.ascontiguousarray(frame)
+
+    def encode(self, frame):
+        height, width = frame.shape[:2]
+        return f"P6 {width} {height} 255\n".encode("ascii") + frame.tobytes()
+
+    def write(self, frame):
+        with open(self._path(), "wb") as f:
+            f.write(self.encode(self._scaled(frame)))
+        self.frames += 1
+
+    def close(self):
+        pass
+
+
+class PNGSink(PPMSink):
+    """Writes each frame as an 8-bit RGB PNG (stdlib zlib, no Pillow)"""
+
+    extension = "png"
+
+    @staticmethod
+    def _chunk(kind, data):
+        body = kind + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+    def encode(self, frame):
+        height, width = frame.shape[:2]
+        # Filter type 0 (none) in front of every scanline
+        raw = np.concatenate(
+            [np.zeros((height, 1), dtype=np.uint8), frame.reshape(height, width * 3)], axis=1
+        )
+        return (
+            b"\x89PNG\r\n\x1a\n"
+            + self._chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + self._chunk(b"IDAT", zlib.compress(raw.tobytes(), 6))
+            + self._chunk(b"IEND", b"")
+        )
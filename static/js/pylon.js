@@ -0,0 +1,545 @@
+let lastMode = null;
+let liveVersion = '';  // Version of the snapshot on screen (for /api/live)
+let framePainted = false;  // Something (live or cached) is on screen
+
+const FRAME_KEY = 'pylon:lastFrame';  // localStorage copy of the last frame
+
+const SCROLL_SPEED = 40;      // px per second through positions 11+
+const SCROLL_PAUSE = 2000;    // ms to hold at the top and bottom
+const VISIBLE_SCROLL_ROWS = 10;
+
+const EVENTS_INTERVAL = 5000;  // ms between /api/events polls while LIVE
+const TICKER_EVENTS = 5;       // Newest events shown in the ticker
+let lastEventId = 0;
+let lastEventRace;  // Event ids restart at 1 for every race
+let tickerEvents = [];
+
+// LIVE mode keeps its DOM between updates: one row per car, keyed by
+// car number, and only cells whose value changed are touched.
+let liveView = null;
+
+const perf = {
+    enabled: /[?&]perf\b/.test(location.search),
+    patches: 0,       // Cells written in the last update
+    moved: 0,         // Rows that changed position in the last update
+    updateMs: 0,      // Time spent applying the last update
+    totalPatches: 0,
+    overlay: null,
+};
+
+function showFrame(data) {
+    const modeBadge = document.getElementById('modeBadge');
+    modeBadge.textContent = data.mode + ' MODE';
+    modeBadge.className = 'mode-badge ' + data.mode.toLowerCase();
+
+    document.getElementById('lastUpdate').textContent =
+        new Date(data.timestamp).toLocaleTimeString();
+
+    if (data.mode === 'LIVE') {
+        if (data.data && data.data.cars) renderLive(data.data);
+    } else if (data.mode === 'IDLE') {
+        if (data.data && data.data.mode === 'POINTS') {
+            renderPoints(data.data);
+        } else if (data.data && data.data.mode === 'SCHEDULE') {
+            renderSchedule(data.data);
+        }
+    }
+    framePainted = true;
+}
+
+// Keep the last frame so a rebooted display can paint before the network is up
+function saveFrame(data) {
+    try {
+        localStorage.setItem(FRAME_KEY, JSON.stringify(data));
+    } catch (e) {
+        // Storage full or disabled - not worth failing over
+    }
+}
+
+function restoreFrame() {
+    let data = null;
+    try {
+        data = JSON.parse(localStorage.getItem(FRAME_KEY));
+    } catch (e) {
+        return;
+    }
+    if (!data || !data.mode) return;
+
+    showFrame(data);
+    document.getElementById('lastUpdate').textContent += ' (cached)';
+}
+
+// LIVE: long-poll /api/live, which answers once per new snapshot with
+// the whole field. Otherwise poll /api/data every 2 seconds.
+function update() {
+    const live = lastMode === 'LIVE';
+    const url = live ? `/api/live?since=${encodeURIComponent(liveVersion)}` : '/api/data';
+
+    fetch(url)
+        .then(response => response.json())
+        .then(data => {
+            lastMode = data.mode;
+            if (data.mode === 'LIVE') {
+                if (!live) {
+                    // Just went live - switch to the full-field feed now
+                    setTimeout(update, 0);
+                    return;
+                }
+                if (data.version !== liveVersion || !liveView) {
+                    showFrame(data);
+                    if (data.data) saveFrame(data);
+                }
+                liveVersion = data.version;
+                setTimeout(update, data.data ? 0 : 2000);
+                return;
+            }
+
+            liveVersion = '';
+            showFrame(data);
+            if (data.data) saveFrame(data);
+            setTimeout(update, live ? 0 : 2000);
+        })
+        .catch(error => {
+            console.error('Error:', error);
+            if (framePainted) {
+                // Keep the last frame up rather than blanking the display
+                document.getElementById('modeBadge').textContent = 'OFFLINE';
+            } else {
+                setContent('<div class="loading">Connection lost. Retrying...</div>');
+            }
+            setTimeout(update, 2000);
+        });
+}
+
+// Race events ticker: only new events are fetched (since=lastEventId)
+function updateEvents() {
+    const ticker = document.getElementById('ticker');
+    if (lastMode !== 'LIVE') {
+        ticker.hidden = true;
+        setTimeout(updateEvents, EVENTS_INTERVAL);
+        return;
+    }
+
+    let delay = EVENTS_INTERVAL;
+    fetch(`/api/events?since=${lastEventId}`)
+        .then(response => response.json())
+        .then(log => {
+            if (log.race !== lastEventRace) {
+                lastEventRace = log.race;
+                tickerEvents = [];
+                if (lastEventId !== 0) {
+                    // New race: ids restarted, so our since= hid its events
+                    lastEventId = 0;
+                    ticker.hidden = true;
+                    delay = 0;
+                    return;
+                }
+            }
+            lastEventId = log.lastId;
+            if (log.events.length) {
+                tickerEvents = tickerEvents.concat(log.events).slice(-TICKER_EVENTS);
+                renderTicker(ticker);
+            }
+            ticker.hidden = tickerEvents.length === 0;
+        })
+        .catch(() => {})
+        .finally(() => setTimeout(updateEvents, delay));
+}
+
+function describeEvent(event) {
+    const who = event.car ? `#${event.car} ${event.driver}` : '';
+    switch (event.type) {
+        case 'LEAD_CHANGE': return `${who} takes the lead`;
+        case 'FLAG_CHANGE': return `${event.flag} flag`;
+        case 'STAGE_END': return `End of stage ${event.stage}`;
+        case 'PIT_IN': return `${who} pits (stop ${event.stop})`;
+        case 'PIT_OUT': return `${who} back on track`;
+        case 'OFF_TRACK': return `${who} off track`;
+        case 'DVP': return `${who} on DVP`;
+        default: return event.type;
+    }
+}
+
+function renderTicker(ticker) {
+    ticker.replaceChildren(...tickerEvents.slice().reverse().map(event => {
+        const span = document.createElement('span');
+        span.className = 'event ' + event.type.toLowerCase();
+        span.textContent = `L${event.lap} ${describeEvent(event)}`;
+        return span;
+    }));
+}
+
+function setContent(html) {
+    // Full rebuild (points, schedule, errors) - drops the live row model
+    liveView = null;
+    document.getElementById('content').innerHTML = html;
+}
+
+function createLiveView() {
+    setContent(`
+        <div class="race-header">
+            <div class="race-name"></div>
+            <div class="race-info">
+                <div class="flag-status"></div>
+                <div class="lap-counter"></div>
+                <div class="laps-to-go"></div>
+            </div>
+        </div>
+        <div class="position-grid"></div>
+        <div class="scroll-viewport">
+            <div class="scroll-track"></div>
+        </div>
+        <div class="scroll-indicator" hidden>↓ Scrolling through field ↓</div>
+    `);
+
+    const content = document.getElementById('content');
+    return {
+        header: content.querySelector('.race-header'),
+        raceName: content.querySelector('.race-name'),
+        flag: content.querySelector('.flag-status'),
+        lapCounter: content.querySelector('.lap-counter'),
+        lapsToGo: content.querySelector('.laps-to-go'),
+        grid: content.querySelector('.position-grid'),
+        viewport: content.querySelector('.scroll-viewport'),
+        track: content.querySelector('.scroll-track'),
+        indicator: content.querySelector('.scroll-indicator'),
+        values: {},
+        rows: new Map(),  // car number -> row model
+        order: [],        // car numbers in display order
+        scroll: { offset: 0, max: 0, holdUntil: 0, last: null, applied: 0 },
+    };
+}
+
+// Write one property only if its value changed since the last update
+function patch(values, key, el, prop, value) {
+    if (values[key] === value) return;
+    values[key] = value;
+    el[prop] = value;
+    perf.patches++;
+}
+
+function renderLive(layout) {
+    const started = performance.now();
+    perf.patches = 0;
+    perf.moved = 0;
+
+    if (!liveView) {
+        liveView = createLiveView();
+    }
+    const view = liveView;
+    const flag = layout.header.flag.toLowerCase();
+
+    patch(view.values, 'headerClass', view.header, 'className', `race-header flag-${flag}`);
+    patch(view.values, 'raceName', view.raceName, 'textContent', layout.header.track || 'NASCAR Cup Series');
+    patch(view.values, 'flagClass', view.flag, 'className', `flag-status ${flag}`);
+    patch(view.values, 'flag', view.flag, 'textContent', layout.header.flag);
+    patch(view.values, 'lap', view.lapCounter, 'textContent', `LAP ${layout.header.lap} / ${layout.header.total}`);
+    patch(view.values, 'lapsToGo', view.lapsToGo, 'textContent', `${layout.header.lapsToGo} TO GO`);
+    patch(view.values, 'indicator', view.indicator, 'hidden', layout.cars.length <= layout.fixedRows);
+
+    // Update all cars
+    const allCars = layout.cars;
+    allCars.forEach(car => {
+        const key = String(car.car);
+        let row = view.rows.get(key);
+        if (!row) {
+            row = createCarRow();
+            view.rows.set(key, row);
+        }
+        updateCarRow(row, car, layout.header.lap);
+    });
+
+    placeRows(view, allCars.map(car => String(car.car)), layout.fixedRows);
+    sizeScrollViewport(view);
+
+    perf.updateMs = performance.now() - started;
+    perf.totalPatches += perf.patches;
+}
+
+function createCarRow() {
+    const el = document.createElement('div');
+    el.className = 'position-row';
+    el.innerHTML = `
+        <div class="position-number"></div>
+        <div class="car-number"></div>
+        <div class="driver-info">
+            <div class="driver-name"></div>
+            <div class="driver-status"></div>
+        </div>
+        <div></div>
+        <div class="interval"></div>
+        <div class="speed-info"></div>
+    `;
+
+    return {
+        el: el,
+        position: el.querySelector('.position-number'),
+        car: el.querySelector('.car-number'),
+        driver: el.querySelector('.driver-name'),
+        status: el.querySelector('.driver-status'),
+        interval: el.querySelector('.interval'),
+        speed: el.querySelector('.speed-info'),
+        values: {},
+    };
+}
+
+function updateCarRow(row, car, currentLap) {
+    let classes = 'position-row';
+    if (car.interval === null) classes += ' leader';
+    if (car.battling) classes += ' battle';
+    if (car.position <= 3) classes += ' top3';
+
+    let posClass = 'position-number';
+    if (car.position === 1) posClass += ' p1';
+    else if (car.position === 2) posClass += ' p2';
+    else if (car.position === 3) posClass += ' p3';
+
+    // Check for recent pit stop (within last 2 laps)
+    let recentPit = false;
+    if (car.pitStops && car.pitStops.length > 0) {
+        const lastPit = car.pitStops[car.pitStops.length - 1];
+        if (lastPit.pit_in_leader_lap > 0) {
+            const lapsSincePit = currentLap - lastPit.pit_in_leader_lap;
+            if (lapsSincePit >= 0 && lapsSincePit <= 2) {
+                recentPit = true;
+            }
+        }
+    }
+
+    let statusBadges = '';
+    if (recentPit) {
+        statusBadges += '<span class="status-badge pit">PIT</span>';
+    }
+    if (!car.isOnTrack) {
+        statusBadges += '<span class="status-badge off">OFF</span>';
+    }
+    if (car.isOnDVP) {
+        statusBadges += '<span class="status-badge dvp">DVP</span>';
+    }
+
+    let interval = car.interval === null ? 'LEADER' : `+${car.interval.toFixed(3)}`;
+    let intervalClass = car.interval === null ? 'interval leader' : 'interval gap';
+
+    let speedInfo = '';
+    if (car.lastLapSpeed) {
+        speedInfo = `${car.lastLapSpeed.toFixed(1)} mph`;
+    }
+
+    const v = row.values;
+    patch(v, 'rowClass', row.el, 'className', classes);
+    patch(v, 'posClass', row.position, 'className', posClass);
+    patch(v, 'position', row.position, 'textContent', String(car.position));
+    patch(v, 'car', row.car, 'textContent', `#${car.car}`);
+    patch(v, 'driver', row.driver, 'textContent', car.driver);
+    patch(v, 'badges', row.status, 'innerHTML', statusBadges);
+    patch(v, 'intervalClass', row.interval, 'className', intervalClass);
+    patch(v, 'interval', row.interval, 'textContent', interval);
+    patch(v, 'speed', row.speed, 'textContent', speedInfo);
+}
+
+// Put rows in running order. Rows that stay on screen slide from their
+// old spot with a transform (FLIP) instead of jumping via re-layout.
+function placeRows(view, order, fixedRows) {
+    const unchanged = order.length === view.order.length &&
+        order.every((key, i) => key === view.order[i]);
+    if (unchanged) return;
+
+    const keep = new Set(order);
+
+    // First: where rows are now (one layout read for all of them)
+    const first = new Map();
+    order.forEach(key => {
+        const row = view.rows.get(key);
+        if (row.el.parentNode) first.set(key, row.el.getBoundingClientRect().top);
+    });
+
+    view.rows.forEach((row, key) => {
+        if (!keep.has(key)) {
+            row.el.remove();
+            view.rows.delete(key);
+        }
+    });
+
+    // Last: move nodes into place (appendChild moves existing nodes).
+    // The top rows are pinned, the rest go in the scrolling track.
+    order.forEach((key, i) => {
+        const container = i < fixedRows ? view.grid : view.track;
+        container.appendChild(view.rows.get(key).el);
+    });
+
+    // Invert: read every new position, then offset each moved row back
+    const deltas = [];
+    first.forEach((top, key) => {
+        const row = view.rows.get(key);
+        const delta = top - row.el.getBoundingClientRect().top;
+        if (Math.abs(delta) >= 1) deltas.push([row, delta]);
+    });
+    deltas.forEach(([row, delta]) => {
+        row.el.style.transition = 'none';
+        row.el.style.transform = `translateY(${delta}px)`;
+    });
+
+    // Play: flush the inverted transforms, then let CSS animate to zero
+    if (deltas.length) {
+        void view.grid.offsetHeight;
+        deltas.forEach(([row]) => {
+            row.el.style.transition = '';
+            row.el.style.transform = '';
+        });
+    }
+
+    view.order = order;
+    perf.moved = deltas.length;
+}
+
+// Show VISIBLE_SCROLL_ROWS of the scrolling rows at a time
+function sizeScrollViewport(view) {
+    const rows = view.track.children;
+    if (rows.length <= VISIBLE_SCROLL_ROWS) {
+        view.viewport.style.height = '';
+        view.scroll.max = 0;
+        return;
+    }
+    const pitch = rows[1].offsetTop - rows[0].offsetTop;
+    const height = pitch * VISIBLE_SCROLL_ROWS - 8;
+    view.viewport.style.height = `${height}px`;
+    view.scroll.max = Math.max(view.track.scrollHeight - height, 0);
+}
+
+// Smooth local scrolling: moves the track with a transform every frame,
+// pausing at each end. No server round trip per scroll step.
+function scrollFrame(now) {
+    const view = liveView;
+    if (view) {
+        const scroll = view.scroll;
+        const dt = scroll.last === null ? 0 : now - scroll.last;
+        scroll.last = now;
+
+        if (scroll.max <= 0) {
+            scroll.offset = 0;
+        } else if (now >= scroll.holdUntil) {
+            if (scroll.offset >= scroll.max) {
+                scroll.offset = 0;  // Back to P11 after the hold at the bottom
+                scroll.holdUntil = now + SCROLL_PAUSE;
+            } else {
+                scroll.offset = Math.min(scroll.offset + SCROLL_SPEED * dt / 1000, scroll.max);
+                if (scroll.offset >= scroll.max) scroll.holdUntil = now + SCROLL_PAUSE;
+            }
+        }
+        const y = -Math.round(scroll.offset);
+        if (y !== scroll.applied) {
+            scroll.applied = y;
+            view.track.style.transform = `translateY(${y}px)`;
+        }
+    }
+    requestAnimationFrame(scrollFrame);
+}
+
+function renderPoints(layout) {
+    let html = '<div class="points-header">POINTS STANDINGS</div>';
+    html += '<div class="position-grid">';
+
+    layout.drivers.forEach(driver => {
+        let posClass = 'position-number';
+        if (driver.position === 1) posClass += ' p1';
+        else if (driver.position === 2) posClass += ' p2';
+        else if (driver.position === 3) posClass += ' p3';
+
+        let pointsBack = driver.pointsBack === 0 ? 'LEADER' : `-${driver.pointsBack}`;
+        let pointsClass = driver.pointsBack === 0 ? 'points-value leader' : 'points-value deficit';
+
+        html += `
+            <div class="points-row">
+                <div class="${posClass}">${driver.position}</div>
+                <div class="car-number">#${driver.car}</div>
+                <div class="driver-name">${driver.driver}</div>
+                <div></div>
+                <div class="${pointsClass}">${pointsBack}</div>
+            </div>
+        `;
+    });
+
+    html += '</div>';
+    setContent(html);
+}
+
+function renderSchedule(layout) {
+    let html = '<div class="points-header">UPCOMING RACES</div>';
+
+    layout.rows.forEach(race => {
+        let classes = 'schedule-row';
+        if (race.isChase) classes += ' playoff';
+
+        html += `
+            <div class="${classes}">
+                <div class="schedule-date">${race.date} • ${race.time}</div>
+                <div class="schedule-race-name">${race.name}</div>
+                <div>
+                    <span class="schedule-series ${race.series}">${race.series}</span>
+                    <span style="color: #888;">${race.broadcast}</span>
+                </div>
+            </div>
+        `;
+    });
+
+    setContent(html);
+}
+
+// Performance counter: frame time from requestAnimationFrame plus the
+// cost of the last update. Only runs while visible.
+function togglePerf() {
+    perf.enabled = !perf.enabled;
+    if (perf.enabled) {
+        startPerf();
+    } else if (perf.overlay) {
+        perf.overlay.remove();
+        perf.overlay = null;
+    }
+}
+
+function startPerf() {
+    perf.overlay = document.createElement('div');
+    perf.overlay.className = 'perf-overlay';
+    document.body.appendChild(perf.overlay);
+
+    let last = performance.now();
+    let windowStart = last;
+    let frames = 0;
+    let worst = 0;
+
+    function frame(now) {
+        if (!perf.enabled) return;
+        const dt = now - last;
+        last = now;
+        frames++;
+        worst = Math.max(worst, dt);
+
+        if (now - windowStart >= 1000) {
+            const avg = (now - windowStart) / frames;
+            perf.overlay.textContent =
+                `frame ${avg.toFixed(1)} ms (max ${worst.toFixed(1)}) ${Math.round(frames * 1000 / (now - windowStart))} fps\n` +
+                `update ${perf.updateMs.toFixed(2)} ms  patches ${perf.patches}  moved ${perf.moved}\n` +
+                `total patches ${perf.totalPatches}`;
+            windowStart = now;
+            frames = 0;
+            worst = 0;
+        }
+        requestAnimationFrame(frame);
+    }
+    requestAnimationFrame(frame);
+}
+
+document.addEventListener('keydown', event => {
+    if (event.key === 'p' || event.key === 'P') togglePerf();
+});
+if (perf.enabled) startPerf();
+
+if ('serviceWorker' in navigator) {
+    // Only available on localhost/HTTPS; elsewhere the HTTP cache does the work
+    navigator.serviceWorker.register('/sw.js').catch(() => {});
+}
+
+restoreFrame();
+update();
+updateEvents();
+requestAnimationFrame(scrollFrame);
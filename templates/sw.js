@@ -0,0 +1,51 @@
+// NASCAR Pylon service worker
+// Generated by webDisplay.py - the cache name changes with the asset hashes.
+
+const CACHE = 'pylon-{{ version }}';
+const PRECACHE = {{ precache|tojson }};
+
+self.addEventListener('install', event => {
+    event.waitUntil(
+        caches.open(CACHE)
+            .then(cache => cache.addAll(PRECACHE))
+            .then(() => self.skipWaiting())
+    );
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil(
+        caches.keys()
+            .then(keys => Promise.all(keys.filter(key => key !== CACHE).map(key => caches.delete(key))))
+            .then(() => self.clients.claim())
+    );
+});
+
+self.addEventListener('fetch', event => {
+    const url = new URL(event.request.url);
+    if (event.request.method !== 'GET' || url.origin !== location.origin) return;
+
+    if (url.pathname.startsWith('/static/')) {
+        // Hashed URLs never change: cache first
+        event.respondWith(
+            caches.match(event.request).then(cached => cached || fetch(event.request).then(response => {
+                if (response.ok) {
+                    const copy = response.clone();
+                    caches.open(CACHE).then(cache => cache.put(event.request, copy));
+                }
+                return response;
+            }))
+        );
+    } else if (url.pathname === '/') {
+        // Page shell: answer from cache at once, refresh it in the background
+        event.respondWith(
+            caches.open(CACHE).then(cache => cache.match('/').then(cached => {
+                const network = fetch(event.request).then(response => {
+                    if (response.ok) cache.put('/', response.clone());
+                    return response;
+                });
+                return cached || network;
+            }))
+        );
+    }
+    // /api/* goes straight to the network; the page paints its cached frame
+});
@@ -1,35 +1,86 @@
 #!/usr/bin/env python3
 """
-Auto-update standings from NASCAR points feed
-Runs after each race to pull latest standings
+Auto-update standings from NASCAR points feeds
+Runs after each race to pull latest standings for all three series
+
+- Points feed URLs come from the ops feed (driver_points_feed_url_series*)
+- Feeds are fetched in parallel over one shared HTTP session
+- Files are only rewritten when the standings actually changed
+- Each series is written atomically (displays never see a partial file)
+- The same feeds refresh the driver registry (data/drivers.json)
 """
 
 import csv
+import hashlib
+import io
 import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
-import requests
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.driverRegistry import DriverRegistry
+from src.fileUtils import atomic_write_json, atomic_write_text
+from tools.nascarAPIclient import NascarApiClient, Series
 
 DATA_DIR = Path("data")
 STANDINGS_CSV = DATA_DIR / "standings.csv"
 STANDINGS_JSON = DATA_DIR / "standings.json"
 
-# NASCAR points feed URL (from ops feed)
-POINTS_FEED_URL = "https://cf.nascar.com/cacher/2026/1/points-feed.json"
+# Output files and ops feed key for each series
+SERIES_OUTPUTS = {
+    Series.CUP: {
+        "json": STANDINGS_JSON,
+        "csv": STANDINGS_CSV,
+        "opsKey": "cupPoints",
+    },
+    Series.OREILLY: {
+        "json": DATA_DIR / "standingsOR.json",
+        "csv": DATA_DIR / "standingsOR.csv",
+        "opsKey": "xfinityPoints",  # API still uses 'xfinity' naming
+    },
+    Series.TRUCKS: {
+        "json": DATA_DIR / "standingsTruck.json",
+        "csv": DATA_DIR / "standingsTruck.csv",
+        "opsKey": "trucksPoints",
+    },
+}
+
+# Used when the ops feed is unreachable or doesn't list a points feed
+POINTS_FEED_URL_TEMPLATE = "{base}/cacher/{year}/{series}/points-feed.json"
+
+
+def get_points_feed_urls(client, series_list):
+    """Look up each series' points feed URL in the ops feed"""
+    ops = client.get_ops_feed() or {}
+    year = datetime.now().year
+
+    urls = {}
+    for series in series_list:
+        url = ops.get(SERIES_OUTPUTS[series]["opsKey"])
+        if not url:
+            url = POINTS_FEED_URL_TEMPLATE.format(
+                base=client.base_url, year=year, series=series.value
+            )
+        urls[series] = url
+    return urls
 
 
-def fetch_current_standings():
-    """Fetch current Cup Series standings from NASCAR"""
-    try:
-        print("Fetching current standings from NASCAR...")
-        response = requests.get(POINTS_FEED_URL, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        return data
-    except Exception as e:
-        print(f"❌ Error fetching standings: {e}")
-        return None
+def fetch_all_standings(client, series_list):
+    """
+    Fetch every series' points feed concurrently
+
+    Returns:
+        dict: Series -> raw feed data (None if the fetch failed)
+    """
+    urls = get_points_feed_urls(client, series_list)
+    print(f"Fetching standings for {', '.join(s.name for s in series_list)}...")
+
+    with ThreadPoolExecutor(max_workers=len(urls)) as pool:
+        futures = {series: pool.submit(client.get_data, url) for series, url in urls.items()}
+        return {series: future.result() for series, future in futures.items()}
 
 
 def parse_standings(data):
@@ -54,6 +105,7 @@ def parse_standings(data):
                     "position": int(position),
                     "car": str(car),
                     "driver": name,
+                    "driverId": driver.get("driver_id"),
                     "points": int(points),
                 }
             )
@@ -70,76 +122,160 @@ def parse_standings(data):
     return standings
 
 
-def save_to_csv(standings):
+def standings_hash(standings):
+    """Content hash of parsed standings (independent of key order)"""
+    payload = json.dumps(standings, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def stored_hash(json_path):
+    """Hash of the standings currently on disk, or None if unavailable"""
+    try:
+        with open(json_path) as f:
+            existing = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    return existing.get("contentHash") or standings_hash(existing.get("drivers", []))
+
+
+def save_to_csv(standings, csv_path=STANDINGS_CSV):
     """Save standings to CSV"""
-    with open(STANDINGS_CSV, "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["position", "car", "driver", "pointsBack"])
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(["position", "car", "driver", "pointsBack"])
 
-        for driver in standings:
-            writer.writerow(
-                [
-                    driver["position"],
-                    driver["car"],
-                    driver["driver"],
-                    driver["pointsBack"],
-                ]
-            )
+    for driver in standings:
+        writer.writerow(
+            [
+                driver["position"],
+                driver["car"],
+                driver["driver"],
+                driver["pointsBack"],
+            ]
+        )
 
-    print(f"✅ Saved to {STANDINGS_CSV}")
+    atomic_write_text(csv_path, buf.getvalue())
+    print(f"✅ Saved to {csv_path}")
 
 
-def save_to_json(standings):
+def save_to_json(standings, series=Series.CUP, json_path=STANDINGS_JSON, content_hash=None):
     """Save standings to JSON"""
     output = {
-        "series": "CUP",
+        "series": series.name,
         "season": datetime.now().year,
         "lastUpdated": datetime.now().isoformat(),
+        "contentHash": content_hash or standings_hash(standings),
         "drivers": standings,
     }
 
-    with open(STANDINGS_JSON, "w") as f:
-        json.dump(output, f, indent=2)
+    atomic_write_json(json_path, output)
+    print(f"✅ Saved to {json_path}")
+
+
+def update_registry(feeds):
+    """
+    Merge every fetched points feed into the driver registry
+
+    Returns:
+        int: number of drivers added or changed
+    """
+    registry = DriverRegistry()
+    registry.refresh()
+
+    changed = 0
+    for series, data in feeds.items():
+        if isinstance(data, list):
+            changed += registry.update_from_points_feed(series.name, data)
+
+    if changed or not registry.path.exists():
+        registry.save(updated=datetime.now().isoformat())
+        print(f"👤 Driver registry: {changed} drivers added/changed ({len(registry)} total)")
+    return changed
+
 
-    print(f"✅ Saved to {STANDINGS_JSON}")
+def update_series(series, data, force=False):
+    """
+    Parse one series' feed and write it if it changed
 
+    Returns:
+        str: "updated", "unchanged" or "failed"
+    """
+    outputs = SERIES_OUTPUTS[series]
 
-def main():
+    if not data:
+        print(f"❌ {series.name}: failed to fetch standings")
+        return "failed"
+
+    standings = parse_standings(data)
+    if not standings:
+        print(f"❌ {series.name}: failed to parse standings data")
+        return "failed"
+
+    content_hash = standings_hash(standings)
+    if not force and content_hash == stored_hash(outputs["json"]):
+        print(f"⏸️  {series.name}: unchanged ({len(standings)} drivers) - skipping write")
+        return "unchanged"
+
+    print(f"\n📊 {series.name}: {len(standings)} drivers")
+    print(f"Leader: #{standings[0]['car']} {standings[0]['driver']}")
+
+    # CSV first so standings.json (what the displays watch) lands last
+    save_to_csv(standings, outputs["csv"])
+    save_to_json(standings, series, outputs["json"], content_hash)
+    return "updated"
+
+
+def main(argv=None):
     """Main function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Update standings from NASCAR points feeds")
+    parser.add_argument(
+        "--series",
+        nargs="+",
+        choices=[s.name for s in SERIES_OUTPUTS],
+        default=[s.name for s in SERIES_OUTPUTS],
+        help="Which series to update (default: all)",
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Rewrite files even if nothing changed"
+    )
+    parser.add_argument(
+        "--base-url", type=str, help="Feed host override (e.g. a local feedSimulator)"
+    )
+    args = parser.parse_args(argv)
+
     print("=" * 60)
     print("NASCAR STANDINGS AUTO-UPDATER")
     print("=" * 60)
     print()
 
-    # Fetch data
-    data = fetch_current_standings()
-    if not data:
-        print("\n❌ Failed to fetch standings")
-        print("You can still manually update data/standings.csv")
-        return False
+    series_list = [Series[name] for name in args.series]
+    client = NascarApiClient(base_url=args.base_url)
 
-    # Parse data
-    standings = parse_standings(data)
-    if not standings:
-        print("\n❌ Failed to parse standings data")
-        return False
+    feeds = fetch_all_standings(client, series_list)
+    update_registry(feeds)
 
-    print(f"\n📊 Found {len(standings)} drivers")
-    print(f"Leader: #{standings[0]['car']} {standings[0]['driver']}")
+    results = {}
+    for series, data in feeds.items():
+        results[series] = update_series(series, data, args.force)
 
-    # Save
-    save_to_csv(standings)
-    save_to_json(standings)
+    print()
+    for series, result in results.items():
+        print(f"   {series.name:<8} {result}")
 
-    print("\n✅ Standings updated successfully!")
+    if "failed" in results.values():
+        print("\n⚠️  Some series failed - you can still manually update the CSV files")
+        return False
+
+    print("\n✅ Standings up to date!")
     print(f"   Season: {datetime.now().year}")
-    print(f"   Updated: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+    print(f"   Checked: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
 
     return True
 
 
 if __name__ == "__main__":
-    import sys
-
     success = main()
     sys.exit(0 if success else 1)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Shared statistics helpers for the load-test and probe tools
+"""
+
+import math
+import os
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list (pct in 0-100)"""
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(values):
+    """count / mean / p50 / p95 / p99 / max of a list of numbers"""
+    values = sorted(values)
+    if not values:
+        return {"count": 0, "mean": None, "p50": None, "p95": None, "p99": None, "max": None}
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": values[-1],
+    }
+
+
+def format_ms(seconds):
+    """Seconds -> '123.4 ms' (or '-' when missing)"""
+    return "-" if seconds is None else f"{seconds * 1000:.1f} ms"
+
+
+def process_cpu_seconds(pid):
+    """
+    Total user+system CPU seconds used by a process (Linux /proc only)
+
+    Returns:
+        float or None if unavailable
+    """
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        ticks = os.sysconf("SC_CLK_TCK")
+        # utime, stime, cutime, cstime are fields 14-17 (1-based, incl. pid/comm)
+        return sum(int(v) for v in fields[11:15]) / ticks
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def child_pids(pid):
+    """PIDs of a process's live children (Linux /proc only)"""
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(child) for child in f.read().split()]
+    except (OSError, ValueError):
+        return []
+
+
+def process_tree_cpu_seconds(pid):
+    """
+    CPU seconds of a process plus all its live descendants
+
+    Covers prefork servers (webDisplay.py --workers N), where the work
+    happens in children that are only folded into the parent's counters
+    once they exit.
+
+    Returns:
+        float or None if unavailable
+    """
+    total = process_cpu_seconds(pid)
+    if total is None:
+        return None
+    for child in child_pids(pid):
+        total += process_tree_cpu_seconds(child) or 0.0
+    return total
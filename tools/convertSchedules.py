@@ -2,50 +2,26 @@
 """
 CSV to JSON Schedule Converter
 Converts NASCAR schedule CSVs to JSON with camelCase keys
+
+Not needed for normal operation - src/scheduleCache.py compiles the
+CSVs automatically. Use this to produce the standalone JSON files
+(data/sched*.json) for other tools.
 """
 
-import csv
 import json
+import sys
 from pathlib import Path
 
-# Define the mapping and series info
-SERIES_CONFIG = {
-    "cup.csv": {"series": "CUP", "output": "sched.json"},
-    "oreilly.csv": {
-        "series": "OREILLY",
-        "output": "schedOR.json",
-    },  # O'Reilly Auto Parts Series
-    "trucks.csv": {"series": "TRUCKS", "output": "schedTruck.json"},
-}
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.scheduleUtils import DATA_DIR, SCHEDULES_DIR, SERIES_CSV, read_schedule_csv
 
-SCHEDULES_DIR = Path("schedules")
-DATA_DIR = Path("data")
+SERIES_CONFIG = SERIES_CSV
 
 
 def csv_to_json(csv_path, series_name):
     """Convert a CSV schedule to JSON format with camelCase keys"""
-    races = []
-
-    with open(csv_path, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-
-        for row in reader:
-            race = {
-                "round": int(row["round"]),
-                "raceName": row["raceName"],
-                "track": row["track"],
-                "location": row["location"],
-                "date": row["date"],
-                "day": row["day"],
-                "startTime": row["startTime"],
-                "broadcast": row["broadcast"],
-                "distance": row["distance"],
-                "laps": int(row["laps"]),
-                "isChase": row["isChase"].lower() == "true",
-            }
-            races.append(race)
-
-    return {"series": series_name, "timezone": "ET", "races": races}
+    return read_schedule_csv(csv_path, series_name)
 
 
 def main():
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Live Feed Enrichment
+Fetches the secondary feed.nascar.com endpoints alongside the live feed
+
+The cacher live feed has the running order; lap times, pit stops, flag
+history and loop data live in separate feeds (see
+tools/testNascarEndpoints.py). Each poll cycle the poller submits the
+endpoints that are due to a small thread pool before fetching the live
+feed, then collects them afterwards, so a cycle costs as long as the
+slowest request rather than the sum of all of them.
+
+Each endpoint has its own cadence (lap times don't need refreshing every
+5 seconds) and timeout. A request that outlives its cycle is left to
+finish and is not resubmitted until it has. Results are merged per car
+into data/liveEnriched.json and published on the "enriched" topic.
+"""
+
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.lapStore import LapStore
+from tools.nascarAPIclient import DEFAULT_BASE_URL, NOT_MODIFIED, flag_name
+from tools.testNascarEndpoints import endpoint_urls
+
+# name: (cadence seconds, timeout seconds)
+ENDPOINT_SETTINGS = {
+    "flag-state": (5, 2),
+    "pit-stops": (10, 3),
+    "lap-times": (15, 5),
+    "loop-data": (30, 5),
+}
+DEFAULT_ENDPOINTS = tuple(ENDPOINT_SETTINGS)
+MAX_WORKERS = 4
+
+
+# =========================
+# PARSERS (raw feed -> {car number: fields})
+# =========================
+
+def parse_pit_stops(data):
+    cars = {}
+    for stop in data or []:
+        car = cars.setdefault(str(stop.get("vehicle_number", "")), {"pitStops": 0})
+        car["pitStops"] += 1
+        pit_in, pit_out = stop.get("pit_in_elapsed_time"), stop.get("pit_out_elapsed_time")
+        car["lastPitLap"] = stop.get("pit_in_lap_count")
+        car["lastPitTime"] = (
+            round(pit_out - pit_in, 3) if pit_in is not None and pit_out is not None else None
+        )
+    return cars
+
+
+def parse_loop_data(data):
+    return {
+        str(row.get("vehicle_number", "")): {
+            "avgRunningPosition": row.get("avg_running_position"),
+            "fastestLap": row.get("fastest_lap"),
+            "loopLastLapSpeed": row.get("last_lap_speed"),
+        }
+        for row in data or []
+    }
+
+
+def parse_flag_state(data):
+    return [
+        {
+            "lap": row.get("lap_number", 0),
+            "flag": flag_name(row.get("flag_state", 0)),
+            "elapsed": row.get("elapsed_time"),
+        }
+        for row in data or []
+    ]
+
+
+# lap-times is handled incrementally by src/lapStore.py
+PARSERS = {
+    "pit-stops": parse_pit_stops,
+    "loop-data": parse_loop_data,
+    "flag-state": parse_flag_state,
+}
+
+
+class Endpoint:
+    """One enrichment feed: where, how often, and its latest result"""
+
+    def __init__(self, name, url, cadence, timeout):
+        self.name = name
+        self.url = url
+        self.cadence = cadence
+        self.timeout = timeout
+        self.next_due = 0.0
+        self.in_flight = None  # Future of a request still running
+        self.data = None  # Parsed result of the last good fetch
+        self.fetched = None  # datetime of the last good fetch
+        self.latency = None
+        self.ok = 0
+        self.failed = 0
+        self.not_modified = 0
+        self.last_error = None
+
+    def stats(self):
+        return {
+            "ok": self.ok,
+            "failed": self.failed,
+            "notModified": self.not_modified,
+            "latencyMs": round(self.latency * 1000, 1) if self.latency is not None else None,
+            "fetched": self.fetched.isoformat() if self.fetched else None,
+            "lastError": self.last_error,
+        }
+
+
+class EnrichmentFetcher:
+    """Concurrent, per-endpoint-cadenced fetches merged into one snapshot"""
+
+    def __init__(self, names=DEFAULT_ENDPOINTS, base_url=None, max_workers=MAX_WORKERS):
+        if base_url == DEFAULT_BASE_URL:
+            base_url = None  # The real secondary feeds live on feed.nascar.com
+        urls = endpoint_urls(base_url)
+        unknown = [name for name in names if name not in ENDPOINT_SETTINGS]
+        if unknown:
+            raise ValueError(f"Unknown enrichment endpoint(s): {', '.join(unknown)}")
+
+        self.endpoints = [
+            Endpoint(name, urls[name], *ENDPOINT_SETTINGS[name]) for name in names
+        ]
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="enrich")
+        self.lap_store = LapStore()
+        self.cycles = 0
+        self.last_cycle = None  # Seconds spent waiting in the last collect()
+
+    def _fetch(self, client, endpoint):
+        start = time.perf_counter()
+        # Without a previous result a 304 would leave nothing to serve
+        body = client.get_raw(
+            endpoint.url, timeout=endpoint.timeout, conditional=endpoint.data is not None
+        )
+        if body is None or body is NOT_MODIFIED:
+            return body, None, time.perf_counter() - start
+        parsed = self._parse(endpoint, json.loads(body))
+        return body, parsed, time.perf_counter() - start
+
+    def _parse(self, endpoint, data):
+        if endpoint.name == "lap-times":
+            # Only laps not seen before are stored; the summary is computed
+            # from the per-car arrays
+            self.lap_store.ingest(data)
+            return self.lap_store.summary()
+        return PARSERS[endpoint.name](data)
+
+    def submit(self, client, now=None):
+        """
+        Start fetches for every endpoint that is due
+
+        Returns:
+            list of (endpoint, future) to pass to collect()
+        """
+        now = time.monotonic() if now is None else now
+        pending = []
+        for endpoint in self.endpoints:
+            if endpoint.in_flight is not None or now < endpoint.next_due:
+                continue
+            endpoint.next_due = now + endpoint.cadence
+            endpoint.in_flight = self.pool.submit(self._fetch, client, endpoint)
+            pending.append((endpoint, endpoint.in_flight))
+        return pending
+
+    def collect(self, pending):
+        """
+        Wait for this cycle's fetches (bounded by the longest timeout)
+
+        Returns:
+            bool: True if any endpoint produced new data
+        """
+        if not pending:
+            return False
+        start = time.perf_counter()
+        deadline = max(endpoint.timeout for endpoint, _ in pending)
+        wait([future for _, future in pending], timeout=deadline)
+        self.last_cycle = time.perf_counter() - start
+        self.cycles += 1
+
+        changed = False
+        for endpoint, future in pending:
+            if not future.done():
+                # Still running: its result is dropped, and the endpoint is
+                # only resubmitted once it has finished
+                endpoint.failed += 1
+                endpoint.last_error = f"timed out after {endpoint.timeout}s"
+                future.add_done_callback(lambda f, e=endpoint: self._late(e, f))
+                continue
+            changed |= self._record(endpoint, future)
+        return changed
+
+    def _late(self, endpoint, future):
+        endpoint.in_flight = None
+
+    def _record(self, endpoint, future):
+        endpoint.in_flight = None
+        try:
+            body, parsed, latency = future.result()
+        except Exception as e:
+            endpoint.failed += 1
+            endpoint.last_error = str(e)
+            return False
+
+        endpoint.latency = latency
+        if body is None:
+            endpoint.failed += 1
+            endpoint.last_error = "no data"
+            return False
+        endpoint.last_error = None
+        if body is NOT_MODIFIED:
+            endpoint.not_modified += 1
+            return False
+        endpoint.ok += 1
+        endpoint.fetched = datetime.now()
+        changed = parsed != endpoint.data
+        endpoint.data = parsed
+        return changed
+
+    def merge(self, live_data):
+        """
+        One enriched snapshot: the live running order plus every feed's
+        fields, keyed by car number
+        """
+        cars = {}
+        for car in (live_data or {}).get("cars", []):
+            number = str(car.get("car", ""))
+            cars[number] = {
+                "car": number,
+                "driver": car.get("driver"),
+                "driverId": car.get("driverId"),
+                "position": car.get("position"),
+            }
+
+        flags = None
+        for endpoint in self.endpoints:
+            if endpoint.data is None:
+                continue
+            if endpoint.name == "flag-state":
+                flags = endpoint.data
+                continue
+            for number, fields in endpoint.data.items():
+                cars.setdefault(number, {"car": number}).update(fields)
+
+        return {
+            "series": (live_data or {}).get("series"),
+            "lap": (live_data or {}).get("lap"),
+            "flag": (live_data or {}).get("flag"),
+            "seq": (live_data or {}).get("seq"),
+            "updated": datetime.now().isoformat(),
+            "flagHistory": flags,
+            "sources": {
+                endpoint.name: endpoint.fetched.isoformat() if endpoint.fetched else None
+                for endpoint in self.endpoints
+            },
+            "cars": cars,
+        }
+
+    def stats(self):
+        return {
+            "cycles": self.cycles,
+            "lastCycleMs": round(self.last_cycle * 1000, 1) if self.last_cycle is not None else None,
+            "endpoints": {endpoint.name: endpoint.stats() for endpoint in self.endpoints},
+            "lapStore": {
+                "cars": len(self.lap_store.cars),
+                "bytes": self.lap_store.nbytes(),
+                "lastAppended": self.lap_store.appended,
+            },
+        }
+
+    def reset(self, client=None):
+        """
+        Forget results between races (cadences restart immediately)
+
+        Pass the client the fetches use so its ETags for these feeds are
+        dropped too.
+        """
+        for endpoint in self.endpoints:
+            if client is not None:
+                client.forget_validators(endpoint.url)
+            endpoint.next_due = 0.0
+            endpoint.data = None
+            endpoint.fetched = None
+        self.lap_store.reset()
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def parse_endpoint_list(value):
+    """--enrich value -> tuple of endpoint names ("none" disables)"""
+    if not value or value == "none":
+        return ()
+    if value == "all":
+        return DEFAULT_ENDPOINTS
+    return tuple(name.strip() for name in value.split(",") if name.strip())
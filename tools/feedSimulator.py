@@ -0,0 +1,551 @@
+#!/usr/bin/env python3
+"""
+NASCAR Feed Simulator
+Local stand-in for cf.nascar.com / feed.nascar.com for offline testing
+
+Serves the same shapes the poller, standings updater and endpoint tester
+consume, from either a synthetic race (seeded from data/liveRace.json) or
+a directory of recorded raw cacher responses. Update rate, latency,
+payload size, 403/5xx injection and ETag behavior are all configurable.
+
+Usage:
+    python tools/feedSimulator.py --port 8089 --update-interval 2
+    python tools/livePoller.py --base-url http://127.0.0.1:8089
+
+In tests:
+    sim = FeedSimulator(SimulatorConfig(error_rate_5xx=0.2)).start()
+    client = NascarApiClient(base_url=sim.base_url)
+    ...
+    sim.stop()
+"""
+
+import hashlib
+import json
+import random
+import sys
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+DATA_DIR = Path("data")
+SEED_FILE = DATA_DIR / "liveRace.json"
+
+LAP_TIME = 30.0  # Seconds per lap for the synthetic race
+TRACK_LENGTH = 1.0  # Miles
+CAUTION_EVERY = 75  # Laps between synthetic cautions
+CAUTION_LAPS = 5
+PIT_WINDOW = 60  # Laps between each car's green-flag stops
+
+
+class SimulatorConfig:
+    """Knobs for the simulator (all can be changed while it runs)"""
+
+    def __init__(
+        self,
+        update_interval=5.0,
+        latency=0.0,
+        latency_jitter=0.0,
+        payload_padding=0,
+        error_rate_403=0.0,
+        error_rate_5xx=0.0,
+        etag=True,
+        laps_total=200,
+        start_lap=0,
+        replay_dir=None,
+        seed=None,
+    ):
+        self.update_interval = update_interval  # Wall seconds per simulated lap / replay step
+        self.latency = latency  # Seconds added to every response
+        self.latency_jitter = latency_jitter  # Extra random 0..jitter seconds
+        self.payload_padding = payload_padding  # Bytes of whitespace appended to bodies
+        self.error_rate_403 = error_rate_403  # Fraction of requests answered 403
+        self.error_rate_5xx = error_rate_5xx  # Fraction answered 500/502/503
+        self.etag = etag  # Send ETags and honor If-None-Match with 304
+        self.laps_total = laps_total
+        self.start_lap = start_lap
+        self.replay_dir = replay_dir  # Directory of recorded raw live-feed JSON files
+        self.seed = seed
+
+
+# =========================
+# SYNTHETIC RACE
+# =========================
+
+class SyntheticRace:
+    """A simple race model that produces raw NASCAR-shaped feeds"""
+
+    def __init__(self, config, rng):
+        self.config = config
+        self.rng = rng
+        self.lap = 0
+        self.flag_state = 1
+        self.flag_history = [{"lap_number": 0, "flag_state": 1, "elapsed_time": 0.0}]
+        self.elapsed = 0.0
+        self.cars = self._seed_cars()
+
+    def _seed_cars(self):
+        try:
+            with open(SEED_FILE) as f:
+                seed = json.load(f)["cars"]
+        except (OSError, ValueError, KeyError):
+            seed = [
+                {"car": str(n), "driver": f"Driver{n}"} for n in range(1, 37)
+            ]
+
+        cars = []
+        for idx, car in enumerate(seed):
+            cars.append({
+                "number": str(car.get("car", idx + 1)),
+                "last_name": car.get("driver", "Unknown"),
+                "driver_id": 1000 + idx,
+                "pace": LAP_TIME + idx * 0.02 + self.rng.uniform(-0.05, 0.05),
+                "gap": idx * 0.35,
+                "laps": 0,
+                "pit_offset": self.rng.randint(0, PIT_WINDOW // 2),
+                "pit_stops": [],
+                "lap_times": [],
+                "best_lap": None,
+                "best_speed": None,
+                "last_speed": None,
+                "start_position": idx + 1,
+                "position": idx + 1,
+                "on_track": True,
+            })
+        return cars
+
+    @property
+    def finished(self):
+        return self.lap >= self.config.laps_total
+
+    def advance_to(self, lap):
+        """Simulate laps until `lap` (capped at the race distance)"""
+        while self.lap < min(lap, self.config.laps_total):
+            self._step()
+
+    def _set_flag(self, state):
+        if state != self.flag_state:
+            self.flag_state = state
+            self.flag_history.append(
+                {"lap_number": self.lap, "flag_state": state, "elapsed_time": round(self.elapsed, 3)}
+            )
+
+    def _step(self):
+        self.lap += 1
+        caution = (
+            self.lap > CAUTION_LAPS
+            and self.lap % CAUTION_EVERY < CAUTION_LAPS
+        )
+        self._set_flag(2 if caution else 1)
+
+        leader_time = None
+        for car in sorted(self.cars, key=lambda c: c["gap"]):
+            lap_time = car["pace"] + self.rng.gauss(0, 0.15)
+            if caution:
+                lap_time = LAP_TIME * 1.6
+
+            pitting = (self.lap + car["pit_offset"]) % PIT_WINDOW == 0 and not caution
+            car["on_track"] = not pitting
+            if pitting:
+                lap_time += 20.0 + self.rng.uniform(0, 3)
+                car["pit_stops"].append({
+                    "positions_gained_lossed": 0,
+                    "pit_in_elapsed_time": round(self.elapsed, 3),
+                    "pit_in_lap_count": self.lap,
+                    "pit_in_leader_lap": self.lap,
+                    "pit_out_elapsed_time": round(self.elapsed + lap_time, 3),
+                    "pit_in_rank": car["position"],
+                    "pit_out_rank": car["position"],
+                })
+
+            if leader_time is None:
+                leader_time = lap_time
+
+            car["gap"] = max(car["gap"] + lap_time - leader_time, 0.0)
+            if caution:
+                car["gap"] *= 0.3  # Field bunches up behind the pace car
+            car["laps"] = self.lap
+            car["lap_times"].append(round(lap_time, 3))
+            car["last_speed"] = round(TRACK_LENGTH * 3600 / lap_time, 3)
+            if car["best_speed"] is None or car["last_speed"] > car["best_speed"]:
+                car["best_speed"] = car["last_speed"]
+                car["best_lap"] = self.lap
+
+        self.elapsed += leader_time or LAP_TIME
+
+        order = sorted(self.cars, key=lambda c: c["gap"])
+        lead_gap = order[0]["gap"]
+        for pos, car in enumerate(order, 1):
+            car["gap"] -= lead_gap
+            car["position"] = pos
+
+        if self.finished:
+            self._set_flag(5)
+
+    def live_feed(self):
+        """Raw cacher live-feed.json"""
+        vehicles = []
+        for car in sorted(self.cars, key=lambda c: c["position"]):
+            vehicles.append({
+                "vehicle_number": car["number"],
+                "driver": {"driver_id": car["driver_id"], "last_name": car["last_name"]},
+                "running_position": car["position"],
+                "starting_position": car["start_position"],
+                "delta": round(car["gap"], 3),
+                "laps_completed": car["laps"],
+                "passing_differential": car["start_position"] - car["position"],
+                "status": 1,
+                "is_on_track": car["on_track"],
+                "is_on_dvp": False,
+                "pit_stops": car["pit_stops"],
+                "best_lap": car["best_lap"],
+                "best_lap_speed": car["best_speed"],
+                "last_lap_speed": car["last_speed"],
+                "average_speed": car["last_speed"],
+            })
+
+        stage_len = max(self.config.laps_total // 3, 1)
+        stage_num = min(self.lap // stage_len + 1, 3)
+        return {
+            "lap_number": self.lap,
+            "laps_in_race": self.config.laps_total,
+            "laps_to_go": self.config.laps_total - self.lap,
+            "flag_state": self.flag_state,
+            "track_name": "Simulator Speedway",
+            "series_id": 1,
+            "elapsed_time": round(self.elapsed, 3),
+            "stage": {
+                "stage_num": stage_num,
+                "finish_at_lap": min(stage_num * stage_len, self.config.laps_total),
+                "laps_in_stage": stage_len,
+            },
+            "vehicles": vehicles,
+        }
+
+    def flag_state_feed(self):
+        return list(self.flag_history)
+
+    def lap_times_feed(self):
+        return {
+            "laps": [
+                {
+                    "Number": car["number"],
+                    "FullName": car["last_name"],
+                    "RunningPos": car["position"],
+                    "Laps": [
+                        {"Lap": n, "LapTime": t, "LapSpeed": round(TRACK_LENGTH * 3600 / t, 3)}
+                        for n, t in enumerate(car["lap_times"], 1)
+                    ],
+                }
+                for car in self.cars
+            ]
+        }
+
+    def pit_stops_feed(self):
+        stops = []
+        for car in self.cars:
+            for stop in car["pit_stops"]:
+                stops.append(dict(stop, vehicle_number=car["number"]))
+        return stops
+
+    def loop_data_feed(self):
+        return [
+            {
+                "vehicle_number": car["number"],
+                "laps": car["laps"],
+                "avg_running_position": car["position"],
+                "fastest_lap": car["best_lap"],
+                "last_lap_speed": car["last_speed"],
+            }
+            for car in self.cars
+        ]
+
+    def points_feed(self):
+        order = sorted(self.cars, key=lambda c: c["start_position"])
+        return [
+            {
+                "position": pos,
+                "car_no": car["number"],
+                "driver_id": car["driver_id"],
+                "driver_last_name": car["last_name"],
+                "points": max(400 - pos * 9, 0),
+            }
+            for pos, car in enumerate(order, 1)
+        ]
+
+
+class ReplayRace:
+    """Steps through recorded raw live-feed responses in file-name order"""
+
+    def __init__(self, config):
+        self.config = config
+        self.frames = sorted(Path(config.replay_dir).glob("*.json"))
+        if not self.frames:
+            raise FileNotFoundError(f"No .json files in {config.replay_dir}")
+        self.step = 0
+        self._cache = {}
+
+    @property
+    def lap(self):
+        return self.step
+
+    @property
+    def finished(self):
+        return self.step >= len(self.frames) - 1
+
+    def advance_to(self, step):
+        self.step = min(step, len(self.frames) - 1)
+
+    def live_feed(self):
+        path = self.frames[self.step]
+        if path not in self._cache:
+            with open(path) as f:
+                self._cache = {path: json.load(f)}
+        return self._cache[path]
+
+    def flag_state_feed(self):
+        feed = self.live_feed()
+        return [{"lap_number": feed.get("lap_number", 0), "flag_state": feed.get("flag_state", 0)}]
+
+    def lap_times_feed(self):
+        return {"laps": []}
+
+    def pit_stops_feed(self):
+        return [
+            dict(stop, vehicle_number=v.get("vehicle_number"))
+            for v in self.live_feed().get("vehicles", [])
+            for stop in v.get("pit_stops", [])
+        ]
+
+    def loop_data_feed(self):
+        return []
+
+    def points_feed(self):
+        return [
+            {
+                "position": idx,
+                "car_no": v.get("vehicle_number"),
+                "driver_id": v.get("driver", {}).get("driver_id"),
+                "driver_last_name": v.get("driver", {}).get("last_name", "Unknown"),
+                "points": 0,
+            }
+            for idx, v in enumerate(self.live_feed().get("vehicles", []), 1)
+        ]
+
+
+# =========================
+# HTTP SERVER
+# =========================
+
+class FeedSimulator:
+    """Threaded HTTP server serving simulated NASCAR feeds"""
+
+    def __init__(self, config=None, host="127.0.0.1", port=0):
+        self.config = config or SimulatorConfig()
+        self.rng = random.Random(self.config.seed)
+        if self.config.replay_dir:
+            self.race = ReplayRace(self.config)
+        else:
+            self.race = SyntheticRace(self.config, self.rng)
+        self.started = None
+        self.stats = {"requests": 0, "bytes": 0, "notModified": 0, "errors": 0, "paths": {}}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.started = time.monotonic()
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def configure(self, **changes):
+        """Change config values on the fly (e.g. error rates mid-test)"""
+        for key, value in changes.items():
+            if not hasattr(self.config, key):
+                raise AttributeError(f"Unknown simulator setting: {key}")
+            setattr(self.config, key, value)
+
+    def _advance(self):
+        elapsed = time.monotonic() - (self.started or time.monotonic())
+        interval = max(self.config.update_interval, 1e-6)
+        self.race.advance_to(self.config.start_lap + int(elapsed / interval))
+
+    def route(self, path):
+        """
+        Build the JSON document for a request path
+
+        Returns:
+            object or None (404)
+        """
+        base = self.base_url
+        parts = path.strip("/").split("/")
+
+        with self._lock:
+            self._advance()
+
+            if path == "/live-ops/live-ops.json":
+                year = datetime.now().year
+                ops = {}
+                for series in (1, 2, 3):
+                    ops[f"live_feed_url_series{series}"] = (
+                        f"{base}/cacher/live/series_{series}/live-feed.json"
+                    )
+                    ops[f"driver_points_feed_url_series{series}"] = (
+                        f"{base}/cacher/{year}/{series}/points-feed.json"
+                    )
+                return ops
+            if path in ("/cacher/live/live-feed.json", "/live-feed.json") or (
+                len(parts) == 4 and parts[:2] == ["cacher", "live"] and parts[3] == "live-feed.json"
+            ):
+                return self.race.live_feed()
+            if len(parts) == 4 and parts[0] == "cacher" and parts[3] == "points-feed.json":
+                return self.race.points_feed()
+            if path == "/points.json":
+                return self.race.points_feed()
+            if path == "/flag-state.json":
+                return self.race.flag_state_feed()
+            if path == "/lap-times.json":
+                return self.race.lap_times_feed()
+            if path == "/pit-stops.json":
+                return self.race.pit_stops_feed()
+            if path == "/loop-data.json":
+                return self.race.loop_data_feed()
+        return None
+
+    def _count(self, path, sent, status):
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["bytes"] += sent
+            self.stats["paths"][path] = self.stats["paths"].get(path, 0) + 1
+            if status == 304:
+                self.stats["notModified"] += 1
+            elif status >= 400:
+                self.stats["errors"] += 1
+
+    def _make_handler(self):
+        sim = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass  # Keep test output quiet
+
+            def _send(self, status, body=b"", headers=None):
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if body and self.command != "HEAD":
+                    self.wfile.write(body)
+                sim._count(self.path.split("?")[0], len(body), status)
+
+            def do_HEAD(self):
+                self.do_GET()
+
+            def do_GET(self):
+                config = sim.config
+                delay = config.latency + sim.rng.uniform(0, config.latency_jitter)
+                if delay > 0:
+                    time.sleep(delay)
+
+                roll = sim.rng.random()
+                if roll < config.error_rate_403:
+                    return self._send(403, b"Forbidden")
+                if roll < config.error_rate_403 + config.error_rate_5xx:
+                    return self._send(sim.rng.choice((500, 502, 503)), b"Server error")
+
+                data = sim.route(self.path.split("?")[0])
+                if data is None:
+                    return self._send(404, b"Not found")
+
+                body = json.dumps(data, separators=(",", ":")).encode("utf-8")
+                body += b" " * config.payload_padding
+
+                headers = {"Content-Type": "application/json", "Cache-Control": "max-age=1"}
+                if config.etag:
+                    etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+                    headers["ETag"] = etag
+                    if self.headers.get("If-None-Match") == etag:
+                        return self._send(304, b"", {"ETag": etag})
+
+                self._send(200, body, headers)
+
+        return Handler
+
+
+def main():
+    """Run the simulator until Ctrl+C"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve simulated NASCAR feeds locally")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--update-interval", type=float, default=5.0,
+                        help="Wall seconds per simulated lap / replay frame (default: 5)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Added latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra latency in seconds")
+    parser.add_argument("--padding", type=int, default=0, help="Bytes appended to each payload")
+    parser.add_argument("--error-403", type=float, default=0.0, help="Fraction of 403 responses")
+    parser.add_argument("--error-5xx", type=float, default=0.0, help="Fraction of 5xx responses")
+    parser.add_argument("--no-etag", action="store_true", help="Disable ETag / 304 handling")
+    parser.add_argument("--laps", type=int, default=200, help="Synthetic race distance")
+    parser.add_argument("--start-lap", type=int, default=0)
+    parser.add_argument("--replay", type=str, help="Directory of recorded raw live-feed JSON files")
+    parser.add_argument("--seed", type=int, help="Random seed for repeatable runs")
+    args = parser.parse_args()
+
+    config = SimulatorConfig(
+        update_interval=args.update_interval,
+        latency=args.latency,
+        latency_jitter=args.jitter,
+        payload_padding=args.padding,
+        error_rate_403=args.error_403,
+        error_rate_5xx=args.error_5xx,
+        etag=not args.no_etag,
+        laps_total=args.laps,
+        start_lap=args.start_lap,
+        replay_dir=args.replay,
+        seed=args.seed,
+    )
+
+    sim = FeedSimulator(config, host=args.host, port=args.port).start()
+
+    print("=" * 60)
+    print("NASCAR FEED SIMULATOR")
+    print("=" * 60)
+    print(f"\n📡 Serving on {sim.base_url}")
+    print(f"   Poller:    python tools/livePoller.py --base-url {sim.base_url}")
+    print(f"   Endpoints: python tools/testNascarEndpoints.py --base-url {sim.base_url}")
+    print("\nPress Ctrl+C to stop\n")
+
+    try:
+        while True:
+            time.sleep(10)
+            stats = sim.stats
+            print(
+                f"Lap {sim.race.lap} - {stats['requests']} requests, "
+                f"{stats['notModified']} not modified, {stats['errors']} errors"
+            )
+    except KeyboardInterrupt:
+        print("\n⏹️  Stopped")
+        sim.stop()
+
+
+if __name__ == "__main__":
+    main()
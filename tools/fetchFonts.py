@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Download the display fonts into static/fonts/
+Run once on a machine with internet access, then ship static/ to the track
+
+The web display never contacts Google Fonts itself: static/css/pylon.css
+points at these files (after any locally installed copy), and webDisplay.py
+serves them under content-hashed URLs.
+"""
+
+import re
+import sys
+from pathlib import Path
+
+import requests
+
+FONTS_DIR = Path(__file__).parent.parent / "static" / "fonts"
+CSS_API = "https://fonts.googleapis.com/css2"
+
+# family -> (file prefix, weights) - must match the @font-face rules in pylon.css
+FONTS = {
+    "Roboto Condensed": ("RobotoCondensed", (400, 700, 900)),
+    "Roboto Mono": ("RobotoMono", (500, 700)),
+}
+
+# The CSS API picks the font format from the user agent; this one gets woff2
+WOFF2_USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+)
+
+_FACE = re.compile(r"/\*\s*([\w-]+)\s*\*/\s*@font-face\s*{([^}]*)}")
+
+
+def latin_faces(css):
+    """weight -> woff2 URL for the latin subset of a css2 response"""
+    faces = {}
+    for subset, body in _FACE.findall(css):
+        if subset != "latin":
+            continue
+        weight = re.search(r"font-weight:\s*(\d+)", body)
+        url = re.search(r"url\((https://[^)]+\.woff2)\)", body)
+        if weight and url:
+            faces[int(weight.group(1))] = url.group(1)
+    return faces
+
+
+def fetch_family(session, family, prefix, weights):
+    """Download one family's weights, returns the number of files written"""
+    params = {"family": f"{family}:wght@{';'.join(str(w) for w in weights)}", "display": "swap"}
+    response = session.get(CSS_API, params=params, timeout=15)
+    response.raise_for_status()
+
+    faces = latin_faces(response.text)
+    written = 0
+    for weight in weights:
+        url = faces.get(weight)
+        if not url:
+            print(f"⚠️  {family} {weight}: not in the font CSS")
+            continue
+
+        font = session.get(url, timeout=30)
+        font.raise_for_status()
+        path = FONTS_DIR / f"{prefix}-{weight}.woff2"
+        path.write_bytes(font.content)
+        print(f"✅ {path.name} ({len(font.content) // 1024} KB)")
+        written += 1
+    return written
+
+
+def main():
+    """Entry point"""
+    print("=" * 60)
+    print("FETCH DISPLAY FONTS")
+    print("=" * 60)
+
+    FONTS_DIR.mkdir(parents=True, exist_ok=True)
+    session = requests.Session()
+    session.headers["User-Agent"] = WOFF2_USER_AGENT
+
+    expected = sum(len(weights) for _, weights in FONTS.values())
+    written = 0
+    for family, (prefix, weights) in FONTS.items():
+        try:
+            written += fetch_family(session, family, prefix, weights)
+        except requests.RequestException as e:
+            print(f"❌ {family}: {e}")
+
+    print(f"\n{written}/{expected} font files in {FONTS_DIR}")
+    print("Restart webDisplay.py to pick them up.")
+    return written == expected
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
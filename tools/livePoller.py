@@ -4,49 +4,161 @@ NASCAR Live Data Poller
 Automatically polls NASCAR API during races and saves to data/liveRace.json
 
 This runs as a background service:
-- Checks every 30 seconds if a race should be active (based on schedule)
+- Sleeps until the next race window opens (based on schedule)
 - When race is active, polls every 5 seconds
 - Automatically starts/stops polling based on race status
 - Logs all activity for debugging
+
+Signals (see ./poller.sh reload|force|auto):
+- SIGHUP:  schedule files changed - re-check now
+- SIGUSR1: manual override - start polling regardless of schedule
+- SIGUSR2: clear manual override - back to schedule-driven polling
 """
 
+import atexit
+import hashlib
 import json
 import logging
+import queue
+import select
+import signal
+import socket
 import sys
 import time
 import traceback
 from datetime import datetime, timedelta
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.loader import load_all_schedules
+from src.fileUtils import atomic_write_json
+from src.heartbeat import publish_heartbeat
+from src.scheduleCache import invalidate as invalidate_schedules
+from src.scheduleCache import load_compiled_schedules, window_at
+from src.points import PointsProjector
+from src.pubsub import SnapshotPublisher
+from src.raceArchive import RaceRecorder, race_key
+from src.raceEvents import EventLog, RaceEventDetector
 from src.state import is_race_scheduled_now
-from tools.nascarAPIclient import NascarApiClient, Series
+from tools.enrichment import DEFAULT_ENDPOINTS, EnrichmentFetcher, parse_endpoint_list
+from tools.nascarAPIclient import NOT_MODIFIED, NascarApiClient, Series
 
 # Configuration
 DATA_DIR = Path("data")
 LOG_DIR = Path("logs")
-LOG_DIR.mkdir(exist_ok=True)
 
 POLL_INTERVAL_RACE = 5
-POLL_INTERVAL_IDLE = 30
+POLL_INTERVAL_IDLE = 3600  # Longest idle sleep
 MAX_CONSECUTIVE_ERRORS = 10
 RESTART_DELAY = 60  # Seconds to wait after max errors before trying again
+# An unchanged payload is re-published at least this often so consumers'
+# freshness checks (state.FRESH_EXIT_MINUTES) never see it go stale
+REPUBLISH_UNCHANGED_AFTER = 120
 
 # Logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[logging.FileHandler(LOG_DIR / "poller.log"), logging.StreamHandler()],
-)
+LOG_FILE = LOG_DIR / "poller.log"
+LOG_MAX_BYTES = 5 * 1024 * 1024  # Rotate poller.log at 5 MB...
+LOG_BACKUP_COUNT = 3  # ...keeping poller.log.1 - poller.log.3
+LOG_QUEUE_SIZE = 10000  # Records buffered for the log thread before dropping
+SUCCESS_LOG_INTERVAL = 60  # Seconds between successful-poll summary lines
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops (and counts) records rather than block when full"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def setup_logging():
+    """
+    Route all logging through a queue to a background thread
+
+    The poll thread only ever does a non-blocking queue put; the file
+    (with size-based rotation) and stdout are written by the listener
+    thread, so a slow SD card or a blocked stdout pipe can't delay polls.
+    """
+    LOG_DIR.mkdir(exist_ok=True)
+    formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+
+    file_handler = RotatingFileHandler(
+        LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT
+    )
+    stream_handler = logging.StreamHandler()
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(LOG_QUEUE_SIZE)
+    queue_handler = DroppingQueueHandler(log_queue)
+    listener = QueueListener(log_queue, file_handler, stream_handler)
+
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.handlers = [queue_handler]
+
+    listener.start()
+    atexit.register(listener.stop)
+    return queue_handler
+
+
+log_handler = None  # Installed by main(); importing the module leaves logging alone
 logger = logging.getLogger(__name__)
 
 
+class InterruptibleTimer:
+    """
+    Sleep that can be cut short from a signal handler or another thread
+
+    Uses a socket pair rather than threading.Event: writing a byte is
+    safe to do from a signal handler, taking the Event's lock is not.
+    """
+
+    def __init__(self):
+        self._reader, self._writer = socket.socketpair()
+        self._reader.setblocking(False)
+        self._writer.setblocking(False)
+
+    def sleep(self, seconds):
+        """
+        Sleep up to `seconds`
+
+        Returns:
+            bool: True if woken early by wake()
+        """
+        ready, _, _ = select.select([self._reader], [], [], max(0, seconds))
+        if not ready:
+            return False
+        try:
+            while self._reader.recv(64):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def wake(self):
+        """Interrupt the current (or next) sleep"""
+        try:
+            self._writer.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass  # Buffer full means a wakeup is already pending
+
+
 class RobustPoller:
     """Bulletproof NASCAR data poller"""
 
-    def __init__(self):
+    def __init__(self, base_url=None, enrich=DEFAULT_ENDPOINTS):
+        self.base_url = base_url  # None = NASCAR (or $NASCAR_BASE_URL)
+        self.enrich = enrich  # Secondary feeds fetched alongside the live feed
+        self.enricher = None
+        self.live_data = None  # Last published snapshot (for the enriched merge)
         self.client = None
         self.is_polling = False
         self.current_series = Series.CUP
@@ -55,12 +167,30 @@ class RobustPoller:
         self.race_info = None
         self.total_polls = 0
         self.successful_polls = 0
+        self.recorder = RaceRecorder()
+        self.projector = PointsProjector()
+        self.timer = InterruptibleTimer()
+        self.manual_override = False
+        self.next_window_change = None
+        self.success_summary = None  # Polls not yet reported in the log
+        self.snapshot_seq = 0  # Incremented for every published snapshot
+        self.publisher = None
+        self.payload_fingerprint = None  # Hash of the last published raw body
+        self.payload_body = None
+        self.last_publish = 0.0  # Monotonic time of the last publish
+        self.duplicate_polls = 0  # Successful polls skipped as unchanged
+        self.enriched_seq = None  # Live seq the last enriched merge was built on
+        self.event_detector = RaceEventDetector()
+        self.event_log = EventLog()
 
     def initialize_client(self):
         """Initialize or reinitialize the API client"""
         try:
-            self.client = NascarApiClient()
-            logger.info("API client initialized")
+            self.client = NascarApiClient(base_url=self.base_url)
+            logger.info(f"API client initialized ({self.client.base_url})")
+            if self.enrich and self.enricher is None:
+                self.enricher = EnrichmentFetcher(self.enrich, base_url=self.client.base_url)
+                logger.info(f"Enrichment feeds: {', '.join(self.enrich)}")
             return True
         except Exception as e:
             logger.error(f"Failed to initialize API client: {e}")
@@ -69,8 +199,9 @@ class RobustPoller:
     def check_race_status(self):
         """Check if race should be active"""
         try:
-            schedules = load_all_schedules()
-            race_info = is_race_scheduled_now(schedules)
+            compiled = load_compiled_schedules()
+            race_info = is_race_scheduled_now(compiled["schedules"])
+            _, self.next_window_change = window_at(compiled["index"], time.time())
 
             if race_info:
                 series_name = race_info.get("series", "CUP")
@@ -85,15 +216,70 @@ class RobustPoller:
                 return True
 
             self.race_info = None
-            return False
+            return self.manual_override
 
         except Exception as e:
             logger.error(f"Error checking race status: {e}")
             logger.debug(traceback.format_exc())
-            return False
+            self.next_window_change = None
+            return self.manual_override
+
+    def idle_sleep(self):
+        """
+        Sleep until the next race window opens (or a wakeup arrives)
+
+        The schedule CSVs aren't watched - an idle poller wakes a handful
+        of times a day, not every few seconds. An edit is picked up at the
+        next wake (at most POLL_INTERVAL_IDLE away) or at once on SIGHUP
+        (./poller.sh reload).
+        """
+        timeout = POLL_INTERVAL_IDLE
+        if self.next_window_change is not None:
+            timeout = min(timeout, self.next_window_change - time.time())
+
+        if self.next_window_change is not None:
+            opens = datetime.fromtimestamp(self.next_window_change)
+            logger.debug(
+                f"⏸️  Idle - next race window {opens:%Y-%m-%d %H:%M}, "
+                f"sleeping {max(timeout, 0):.0f}s"
+            )
+
+        self.timer.sleep(timeout)
+
+    def install_signal_handlers(self):
+        """Hook up reload/override signals where the platform has them"""
+
+        def on_reload(signum, frame):
+            invalidate_schedules()
+            self.timer.wake()
+
+        def on_override(signum, frame):
+            self.manual_override = signum == signal.SIGUSR1
+            self.timer.wake()
+
+        for name, handler in (
+            ("SIGHUP", on_reload),
+            ("SIGUSR1", on_override),
+            ("SIGUSR2", on_override),
+        ):
+            if hasattr(signal, name):
+                signal.signal(getattr(signal, name), handler)
 
     def poll_live_data(self):
-        """Poll NASCAR API and save data"""
+        """
+        Poll NASCAR API and save data
+
+        Due enrichment feeds are fetched concurrently with the live feed
+        and merged once it has been handled.
+        """
+        pending = self.start_enrichment()
+        try:
+            return self.poll_live_feed()
+        finally:
+            self.finish_enrichment(pending)
+
+    def poll_live_feed(self):
+        """Fetch, dedupe, parse and publish the cacher live feed"""
         self.total_polls += 1
 
         try:
@@ -102,10 +288,37 @@ class RobustPoller:
                 if not self.initialize_client():
                     return False
 
-            # Fetch data
-            data = self.client.get_live_feed(self.current_series, use_cacher=True)
+            # Fetch the raw body; only parse and publish it if it changed
+            # A 304 is only useful if we still hold the body it refers to
+            body = self.client.get_live_feed_raw(
+                self.current_series, use_cacher=True, conditional=self.payload_body is not None
+            )
+            if body is NOT_MODIFIED:
+                body = self.payload_body
+            if not body:
+                logger.warning(f"⚠️  Poll #{self.total_polls}: No data returned")
+                self.consecutive_errors += 1
+                return False
+
+            fingerprint = hashlib.blake2b(body, digest_size=16).digest()
+            if (
+                fingerprint == self.payload_fingerprint
+                and time.monotonic() - self.last_publish < REPUBLISH_UNCHANGED_AFTER
+            ):
+                # Byte-identical payload: nothing for consumers to do, the
+                # heartbeat written after this poll is all that changes
+                self.duplicate_polls += 1
+                self.consecutive_errors = 0
+                self.last_successful_poll = datetime.now()
+                self.successful_polls += 1
+                return True
+
+            data = self.client.parse_live_feed(body, self.current_series)
 
             if data and len(data.get("cars", [])) > 0:
+                self.snapshot_seq += 1
+                data["seq"] = self.snapshot_seq
+
                 # Save to file
                 filepath = DATA_DIR / "liveRace.json"
                 DATA_DIR.mkdir(exist_ok=True)
@@ -113,15 +326,18 @@ class RobustPoller:
                 with open(filepath, "w") as f:
                     json.dump(data, f, indent=2)
 
-                # Log success
-                lap = data.get("lap", 0)
-                total = data.get("lapsTotal", 0)
-                flag = data.get("flag", "UNKNOWN")
-                cars = len(data.get("cars", []))
+                # Events first, so displays woken by the snapshot see them
+                self.detect_events(data)
+                self.publish("live", data)
+                self.record_snapshot(data)
+                self.publish_projection(data)
 
-                logger.info(
-                    f"✅ Poll #{self.total_polls}: Lap {lap}/{total} - {flag} - {cars} cars"
-                )
+                self.payload_fingerprint = fingerprint
+                self.payload_body = body
+                self.last_publish = time.monotonic()
+                self.live_data = data
+
+                self.log_poll_success(data)
 
                 self.consecutive_errors = 0
                 self.last_successful_poll = datetime.now()
@@ -142,10 +358,176 @@ class RobustPoller:
 
             return False
 
+    def detect_events(self, data):
+        """Derive race events from the new snapshot and publish the log"""
+        try:
+            new_race = self.event_log.race is None
+            if new_race:
+                # Same key the race archive uses, pinned at the first snapshot
+                self.event_log.reset(race_key(data))
+            events = self.event_detector.update(data)
+            if not events and not new_race:
+                return
+            self.event_log.extend(events)
+            self.publish_events()
+            for record in events:
+                if record["type"] in ("LEAD_CHANGE", "FLAG_CHANGE", "STAGE_END"):
+                    logger.info(f"📣 Lap {record['lap']}: {record['type']} {record.get('car') or record.get('flag') or record.get('stage', '')}")
+        except Exception as e:
+            logger.error(f"Failed to detect race events: {e}")
+            logger.debug(traceback.format_exc())
+
+    def publish_events(self):
+        """Write and push the event log (also when it was just emptied)"""
+        self.event_log.save()
+        self.publish("events", self.event_log.to_data())
+
+    def start_enrichment(self):
+        """Submit the enrichment fetches that are due this cycle"""
+        if not self.enricher or not self.client:
+            return []
+        try:
+            return self.enricher.submit(self.client)
+        except Exception as e:
+            logger.error(f"Failed to start enrichment fetches: {e}")
+            return []
+
+    def finish_enrichment(self, pending):
+        """Collect this cycle's enrichment fetches and publish the merge"""
+        if not self.enricher:
+            return
+        try:
+            changed = self.enricher.collect(pending)
+            live_seq = (self.live_data or {}).get("seq")
+            if not changed and live_seq == self.enriched_seq:
+                return
+            enriched = self.enricher.merge(self.live_data)
+            atomic_write_json(DATA_DIR / "liveEnriched.json", enriched)
+            self.publish("enriched", enriched)
+            self.enriched_seq = live_seq
+        except Exception as e:
+            logger.error(f"Failed to merge enrichment feeds: {e}")
+            logger.debug(traceback.format_exc())
+
+    def start_publisher(self):
+        """Host the pub/sub socket that pushes snapshots to displays"""
+        try:
+            self.publisher = SnapshotPublisher()
+            self.publisher.start()
+            logger.info(f"📡 Publishing snapshots on {self.publisher.path}")
+        except (AttributeError, OSError) as e:
+            # No AF_UNIX (Windows) or unwritable data dir - displays fall back to files
+            logger.warning(f"⚠️  Snapshot publisher unavailable: {e}")
+            self.publisher = None
+
+    def publish(self, topic, data):
+        """Push to subscribers (never blocks on slow consumers)"""
+        if self.publisher:
+            try:
+                self.publisher.publish(topic, data, self.snapshot_seq)
+            except Exception as e:
+                logger.error(f"Failed to publish {topic}: {e}")
+
+    def write_heartbeat(self):
+        """Publish the small status record served by /api/status"""
+        last = self.last_successful_poll
+        try:
+            publish_heartbeat(
+                {
+                    "state": "polling" if self.is_polling else "idle",
+                    "series": self.current_series.name,
+                    "lastSuccess": last.isoformat() if last else None,
+                    "lastSuccessEpoch": last.timestamp() if last else None,
+                    "consecutiveErrors": self.consecutive_errors,
+                    "totalPolls": self.total_polls,
+                    "successfulPolls": self.successful_polls,
+                    "snapshotSeq": self.snapshot_seq,
+                    "duplicatePolls": self.duplicate_polls,
+                    "dedupeRate": round(self.duplicate_polls / self.successful_polls, 3)
+                    if self.successful_polls
+                    else 0.0,
+                    "manualOverride": self.manual_override,
+                    "nextWindowChange": self.next_window_change,
+                    "subscribers": self.publisher.subscriber_count if self.publisher else 0,
+                    "enrichment": self.enricher.stats() if self.enricher else None,
+                }
+            )
+        except Exception as e:
+            logger.error(f"Failed to write heartbeat: {e}")
+
+    def log_poll_success(self, data):
+        """
+        Summarize successful polls instead of logging each one
+
+        A line is written for the first poll, whenever the flag changes,
+        and otherwise at most every SUCCESS_LOG_INTERVAL seconds.
+        """
+        lap = data.get("lap", 0)
+        total = data.get("lapsTotal", 0)
+        flag = data.get("flag", "UNKNOWN")
+        cars = len(data.get("cars", []))
+        now = time.monotonic()
+
+        summary = self.success_summary
+        if summary is None:
+            summary = self.success_summary = {
+                "first": self.total_polls,
+                "count": 0,
+                "since": now,
+                "flag": None,
+            }
+        summary["count"] += 1
+
+        if flag != summary["flag"] or now - summary["since"] >= SUCCESS_LOG_INTERVAL:
+            if summary["count"] == 1:
+                polls = f"Poll #{self.total_polls}"
+            else:
+                polls = f"Polls #{summary['first']}-{self.total_polls} ({summary['count']} ok)"
+            logger.info(f"✅ {polls}: Lap {lap}/{total} - {flag} - {cars} cars")
+
+            if log_handler is not None and log_handler.dropped:
+                logger.warning(f"⚠️  {log_handler.dropped} log records dropped (log queue full)")
+                log_handler.dropped = 0
+
+            summary.update(first=self.total_polls + 1, count=0, since=now, flag=flag)
+
+    def record_snapshot(self, data):
+        """Add a snapshot to the race history, archiving it at the checkered flag"""
+        try:
+            self.recorder.record(data)
+            if data.get("flag") == "CHECKERED":
+                path = self.recorder.archive()
+                if path:
+                    logger.info(f"🗄️  Race archived to {path}")
+        except Exception as e:
+            logger.error(f"Failed to record race history: {e}")
+            logger.debug(traceback.format_exc())
+
+    def publish_projection(self, data):
+        """Write projected championship points next to the live snapshot"""
+        try:
+            projection = None
+            if self.projector.refresh():
+                projection = self.projector.project(data)
+
+            filepath = DATA_DIR / "liveProjection.json"
+            if projection:
+                atomic_write_json(filepath, projection)
+                self.publish("projection", projection)
+            elif filepath.exists():
+                # Don't leave another series' projection lying around
+                filepath.unlink()
+                self.publish("projection", None)
+        except Exception as e:
+            logger.error(f"Failed to project points: {e}")
+            logger.debug(traceback.format_exc())
+
     def start_polling(self):
         """Enter active polling mode"""
         if not self.is_polling:
             logger.info(f"🏁 Starting live polling for {self.current_series.name}")
+            if self.manual_override and not self.race_info:
+                logger.info("   Manual override (no race window scheduled)")
             if self.race_info:
                 race_name = self.race_info["race"].get("raceName", "Unknown")
                 logger.info(f"   Race: {race_name}")
@@ -156,10 +538,34 @@ class RobustPoller:
         """Exit active polling mode"""
         if self.is_polling:
             logger.info(f"⏹️  Stopping live polling")
-            logger.info(f"   Session stats: {self.successful_polls} successful polls")
+            logger.info(
+                f"   Session stats: {self.successful_polls} successful polls, "
+                f"{self.duplicate_polls} unchanged payloads skipped"
+            )
             self.is_polling = False
             self.consecutive_errors = 0
             self.successful_polls = 0
+            self.duplicate_polls = 0
+            self.payload_fingerprint = None
+            self.payload_body = None
+            if self.client:
+                self.client.forget_validators()
+            self.live_data = None
+            self.enriched_seq = None
+            if self.enricher:
+                self.enricher.reset(self.client)
+            self.event_detector.reset()
+            self.event_log.reset()
+            try:
+                self.publish_events()  # Don't leave the last race's events on disk
+            except Exception as e:
+                logger.error(f"Failed to clear race events: {e}")
+            self.recorder.reset()
+            self.success_summary = None
+
+            if self.next_window_change is not None:
+                opens = datetime.fromtimestamp(self.next_window_change)
+                logger.info(f"   Next race window: {opens:%Y-%m-%d %H:%M}")
 
     def run(self):
         """Main polling loop with error recovery"""
@@ -171,6 +577,8 @@ class RobustPoller:
 
         # Initialize client
         self.initialize_client()
+        self.install_signal_handlers()
+        self.start_publisher()
 
         try:
             while True:
@@ -186,6 +594,7 @@ class RobustPoller:
                     # Poll if active
                     if self.is_polling:
                         success = self.poll_live_data()
+                        self.write_heartbeat()
 
                         # Check for too many errors
                         if self.consecutive_errors >= MAX_CONSECUTIVE_ERRORS:
@@ -203,11 +612,11 @@ class RobustPoller:
                             self.initialize_client()
                             continue
 
-                        time.sleep(POLL_INTERVAL_RACE)
+                        self.timer.sleep(POLL_INTERVAL_RACE)
                     else:
-                        # Not polling - check schedule periodically
-                        logger.debug("⏸️  Idle - checking schedule...")
-                        time.sleep(POLL_INTERVAL_IDLE)
+                        # Not polling - sleep until the next race window
+                        self.write_heartbeat()
+                        self.idle_sleep()
 
                 except Exception as e:
                     logger.error(f"Error in main loop: {e}")
@@ -222,11 +631,33 @@ class RobustPoller:
             logger.info(f"Successful: {self.successful_polls}")
             logger.info("=" * 60)
             self.stop_polling()
+            if self.enricher:
+                self.enricher.shutdown()
+            if self.publisher:
+                self.publisher.stop()
 
 
 def main():
     """Entry point"""
-    poller = RobustPoller()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="NASCAR live data poller")
+    parser.add_argument(
+        "--base-url", type=str, help="Feed host override (e.g. a local feedSimulator)"
+    )
+    parser.add_argument(
+        "--enrich",
+        type=str,
+        default="all",
+        help="Secondary feeds to fetch each cycle: all, none, or a list "
+        f"(e.g. pit-stops,flag-state; known: {', '.join(DEFAULT_ENDPOINTS)})",
+    )
+    args = parser.parse_args()
+
+    global log_handler
+    log_handler = setup_logging()
+
+    poller = RobustPoller(base_url=args.base_url, enrich=parse_endpoint_list(args.enrich))
     poller.run()
 
 
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Web Display Load Test
+Simulates N browser displays polling webDisplay.py during a race replay
+
+Each simulated display keeps its own HTTP connection and polls /api/data
+every 2 seconds (like templates/pylon.html) plus /api/status now and then.
+Meanwhile a replay thread rewrites liveRace.json from recorded snapshots
+so the server is serving LIVE data that actually changes.
+
+Reports throughput, p50/p95/p99 latency per endpoint, error rate and the
+server's CPU usage - a repeatable capacity number for each release.
+
+Usage:
+    # Spawn a private server (isolated data dir) and hit it with 50 displays
+    python tools/loadTestWeb.py --spawn --clients 50 --duration 60
+
+    # Test an already running server (the replay rewrites <data-dir>/liveRace.json)
+    python tools/loadTestWeb.py --url http://pylon.local:5000 --server-pid 1234 --data-dir data
+"""
+
+import json
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.fileUtils import atomic_write_json
+from tools.benchStats import format_ms, process_tree_cpu_seconds, summarize
+
+REPO_DIR = Path(__file__).parent.parent
+REFRESH_BUDGET = 2.0  # Seconds - the display refresh interval
+
+
+class ReplayWriter(threading.Thread):
+    """Rewrites liveRace.json from a replay so the server sees a live race"""
+
+    def __init__(self, data_dir, replay_dir=None, interval=5.0):
+        super().__init__(daemon=True)
+        self.target = Path(data_dir) / "liveRace.json"
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.frames = sorted(Path(replay_dir).glob("*.json")) if replay_dir else []
+        self.base = None
+        if not self.frames:
+            # No recording given: animate the current snapshot
+            with open(REPO_DIR / "data" / "liveRace.json") as f:
+                self.base = json.load(f)
+        self.written = 0
+
+    def next_snapshot(self, step):
+        if self.frames:
+            with open(self.frames[step % len(self.frames)]) as f:
+                snapshot = json.load(f)
+        else:
+            snapshot = self.base
+            cars = snapshot["cars"]
+            # Swap a couple of positions and wiggle the intervals
+            i = random.randrange(1, len(cars) - 1)
+            cars[i], cars[i + 1] = cars[i + 1], cars[i]
+            for pos, car in enumerate(cars, 1):
+                car["position"] = pos
+                if car.get("interval") is not None:
+                    car["interval"] = round(max(car["interval"] + random.uniform(-0.2, 0.2), 0.001), 3)
+            snapshot["flag"] = "GREEN"
+            snapshot["lap"] = min(snapshot.get("lap", 0), snapshot.get("lapsTotal", 0))
+
+        snapshot["lastUpdate"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        snapshot["seq"] = step + 1
+        return snapshot
+
+    def run(self):
+        step = 0
+        while not self.stopped.is_set():
+            atomic_write_json(self.target, self.next_snapshot(step))
+            self.written += 1
+            step += 1
+            self.stopped.wait(self.interval)
+
+
+class DisplayClient(threading.Thread):
+    """One simulated browser display"""
+
+    def __init__(self, base_url, interval, status_every, deadline, paths, long_poll=False):
+        super().__init__(daemon=True)
+        self.base_url = base_url.rstrip("/")
+        self.interval = interval
+        self.status_every = status_every
+        self.deadline = deadline
+        self.paths = paths
+        self.long_poll = long_poll
+        self.samples = []  # (path, seconds, status, bytes)
+
+    def fetch(self, session, path, params=None):
+        start = time.perf_counter()
+        try:
+            response = session.get(self.base_url + path, params=params, timeout=30)
+            body = response.content
+            status = response.status_code
+        except requests.RequestException:
+            response, body, status = None, b"", 0
+        self.samples.append((path, time.perf_counter() - start, status, len(body)))
+        return response
+
+    def run_long_poll(self, session):
+        """Full-field mode: one /api/live request per snapshot change"""
+        version = ""
+        while time.monotonic() < self.deadline:
+            wait = max(min(self.deadline - time.monotonic(), 25), 0.1)
+            response = self.fetch(session, "/api/live", {"since": version, "wait": wait})
+            try:
+                data = response.json()
+            except (AttributeError, ValueError):
+                time.sleep(self.interval)
+                continue
+            version = data.get("version", "")
+            if data.get("mode") != "LIVE" or not data.get("data"):
+                time.sleep(self.interval)
+
+    def run(self):
+        session = requests.Session()
+        # Stagger start so clients don't all fire on the same tick
+        time.sleep(random.uniform(0, self.interval))
+        if self.long_poll:
+            return self.run_long_poll(session)
+        tick = 0
+        while time.monotonic() < self.deadline:
+            started = time.monotonic()
+            for path in self.paths:
+                self.fetch(session, path)
+            if self.status_every and tick % self.status_every == 0:
+                self.fetch(session, "/api/status")
+            tick += 1
+            wake = min(started + self.interval, self.deadline)
+            time.sleep(max(wake - time.monotonic(), 0))
+
+
+def spawn_server(port, workers=1):
+    """Start webDisplay.py in a throwaway working dir with copied data"""
+    workdir = Path(tempfile.mkdtemp(prefix="pylon-load-"))
+    shutil.copytree(REPO_DIR / "schedules", workdir / "schedules")
+    shutil.copytree(REPO_DIR / "data", workdir / "data", ignore=shutil.ignore_patterns("*.sock", "archive"))
+
+    command = [sys.executable, str(REPO_DIR / "webDisplay.py"), "--port", str(port)]
+    if workers > 1:
+        command += ["--workers", str(workers)]
+    process = subprocess.Popen(command, cwd=workdir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            requests.get(url + "/api/status", timeout=1)
+            return process, workdir, url
+        except requests.RequestException:
+            time.sleep(0.1)
+
+    process.terminate()
+    raise RuntimeError("webDisplay.py did not start")
+
+
+def run_load_test(url, clients, duration, interval=REFRESH_BUDGET, status_every=5,
+                  paths=("/api/data",), server_pid=None, long_poll=False):
+    """
+    Drive `clients` simulated displays for `duration` seconds
+
+    Returns:
+        dict report (see print_report)
+    """
+    cpu_before = process_tree_cpu_seconds(server_pid) if server_pid else None
+    started = time.monotonic()
+    deadline = started + duration
+
+    threads = [
+        DisplayClient(url, interval, status_every, deadline, list(paths), long_poll)
+        for _ in range(clients)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    elapsed = time.monotonic() - started
+    cpu_after = process_tree_cpu_seconds(server_pid) if server_pid else None
+
+    by_path = {}
+    for thread in threads:
+        for path, seconds, status, size in thread.samples:
+            entry = by_path.setdefault(path, {"latencies": [], "errors": 0, "bytes": 0})
+            entry["latencies"].append(seconds)
+            entry["bytes"] += size
+            if status == 0 or status >= 500:
+                entry["errors"] += 1
+
+    total = sum(len(e["latencies"]) for e in by_path.values())
+    errors = sum(e["errors"] for e in by_path.values())
+
+    report = {
+        "clients": clients,
+        "duration": round(elapsed, 2),
+        "requests": total,
+        "throughput": total / elapsed if elapsed else 0,
+        "errorRate": errors / total if total else 0,
+        "serverCpuPercent": (
+            (cpu_after - cpu_before) / elapsed * 100
+            if cpu_before is not None and cpu_after is not None
+            else None
+        ),
+        "paths": {},
+    }
+    for path, entry in by_path.items():
+        stats = summarize(entry["latencies"])
+        stats["errors"] = entry["errors"]
+        stats["avgBytes"] = entry["bytes"] / max(stats["count"], 1)
+        report["paths"][path] = stats
+    return report
+
+
+def print_report(report):
+    print("\n" + "=" * 60)
+    print("RESULTS")
+    print("=" * 60)
+    print(f"Clients:     {report['clients']}")
+    print(f"Duration:    {report['duration']}s")
+    print(f"Requests:    {report['requests']} ({report['throughput']:.1f} req/s)")
+    print(f"Error rate:  {report['errorRate'] * 100:.2f}%")
+    cpu = report["serverCpuPercent"]
+    print(f"Server CPU:  {'n/a' if cpu is None else f'{cpu:.1f}% of one core'}")
+
+    print(f"\n{'Endpoint':<16}{'count':>7}{'p50':>12}{'p95':>12}{'p99':>12}{'max':>12}")
+    for path, stats in report["paths"].items():
+        print(
+            f"{path:<16}{stats['count']:>7}{format_ms(stats['p50']):>12}"
+            f"{format_ms(stats['p95']):>12}{format_ms(stats['p99']):>12}{format_ms(stats['max']):>12}"
+        )
+
+    data = report["paths"].get("/api/data")
+    if data:
+        per_display = data["count"] / report["clients"] / report["duration"] * 60
+        print(f"\n/api/data requests per display: {per_display:.1f}/min")
+    live = report["paths"].get("/api/live")
+    if live:
+        per_display = live["count"] / report["clients"] / report["duration"] * 60
+        print(f"\n/api/live requests per display: {per_display:.1f}/min (latency includes the long-poll wait)")
+    if data and data["p95"] is not None:
+        if data["p95"] > REFRESH_BUDGET:
+            print(f"\n❌ /api/data p95 exceeds the {REFRESH_BUDGET:.0f}s refresh budget")
+        else:
+            print(f"\n✅ /api/data p95 within the {REFRESH_BUDGET:.0f}s refresh budget")
+
+
+def main():
+    """Entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load test webDisplay.py")
+    parser.add_argument("--url", default="http://127.0.0.1:5000", help="Server to test")
+    parser.add_argument("--spawn", action="store_true",
+                        help="Start a private webDisplay.py (isolated data dir)")
+    parser.add_argument("--port", type=int, default=5099, help="Port for --spawn")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for --spawn (prefork mode when > 1)")
+    parser.add_argument("--server-pid", type=int, help="PID to measure CPU of (Linux)")
+    parser.add_argument("--clients", type=int, default=20, help="Simulated displays")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to run")
+    parser.add_argument("--interval", type=float, default=REFRESH_BUDGET,
+                        help="Seconds between /api/data polls per display")
+    parser.add_argument("--status-every", type=int, default=5,
+                        help="Also hit /api/status every N polls (0 = never)")
+    parser.add_argument("--paths", default="/api/data",
+                        help="Comma-separated endpoints each display polls")
+    parser.add_argument("--long-poll", action="store_true",
+                        help="Displays long-poll /api/live (full field) instead of /api/data")
+    parser.add_argument("--replay", type=str, help="Directory of liveRace-format JSON snapshots")
+    parser.add_argument("--replay-interval", type=float, default=5.0,
+                        help="Seconds between replayed snapshots (poller cadence)")
+    parser.add_argument("--data-dir",
+                        help="Data dir the replay overwrites when not using --spawn")
+    parser.add_argument("--no-replay", action="store_true", help="Don't touch liveRace.json")
+    parser.add_argument("--json", type=str, help="Also write the report to this file")
+    args = parser.parse_args()
+    if not args.spawn and not args.no_replay and args.data_dir is None:
+        parser.error("without --spawn the replay overwrites liveRace.json - "
+                     "pass --data-dir explicitly (or --no-replay)")
+
+    print("=" * 60)
+    print("NASCAR PYLON WEB LOAD TEST")
+    print("=" * 60)
+
+    process = workdir = None
+    url, server_pid, data_dir = args.url, args.server_pid, args.data_dir
+    if args.spawn:
+        process, workdir, url = spawn_server(args.port, args.workers)
+        server_pid, data_dir = process.pid, workdir / "data"
+        print(f"🚀 Spawned webDisplay.py (PID {process.pid}) in {workdir}")
+
+    replay = None
+    if not args.no_replay:
+        replay = ReplayWriter(data_dir, args.replay, args.replay_interval)
+        replay.start()
+
+    print(f"📡 {args.clients} displays → {url} for {args.duration:.0f}s")
+
+    try:
+        report = run_load_test(
+            url,
+            args.clients,
+            args.duration,
+            interval=args.interval,
+            status_every=args.status_every,
+            paths=[p.strip() for p in args.paths.split(",") if p.strip()],
+            server_pid=server_pid,
+            long_poll=args.long_poll,
+        )
+    finally:
+        if replay:
+            replay.stopped.set()
+        if process:
+            process.terminate()
+            process.wait(timeout=10)
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    if replay:
+        report["snapshotsReplayed"] = replay.written
+    print_report(report)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Report saved to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
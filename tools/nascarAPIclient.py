@@ -9,6 +9,7 @@ Based on research from:
 """
 
 import json
+import os
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
@@ -17,6 +18,12 @@ import requests
 
 DATA_DIR = Path("data")
 
+# Returned by get_raw() when the server answered 304 Not Modified
+NOT_MODIFIED = object()
+
+# Override with NASCAR_BASE_URL (or base_url=) to point at tools/feedSimulator.py
+DEFAULT_BASE_URL = "https://cf.nascar.com"
+
 
 class Series(Enum):
     """NASCAR Series IDs"""
@@ -39,27 +46,83 @@ class FlagStatus(Enum):
     UNKNOWN = 9
 
 
+# flag_state codes -> the names our snapshots use
+FLAG_NAMES = {
+    0: "NONE",
+    1: "GREEN",
+    2: "YELLOW",
+    3: "RED",
+    4: "WHITE",
+    5: "CHECKERED",
+    9: "CHECKERED",  # Also checkered
+    8: "ORANGE",
+}
+
+
+def flag_name(flag_state):
+    return FLAG_NAMES.get(flag_state, "UNKNOWN")
+
+
 class NascarApiClient:
     """Client for accessing NASCAR live feed APIs"""
 
-    def __init__(self):
-        self.ops_feed_url = "https://cf.nascar.com/live-ops/live-ops.json"
+    def __init__(self, session=None, base_url=None):
+        # A shared session keeps connections to cf.nascar.com alive between
+        # requests (and is safe to share across threads for plain GETs)
+        self.session = session or requests.Session()
+        self.base_url = (
+            base_url or os.environ.get("NASCAR_BASE_URL") or DEFAULT_BASE_URL
+        ).rstrip("/")
+        self.ops_feed_url = f"{self.base_url}/live-ops/live-ops.json"
         # Use the cacher endpoint - has full data including intervals
-        self.cacher_feed_url = "https://cf.nascar.com/cacher/live/live-feed.json"
+        self.cacher_feed_url = f"{self.base_url}/cacher/live/live-feed.json"
         self.ops_feed = None
+        self.validators = {}  # url -> (ETag, Last-Modified) of the last 200
 
-    def get_data(self, url, timeout=10):
-        """Fetch JSON data from URL"""
-        headers = {
+    def _headers(self):
+        return {
             "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             "Accept": "application/json",
             "Referer": "https://www.nascar.com/",
         }
 
+    def get_data(self, url, timeout=10):
+        """Fetch JSON data from URL"""
+        body = self.get_raw(url, timeout, conditional=False)
+        if body is None:
+            return None
+        try:
+            return json.loads(body)
+        except ValueError as e:
+            print(f"❌ Invalid JSON from {url}: {e}")
+            return None
+
+    def get_raw(self, url, timeout=10, conditional=True):
+        """
+        Fetch a response body as bytes, without parsing it
+
+        With conditional=True the ETag / Last-Modified of the previous
+        response are sent back, and NOT_MODIFIED is returned on a 304.
+        """
+        headers = self._headers()
+        if conditional:
+            etag, modified = self.validators.get(url, (None, None))
+            if etag:
+                headers["If-None-Match"] = etag
+            if modified:
+                headers["If-Modified-Since"] = modified
+
         try:
-            response = requests.get(url, headers=headers, timeout=timeout)
+            response = self.session.get(url, headers=headers, timeout=timeout)
+            if conditional and response.status_code == 304:
+                return NOT_MODIFIED
             response.raise_for_status()
-            return response.json()
+            if conditional:
+                self.validators[url] = (
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                )
+            return response.content
         except requests.HTTPError as e:
             if e.response.status_code == 403:
                 print(f"⚠️  Access forbidden (403) - Race may not be active yet")
@@ -70,6 +133,13 @@ class NascarApiClient:
             print(f"❌ Error fetching {url}: {e}")
             return None
 
+    def forget_validators(self, url=None):
+        """Drop stored ETag / Last-Modified (for one URL, or all of them)"""
+        if url is None:
+            self.validators.clear()
+        else:
+            self.validators.pop(url, None)
+
     def get_ops_feed(self):
         """
         Get the operations feed which contains URLs for live feeds
@@ -103,6 +173,31 @@ class NascarApiClient:
 
         return None
 
+    def get_live_feed_url_for(self, series, use_cacher=True):
+        """Cacher URL, or the series-specific basic feed URL"""
+        if use_cacher:
+            # Use cacher endpoint - has full data including delta/intervals
+            return self.cacher_feed_url
+        return self.get_live_feed_url(series)
+
+    def get_live_feed_raw(self, series=Series.CUP, use_cacher=True, conditional=True):
+        """
+        Raw live feed body (bytes), NOT_MODIFIED, or None on failure
+
+        Lets callers skip parsing when the payload hasn't changed; turn the
+        bytes into our format with parse_live_feed(). Pass conditional=False
+        when you hold no previous body to fall back on after a 304.
+        """
+        url = self.get_live_feed_url_for(series, use_cacher)
+        if not url:
+            print(f"⚠️  No live feed URL available for {series.name}")
+            return None
+        return self.get_raw(url, conditional=conditional)
+
+    def parse_live_feed(self, body, series=Series.CUP):
+        """Parse a raw live feed body into our camelCase format"""
+        return self._parse_live_feed(json.loads(body), series)
+
     def get_live_feed(self, series=Series.CUP, use_cacher=True):
         """
         Fetch live race feed for specified series
@@ -112,15 +207,10 @@ class NascarApiClient:
             series: Which series to fetch (CUP, OREILLY, TRUCKS)
             use_cacher: Use cacher endpoint (has intervals) vs basic feed
         """
-        if use_cacher:
-            # Use cacher endpoint - has full data including delta/intervals
-            url = self.cacher_feed_url
-        else:
-            # Use series-specific endpoint (basic data only)
-            url = self.get_live_feed_url(series)
-            if not url:
-                print(f"⚠️  No live feed URL available for {series.name}")
-                return None
+        url = self.get_live_feed_url_for(series, use_cacher)
+        if not url:
+            print(f"⚠️  No live feed URL available for {series.name}")
+            return None
 
         data = self.get_data(url)
         if not data:
@@ -133,18 +223,7 @@ class NascarApiClient:
         """Parse NASCAR API response to our camelCase format"""
 
         # Map flag status
-        flag_state = data.get("flag_state", 0)
-        flag_map = {
-            0: "NONE",
-            1: "GREEN",
-            2: "YELLOW",
-            3: "RED",
-            4: "WHITE",
-            5: "CHECKERED",
-            9: "CHECKERED",  # Also checkered
-            8: "ORANGE",
-        }
-        flag_status = flag_map.get(flag_state, "UNKNOWN")
+        flag_status = flag_name(data.get("flag_state", 0))
 
         # Parse vehicles (drivers)
         cars = []
@@ -170,6 +249,7 @@ class NascarApiClient:
                 "position": vehicle.get("running_position", idx),
                 "car": vehicle.get("vehicle_number", ""),
                 "driver": driver_name,
+                "driverId": driver_data.get("driver_id"),
                 "interval": interval,
                 "lapsCompleted": vehicle.get("laps_completed", 0),
                 "passingDifferential": vehicle.get("passing_differential", 0),
@@ -189,6 +269,7 @@ class NascarApiClient:
         cars.sort(key=lambda x: x["position"])
 
         laps_to_go = data.get("laps_to_go", 0)
+        stage = data.get("stage") or {}
 
         return {
             "series": series.name,
@@ -197,6 +278,10 @@ class NascarApiClient:
             "lap": data.get("lap_number", 0),
             "lapsTotal": data.get("laps_in_race", 0),
             "lapsToGo": laps_to_go,
+            "stage": {
+                "number": stage.get("stage_num"),
+                "endLap": stage.get("finish_at_lap"),
+            } if stage else None,
             "lastUpdate": datetime.now().isoformat(),
             "cars": cars,
         }
@@ -237,6 +322,9 @@ def main():
     parser.add_argument(
         "--continuous", action="store_true", help="Poll continuously (every 5 seconds)"
     )
+    parser.add_argument(
+        "--base-url", type=str, help="Feed host override (e.g. a local feedSimulator)"
+    )
     parser.add_argument(
         "--interval",
         type=int,
@@ -254,7 +342,7 @@ def main():
     print("=" * 60)
     print(f"\n📡 Series: {series.name}")
 
-    client = NascarApiClient()
+    client = NascarApiClient(base_url=args.base_url)
 
     if args.continuous:
         print(f"🔄 Polling every {args.interval} seconds (Ctrl+C to stop)\n")
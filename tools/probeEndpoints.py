@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+NASCAR Endpoint Probe
+Measures the feed endpoints over time to tune poll cadence and timeouts
+
+testNascarEndpoints.py fetches each URL once to see what it returns. This
+probe hits a set of endpoints repeatedly and concurrently for a while and
+records, per request, the connect time (TCP + TLS), time to first byte and
+total time, the payload size and whether the content changed since the
+previous response. From that it reports per endpoint:
+
+- connect / TTFB / total percentiles and payload sizes
+- how often the content actually changes (the upstream refresh interval)
+- a suggested poll cadence and request timeout
+
+Usage:
+    # Probe the real feeds for 5 minutes, one request every 2 s per endpoint
+    python tools/probeEndpoints.py --duration 300 --interval 2
+
+    # Against a local stub (in-process feedSimulator)
+    python tools/probeEndpoints.py --simulator --duration 30 --interval 0.5
+
+    # Just some endpoints, plus an extra URL
+    python tools/probeEndpoints.py --endpoints live-feed,lap-times --url ops=https://cf.nascar.com/live-ops/live-ops.json
+"""
+
+import hashlib
+import http.client
+import json
+import math
+import sys
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.benchStats import format_ms, percentile, summarize
+from tools.nascarAPIclient import DEFAULT_BASE_URL
+from tools.testNascarEndpoints import endpoint_urls
+
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36"
+REQUEST_TIMEOUT = 10
+
+
+def probe_urls(feed_base=None, cacher_base=None):
+    """Default probe set: feed.nascar.com endpoints plus the cacher live feed"""
+    urls = endpoint_urls(feed_base)
+    cacher_base = (cacher_base or DEFAULT_BASE_URL).rstrip("/")
+    urls["cacher-live-feed"] = f"{cacher_base}/cacher/live/live-feed.json"
+    return urls
+
+
+def timed_get(url, timeout=REQUEST_TIMEOUT):
+    """
+    One GET on a fresh connection with phase timings
+
+    Returns:
+        dict with status, connect, ttfb, total (seconds), size, digest
+        (or error)
+    """
+    parts = urlsplit(url)
+    connection_class = (
+        http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+    )
+    connection = connection_class(parts.hostname, parts.port, timeout=timeout)
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+
+    start = time.perf_counter()
+    try:
+        connection.connect()
+        connected = time.perf_counter()
+        connection.request("GET", path, headers={
+            "User-Agent": USER_AGENT,
+            "Accept": "application/json",
+        })
+        response = connection.getresponse()
+        first_byte = time.perf_counter()
+        body = response.read()
+        done = time.perf_counter()
+    except (OSError, http.client.HTTPException) as e:
+        return {"error": f"{type(e).__name__}: {e}", "total": time.perf_counter() - start}
+    finally:
+        connection.close()
+
+    return {
+        "status": response.status,
+        "connect": connected - start,
+        "ttfb": first_byte - connected,
+        "total": done - start,
+        "size": len(body),
+        "digest": hashlib.blake2b(body, digest_size=16).digest() if response.status == 200 else None,
+    }
+
+
+class EndpointProbe(threading.Thread):
+    """Requests one URL every `interval` seconds until the deadline"""
+
+    def __init__(self, name, url, interval, deadline):
+        super().__init__(daemon=True)
+        self.name = name
+        self.url = url
+        self.interval = interval
+        self.deadline = deadline
+        self.results = []
+        self.changes = []  # Monotonic times at which the content changed
+
+    def run(self):
+        last_digest = None
+        while time.monotonic() < self.deadline:
+            started = time.monotonic()
+            result = timed_get(self.url)
+            result["at"] = started
+            digest = result.get("digest")
+            result["changed"] = digest is not None and digest != last_digest and last_digest is not None
+            if result["changed"]:
+                self.changes.append(started)
+            if digest is not None:
+                last_digest = digest
+            self.results.append(result)
+            wake = min(started + self.interval, self.deadline)
+            time.sleep(max(wake - time.monotonic(), 0))
+
+    def report(self):
+        ok = [r for r in self.results if r.get("status") == 200]
+        errors = {}
+        for r in self.results:
+            if r.get("status") != 200:
+                key = r.get("error") or f"HTTP {r.get('status')}"
+                errors[key] = errors.get(key, 0) + 1
+
+        gaps = sorted(b - a for a, b in zip(self.changes, self.changes[1:]))
+        refresh = percentile(gaps, 50) if gaps else None
+        total = summarize([r["total"] for r in ok])
+        return {
+            "url": self.url,
+            "requests": len(self.results),
+            "ok": len(ok),
+            "errors": errors,
+            "connect": summarize([r["connect"] for r in ok]),
+            "ttfb": summarize([r["ttfb"] for r in ok]),
+            "total": total,
+            "size": summarize([r["size"] for r in ok]),
+            "changes": len(self.changes),
+            "changeRate": len(self.changes) / max(len(ok) - 1, 1) if ok else 0.0,
+            "refreshInterval": refresh,
+            "suggestedInterval": self.suggest_interval(refresh),
+            "suggestedTimeout": self.suggest_timeout(total),
+        }
+
+    def suggest_interval(self, refresh):
+        """Poll about as often as upstream changes (none seen -> as probed)"""
+        if refresh is None:
+            return None
+        return max(round(refresh, 1), self.interval)
+
+    @staticmethod
+    def suggest_timeout(total):
+        """Twice the p99 total time, rounded up to a whole second"""
+        if not total["count"]:
+            return None
+        return max(math.ceil(total["p99"] * 2), 1)
+
+
+def run_probe(urls, duration, interval):
+    """Probe all URLs concurrently; returns {name: report}"""
+    deadline = time.monotonic() + duration
+    probes = [EndpointProbe(name, url, interval, deadline) for name, url in urls.items()]
+    for probe in probes:
+        probe.start()
+    for probe in probes:
+        probe.join()
+    return {probe.name: probe.report() for probe in probes}
+
+
+def print_report(reports, interval):
+    print("\n" + "=" * 78)
+    print("RESULTS")
+    print("=" * 78)
+    print(f"{'Endpoint':<18}{'ok/req':>9}{'connect':>11}{'ttfb p50':>11}{'total p95':>11}"
+          f"{'total p99':>11}{'size':>9}")
+    for name, r in reports.items():
+        size = r["size"]["p50"]
+        print(
+            f"{name:<18}{r['ok']:>4}/{r['requests']:<4}"
+            f"{format_ms(r['connect']['p50']):>11}{format_ms(r['ttfb']['p50']):>11}"
+            f"{format_ms(r['total']['p95']):>11}{format_ms(r['total']['p99']):>11}"
+            f"{'-' if size is None else f'{size / 1024:.1f}K':>9}"
+        )
+
+    print(f"\n{'Endpoint':<18}{'changed':>9}{'refresh':>10}{'poll every':>12}{'timeout':>9}")
+    for name, r in reports.items():
+        refresh = "-" if r["refreshInterval"] is None else f"{r['refreshInterval']:.1f}s"
+        poll = "-" if r["suggestedInterval"] is None else f"{r['suggestedInterval']:g}s"
+        timeout = "-" if r["suggestedTimeout"] is None else f"{r['suggestedTimeout']}s"
+        print(f"{name:<18}{r['changeRate'] * 100:>8.0f}%{refresh:>10}{poll:>12}{timeout:>9}")
+
+    failing = {name: r["errors"] for name, r in reports.items() if r["errors"]}
+    if failing:
+        print("\n⚠️  Errors:")
+        for name, errors in failing.items():
+            for error, count in errors.items():
+                print(f"   {name}: {count} x {error}")
+    print(f"\nRefresh intervals below the {interval:g}s probe interval can't be resolved -"
+          " probe faster to measure them.")
+
+
+def main():
+    """Entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Probe NASCAR feed endpoints over time")
+    parser.add_argument("--duration", type=float, default=60, help="Seconds to probe")
+    parser.add_argument("--interval", type=float, default=2,
+                        help="Seconds between requests per endpoint")
+    parser.add_argument("--endpoints", type=str, help="Comma-separated subset of endpoint names")
+    parser.add_argument("--url", action="append", default=[], metavar="NAME=URL",
+                        help="Extra endpoint to probe (repeatable)")
+    parser.add_argument("--base-url", type=str,
+                        help="Host for all default endpoints (e.g. a running feedSimulator)")
+    parser.add_argument("--simulator", action="store_true",
+                        help="Start an in-process feedSimulator and probe it")
+    parser.add_argument("--sim-update-interval", type=float, default=2,
+                        help="Simulator seconds per lap (with --simulator)")
+    parser.add_argument("--sim-latency", type=float, default=0.05,
+                        help="Simulator response latency in seconds (with --simulator)")
+    parser.add_argument("--json", type=str, help="Also write the report to this file")
+    args = parser.parse_args()
+
+    print("=" * 78)
+    print("NASCAR ENDPOINT PROBE")
+    print("=" * 78)
+
+    sim = None
+    base_url = args.base_url
+    if args.simulator:
+        from tools.feedSimulator import FeedSimulator, SimulatorConfig
+
+        sim = FeedSimulator(SimulatorConfig(
+            update_interval=args.sim_update_interval,
+            latency=args.sim_latency,
+            latency_jitter=args.sim_latency,
+        )).start()
+        base_url = sim.base_url
+        print(f"🧪 Simulator at {base_url}")
+
+    urls = probe_urls(base_url, base_url)
+    if args.endpoints:
+        wanted = [name.strip() for name in args.endpoints.split(",") if name.strip()]
+        unknown = [name for name in wanted if name not in urls]
+        if unknown:
+            print(f"❌ Unknown endpoint(s): {', '.join(unknown)}")
+            print(f"Available: {', '.join(urls)}")
+            return
+        urls = {name: urls[name] for name in wanted}
+    for extra in args.url:
+        name, _, url = extra.partition("=")
+        if not url:
+            print(f"❌ --url needs NAME=URL, got {extra!r}")
+            return
+        urls[name] = url
+
+    print(f"📡 {len(urls)} endpoints, every {args.interval:g}s for {args.duration:g}s")
+    try:
+        reports = run_probe(urls, args.duration, args.interval)
+    finally:
+        if sim:
+            sim.stop()
+
+    print_report(reports, args.interval)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(reports, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
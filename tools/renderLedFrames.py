@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+LED Frame Renderer
+Drives src/views/ledView.py headless and reports how fast it renders
+
+Renders the live leaderboard (scrolling through the field like pylon.py),
+the points standings or the schedule at a fixed frame rate into a sink:
+nothing (null), or numbered PPM/PNG files you can flip through to check
+what the panel would show.
+
+Reports render time percentiles, rows re-blitted per frame, glyph and
+text-run cache hit rates, and missed frames / jitter against the target
+frame rate.
+
+Usage:
+    # 300 frames of the live view at 30 FPS, timing only
+    python tools/renderLedFrames.py --screen live --frames 300
+
+    # A few PNGs of a 64x32 panel, scaled up 8x for viewing
+    python tools/renderLedFrames.py --width 64 --height 32 --sink png --out /tmp/led --scale 8
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.frameClock import FrameClock
+from src.layout import build_live_layout, build_points_layout, build_schedule_layout
+from src.loader import load_all_schedules, load_json
+from src.views.ledView import ROW_HEIGHT, LedView, NullSink, PNGSink, PPMSink, cache_stats
+from tools.benchStats import format_ms, summarize
+
+SINKS = {"null": NullSink, "ppm": PPMSink, "png": PNGSink}
+
+
+def layout_source(screen, rows):
+    """
+    Function frame_number -> layout for the chosen screen
+
+    The live screen advances the scroll window every `scroll_frames`
+    frames, so consecutive frames mostly share rows (like the real pylon).
+    """
+    if screen == "live":
+        data = load_json("liveRace.json")
+        total_cars = len(data.get("cars", []))
+        visible = max(rows - 11, 1)  # Header + top 10 pinned
+        steps = max(total_cars - 10 - visible + 1, 1)
+
+        def live(frame, scroll_frames):
+            offset = (frame // scroll_frames) % steps
+            return build_live_layout(data, scrollOffset=offset, visibleRows=visible)
+        return live
+
+    if screen == "points":
+        layout = build_points_layout(load_json("standings.json"))
+    else:
+        layout = build_schedule_layout(load_all_schedules())
+    return lambda frame, scroll_frames: layout
+
+
+def run(view, sink, layouts, frames, fps, scroll_frames, paced=True):
+    """Render `frames` frames; returns the report dict"""
+    clock = FrameClock(fps)
+    render_times = []
+    dirty_rows = []
+
+    for frame in range(frames):
+        if paced:
+            clock.wait()
+        start = time.perf_counter()
+        dirty_rows.append(view.render(layouts(frame, scroll_frames)))
+        sink.write(view.frame)
+        render_times.append(time.perf_counter() - start)
+    sink.close()
+
+    return {
+        "panel": f"{view.width}x{view.height}",
+        "rows": view.rows,
+        "frames": frames,
+        "render": summarize(render_times),
+        "dirtyRowsPerFrame": sum(dirty_rows) / len(dirty_rows) if dirty_rows else 0.0,
+        "cache": cache_stats(),
+        "clock": clock.stats() if paced else None,
+    }
+
+
+def print_report(report):
+    print("\n" + "=" * 60)
+    print("RESULTS")
+    print("=" * 60)
+    print(f"Panel:       {report['panel']} ({report['rows']} text rows)")
+    print(f"Frames:      {report['frames']}")
+    render = report["render"]
+    print(
+        f"Render:      p50 {format_ms(render['p50'])}  p95 {format_ms(render['p95'])}  "
+        f"max {format_ms(render['max'])}"
+    )
+    print(f"Dirty rows:  {report['dirtyRowsPerFrame']:.2f} per frame of {report['rows']}")
+    for name, stats in report["cache"].items():
+        print(f"Cache {name + ':':<9} {stats['hitRate'] * 100:.1f}% hits ({stats['size']} entries)")
+    clock = report["clock"]
+    if clock:
+        print(
+            f"Clock:       {clock['actualFps']:.1f}/{clock['fps']} FPS, {clock['missed']} missed, "
+            f"jitter p95 {clock['jitterP95Ms']:.2f} ms, max {clock['jitterMaxMs']:.2f} ms"
+        )
+
+
+def main():
+    """Entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Render LED matrix frames headless")
+    parser.add_argument("--screen", choices=["live", "points", "schedule"], default="live")
+    parser.add_argument("--width", type=int, default=128, help="Panel width in pixels")
+    parser.add_argument("--height", type=int, default=22 * ROW_HEIGHT, help="Panel height in pixels")
+    parser.add_argument("--fps", type=float, default=30, help="Target frame rate")
+    parser.add_argument("--frames", type=int, default=300, help="Frames to render")
+    parser.add_argument("--scroll-seconds", type=float, default=2,
+                        help="Seconds per scroll step on the live screen")
+    parser.add_argument("--unpaced", action="store_true", help="Render as fast as possible")
+    parser.add_argument("--sink", choices=sorted(SINKS), default="null")
+    parser.add_argument("--out", default="ledFrames", help="Directory for ppm/png frames")
+    parser.add_argument("--scale", type=int, default=1, help="Pixel scale for ppm/png output")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("NASCAR PYLON LED FRAME RENDERER")
+    print("=" * 60)
+
+    view = LedView(args.width, args.height)
+    sink = NullSink() if args.sink == "null" else SINKS[args.sink](args.out, scale=args.scale)
+    layouts = layout_source(args.screen, view.rows)
+    scroll_frames = max(int(args.scroll_seconds * args.fps), 1)
+
+    print(f"🖼️  {args.screen} screen, {args.frames} frames at {args.fps:g} FPS → {args.sink}")
+    report = run(view, sink, layouts, args.frames, args.fps, scroll_frames, paced=not args.unpaced)
+    print_report(report)
+    if args.sink != "null":
+        print(f"\n✅ Wrote {sink.frames} frames to {args.out}/")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,60 +4,93 @@ NASCAR Cup Series Standings Scraper
 Scrapes current standings from ESPN and saves to JSON with camelCase keys
 """
 
+import codecs
 import json
 import re
+import sys
+import time
+import zlib
 from pathlib import Path
 from urllib.request import urlopen, Request
 from html.parser import HTMLParser
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.driverRegistry import get_registry
+
 DATA_DIR = Path("data")
 STANDINGS_FILE = DATA_DIR / "standings.json"
 
 ESPN_CUP_URL = "https://www.espn.com/racing/standings"
+CHUNK_SIZE = 16 * 1024  # Bytes per socket read while streaming the page
 
 
 class StandingsParser(HTMLParser):
-    """Parse ESPN standings table"""
+    """
+    Parse ESPN standings table
+
+    Fed incrementally. Tracks table nesting so only rows inside a table are
+    considered, types each row as soon as its </tr> arrives, and sets
+    `done` when the table holding the standings closes - the caller can
+    stop reading the page there.
+    """
     
     def __init__(self):
         super().__init__()
-        self.in_table = False
+        self.table_rows = []  # Standings rows found in each open table
         self.in_row = False
         self.current_row = []
         self.drivers = []
-        self.col_index = 0
+        self.done = False
         
     def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag == "table":
+            self.table_rows.append(0)
         # Look for table rows
-        if tag == "tr":
+        elif tag == "tr" and self.table_rows:
             self.in_row = True
             self.current_row = []
-            self.col_index = 0
             
     def handle_endtag(self, tag):
-        if tag == "tr" and self.in_row:
+        if self.done:
+            return
+        if tag == "table" and self.table_rows:
+            # Standings table closed - nothing after it is needed
+            if self.table_rows.pop() and self.drivers:
+                self.done = True
+        elif tag == "tr" and self.in_row:
             self.in_row = False
             # Process completed row if it has data
-            if len(self.current_row) >= 7:
-                try:
-                    # Extract: rank, driver name, points, wins, poles, top5, top10
-                    rank = int(self.current_row[0])
-                    driver_full = self.current_row[1]
-                    points = int(self.current_row[2])
-                    
-                    # Extract last name from driver (simple approach)
-                    driver = driver_full.split()[-1] if driver_full else "Unknown"
-                    
-                    # For now, we'll extract car number later
-                    # This will need enhancement to get actual car numbers
-                    self.drivers.append({
-                        "position": rank,
-                        "driver": driver,
-                        "points": points,
-                        "pointsBack": 0  # Will calculate later
-                    })
-                except (ValueError, IndexError):
-                    pass
+            driver = self.parse_row(self.current_row)
+            if driver and self.table_rows:
+                self.drivers.append(driver)
+                self.table_rows[-1] += 1
+
+    def parse_row(self, cells):
+        """Typed driver dict for a standings row, or None"""
+        if len(cells) < 7:
+            return None
+        try:
+            # Extract: rank, driver name, points, wins, poles, top5, top10
+            rank = int(cells[0])
+            driver_full = cells[1]
+            points = int(cells[2])
+        except (ValueError, IndexError):
+            return None
+
+        # Extract last name from driver (simple approach)
+        driver = driver_full.split()[-1] if driver_full else "Unknown"
+
+        # Car number comes from the driver registry (add_car_numbers)
+        return {
+            "position": rank,
+            "driver": driver,
+            "fullName": driver_full,
+            "points": points,
+            "pointsBack": 0  # Will calculate later
+        }
                     
     def handle_data(self, data):
         if self.in_row:
@@ -66,21 +99,60 @@ class StandingsParser(HTMLParser):
                 self.current_row.append(data)
 
 
-def fetch_standings():
+def stream_into_parser(response, parser, chunk_size=CHUNK_SIZE):
+    """
+    Feed an HTTP response to the parser chunk by chunk
+
+    Decompresses gzip and decodes incrementally, and stops reading the
+    socket as soon as the parser has seen the end of the standings table.
+
+    Returns:
+        int: bytes read off the wire
+    """
+    charset = response.headers.get_content_charset() or "utf-8"
+    decoder = codecs.getincrementaldecoder(charset)(errors="replace")
+    inflater = None
+    if response.headers.get("Content-Encoding", "").lower() == "gzip":
+        inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    bytes_read = 0
+    while not parser.done:
+        chunk = response.read(chunk_size)
+        if not chunk:
+            break
+        bytes_read += len(chunk)
+        if inflater:
+            chunk = inflater.decompress(chunk)
+        parser.feed(decoder.decode(chunk))
+
+    if not parser.done:
+        parser.feed(decoder.decode(b"", final=True))
+        parser.close()
+    return bytes_read
+
+
+def fetch_standings(url=ESPN_CUP_URL):
     """Fetch and parse standings from ESPN"""
     print("🏁 Fetching standings from ESPN...")
     
     # Create request with headers to avoid blocking
-    req = Request(ESPN_CUP_URL, headers={
-        'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36'
+    req = Request(url, headers={
+        'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36',
+        'Accept-Encoding': 'gzip',
     })
     
     try:
-        with urlopen(req) as response:
-            html = response.read().decode('utf-8')
-            
+        start = time.perf_counter()
         parser = StandingsParser()
-        parser.feed(html)
+        # Leaving the block closes the socket, even mid-page
+        with urlopen(req) as response:
+            total = response.headers.get("Content-Length")
+            bytes_read = stream_into_parser(response, parser)
+        elapsed = time.perf_counter() - start
+
+        of_total = f" of {int(total) // 1024} KB" if total else ""
+        stopped = " (stopped after standings table)" if parser.done else ""
+        print(f"   Read {bytes_read // 1024} KB{of_total} in {elapsed * 1000:.0f} ms{stopped}")
         
         if not parser.drivers:
             print("⚠️  No standings data found")
@@ -99,66 +171,23 @@ def fetch_standings():
         return None
 
 
-def get_car_number_mapping():
-    """
-    Manual mapping of driver last names to car numbers
-    This should be updated periodically or scraped from another source
-    """
-    return {
-        "Larson": "5",
-        "Hamlin": "11", 
-        "Briscoe": "14",
-        "Byron": "24",
-        "Bell": "20",
-        "Blaney": "12",
-        "Logano": "22",
-        "Elliott": "9",
-        "Reddick": "45",
-        "Chastain": "1",
-        "Wallace": "23",
-        "van Gisbergen": "88",
-        "Bowman": "48",
-        "Cindric": "2",
-        "Dillon": "3",
-        "Berry": "4",
-        "Buescher": "17",
-        "Preece": "41",
-        "Gibbs": "54",
-        "Keselowski": "6",
-        "Busch": "8",
-        "McDowell": "34",
-        "Hocevar": "77",
-        "Jones": "43",
-        "Nemechek": "42",
-        "Allmendinger": "16",
-        "Gilliland": "38",
-        "Smith": "71",
-        "Suarez": "99",
-        "Stenhouse": "47",
-        "Haley": "51",
-        "Custer": "41",
-        "Ty Dillon": "10",
-        "Gragson": "10",
-        "Herbst": "98",
-        "Ware": "15",
-        "Legge": "50",
-        "Johnson": "84",
-    }
-
-
-def add_car_numbers(drivers):
-    """Add car numbers to driver standings"""
-    car_mapping = get_car_number_mapping()
+def add_car_numbers(drivers, series="CUP"):
+    """Add car numbers (and driver ids) from the driver registry"""
+    registry = get_registry()
+    if not len(registry):
+        print("⚠️  Driver registry is empty - run tools/autoUpdateStandings.py once to build it")
     
     for driver in drivers:
-        driver_name = driver["driver"]
-        # Try to find car number
-        if driver_name in car_mapping:
-            driver["car"] = car_mapping[driver_name]
+        # ESPN gives full names; a bare last name is ambiguous (two Dillons)
+        full_name = driver.pop("fullName", driver["driver"])
+        match = registry.find_name(full_name, series)
+        if match:
+            driver["car"] = match.car
+            driver["driverId"] = match.driverId
         else:
             # Default to position if not found
             driver["car"] = f"#{driver['position']}"
-            print(f"⚠️  No car number found for {driver_name}, using placeholder")
+            print(f"⚠️  No car number found for {full_name}, using placeholder")
     
     return drivers
 
@@ -10,6 +10,8 @@ from urllib.request import urlopen, Request
 from datetime import datetime
 from pathlib import Path
 
+FEED_BASE_URL = "https://feed.nascar.com"
+
 # Known NASCAR feed endpoints
 ENDPOINTS = {
     "live-feed": "https://feed.nascar.com/live-feed.json",
@@ -20,6 +22,14 @@ ENDPOINTS = {
     "points": "https://feed.nascar.com/points.json",
 }
 
+def endpoint_urls(base_url=None):
+    """ENDPOINTS, optionally re-pointed at another host (e.g. feedSimulator)"""
+    if not base_url:
+        return dict(ENDPOINTS)
+    base_url = base_url.rstrip("/")
+    return {name: url.replace(FEED_BASE_URL, base_url) for name, url in ENDPOINTS.items()}
+
+
 def test_endpoint(name, url, save_to_file=False):
     """Test a single endpoint and show results"""
     print(f"\n{'='*60}")
@@ -91,6 +101,8 @@ def main():
                        help='Save responses to files')
     parser.add_argument('--endpoint', type=str, 
                        help='Test specific endpoint only')
+    parser.add_argument('--base-url', type=str,
+                       help='Feed host override (e.g. a local feedSimulator)')
     
     args = parser.parse_args()
     
@@ -102,11 +114,12 @@ def main():
     print("   If all fail, the race may not be active yet.\n")
     
     results = {}
+    endpoints = endpoint_urls(args.base_url)
     
     if args.endpoint:
         # Test specific endpoint
-        if args.endpoint in ENDPOINTS:
-            success, data = test_endpoint(args.endpoint, ENDPOINTS[args.endpoint], args.save)
+        if args.endpoint in endpoints:
+            success, data = test_endpoint(args.endpoint, endpoints[args.endpoint], args.save)
             results[args.endpoint] = success
         else:
             print(f"❌ Unknown endpoint: {args.endpoint}")
@@ -114,7 +127,7 @@ def main():
             return
     else:
         # Test all endpoints
-        for name, url in ENDPOINTS.items():
+        for name, url in endpoints.items():
             success, data = test_endpoint(name, url, args.save)
             results[name] = success
     
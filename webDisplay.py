@@ -8,30 +8,133 @@ http://your-server-ip:5000
 """
 
 import json
+import os
+import signal
+import socket
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
 
-from flask import Flask, jsonify, render_template
+from flask import Flask, Response, abort, jsonify, render_template, request
 
 # Add parent to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src.layout import build_live_layout, build_points_layout, build_schedule_layout
+from src.gapHistory import (
+    GapHistory,
+    SeriesCache,
+    archive_path,
+    clamp_budget,
+    load_archived_history,
+)
+from src.heartbeat import HeartbeatReader
+from src.layoutCache import (
+    ChangePipes,
+    LayoutBuilder,
+    SharedLayoutReader,
+    SharedLayoutWriter,
+    encode,
+)
+from src.layout import (
+    build_full_field_layout,
+    build_live_layout,
+    build_points_layout,
+    build_projected_points_layout,
+    build_schedule_layout,
+)
+from src.liveSource import LiveDataSource, snapshot_version
 from src.loader import load_all_schedules, load_json
-from src.state import determine_state
+from src.raceEvents import events_since
+from src.staticAssets import IMMUTABLE, AssetManifest, accepts_gzip
+from src.state import get_mode_controller
 
-app = Flask(__name__)
+# static/ is served by the /static route below (hashed URLs, gzip)
+app = Flask(__name__, static_folder=None)
+
+LONG_POLL_TIMEOUT = 25  # Max seconds /api/live holds a request open
+EVENTS_LIMIT = 50  # Default / max events per /api/events response
+DATA_SCROLL_INTERVAL = 2  # Seconds per /api/data scroll step in prefork mode (the display's poll rate)
+BUILDER_START_TIMEOUT = 30  # Seconds prefork waits for the first bundle
 
 # Global state
 current_mode = "IDLE"
 scroll_offset = 0
+mode_controller = get_mode_controller()
+heartbeat = HeartbeatReader()
+live_source = LiveDataSource()
+projection_source = LiveDataSource("liveProjection.json", topic="projection")
+events_source = LiveDataSource("raceEvents.json", topic="events")
+gap_history = GapHistory()  # Fed by a follower thread, or by the prefork layout builder
+gap_series = SeriesCache(encode)
+assets = AssetManifest()
+# Set in prefork workers: read endpoints serve the builder's pre-encoded bundle
+shared_layouts = None
+
+
+@app.context_processor
+def inject_asset_url():
+    return {"asset_url": assets.url}
+
+
+@app.before_request
+def follow_gap_history():
+    """
+    Start recording gap history with the first request, however the app is
+    served (python webDisplay.py, flask run, a WSGI server). Prefork
+    workers read the builder's history instead.
+    """
+    if shared_layouts is None:
+        gap_history.follow(live_source)
 
 
 @app.route("/")
 def index():
     """Main display page"""
-    return render_template("pylon.html")
+    response = Response(render_template("pylon.html"), mimetype="text/html")
+    # Small and always revalidated - it names the current asset hashes
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+@app.route("/static/<path:filename>")
+def static_asset(filename):
+    """
+    Bundled CSS/JS/fonts from memory
+
+    Hashed names are cached by the browser for a year; plain names are
+    revalidated. Text assets are sent gzipped when the client accepts it.
+    """
+    asset, immutable = assets.lookup(filename)
+    if asset is None:
+        abort(404)
+
+    gzipped = asset.gzipped and accepts_gzip(request.headers.get("Accept-Encoding"))
+    etag = asset.gzip_etag if gzipped else asset.etag
+
+    if request.headers.get("If-None-Match") == etag:
+        response = Response(status=304)
+    elif gzipped:
+        response = Response(asset.gzipped, mimetype=asset.mimetype)
+        response.headers["Content-Encoding"] = "gzip"
+    else:
+        response = Response(asset.body, mimetype=asset.mimetype)
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = IMMUTABLE if immutable else "no-cache"
+    if asset.gzipped:
+        response.headers["Vary"] = "Accept-Encoding"
+    return response
+
+
+@app.route("/sw.js")
+def service_worker():
+    """Service worker that precaches the page shell and hashed assets"""
+    precache = ["/"] + [asset.url for asset in assets.assets.values()]
+    body = render_template("sw.js", version=assets.version, precache=precache)
+    response = Response(body, mimetype="application/javascript")
+    response.headers["Cache-Control"] = "no-cache"
+    return response
 
 
 @app.route("/api/data")
@@ -39,17 +142,28 @@ def get_data():
     """API endpoint that returns current pylon data"""
     global current_mode, scroll_offset
 
+    if shared_layouts is not None:
+        bundle = shared_layouts.get()
+        current_mode = bundle["mode"]
+        if bundle["data"]:
+            # Workers don't share a counter, so the window follows the clock
+            # and every worker serves the same one
+            step = int(time.time() / DATA_SCROLL_INTERVAL)
+            body = bundle["data"][step % len(bundle["data"])]
+        elif bundle["idle"]:
+            body = bundle["idle"]["points" if int(time.time() / 10) % 2 == 0 else "schedule"]
+        else:
+            return jsonify({"mode": current_mode, "timestamp": datetime.now().isoformat()})
+        return Response(body, mimetype="application/json")
+
     # Load schedules
     schedules = load_all_schedules()
 
-    # Try to load live data
-    try:
-        live_data = load_json("liveRace.json")
-    except:
-        live_data = None
+    # Latest live data (pushed by the poller, or read from liveRace.json)
+    live_data = live_source.get()
 
     # Determine mode
-    current_mode = determine_state(live_data, schedules)
+    current_mode = mode_controller.get_mode(live_data, schedules)
 
     response = {"mode": current_mode, "timestamp": datetime.now().isoformat()}
 
@@ -69,8 +183,6 @@ def get_data():
 
     elif current_mode == "IDLE":
         # Alternate between points and schedule
-        import time
-
         cycle_time = int(time.time() / 10) % 2
 
         if cycle_time == 0:
@@ -90,29 +202,276 @@ def get_data():
     return jsonify(response)
 
 
+@app.route("/api/live")
+def get_live():
+    """
+    Full running order, long-polled
+
+    Returns the whole field once per snapshot instead of a 10-row window
+    per scroll step; the display scrolls positions 11+ locally. Pass the
+    last `version` as `since` and the request is held (up to `wait`
+    seconds) until the poller publishes a newer snapshot.
+    """
+    global current_mode
+
+    since = request.args.get("since")
+    wait = min(request.args.get("wait", LONG_POLL_TIMEOUT, type=float), LONG_POLL_TIMEOUT)
+
+    if shared_layouts is not None:
+        if since is None:
+            bundle = shared_layouts.get()
+        else:
+            bundle = shared_layouts.wait_for_version(since, wait)
+        current_mode = bundle["mode"]
+        return Response(bundle["live"], mimetype="application/json")
+
+    if since is None:
+        live_data = live_source.get()
+    else:
+        live_data = live_source.wait_for_change(since, wait)
+
+    current_mode = mode_controller.get_mode(live_data, load_all_schedules())
+
+    response = {
+        "mode": current_mode,
+        "timestamp": datetime.now().isoformat(),
+        "version": snapshot_version(live_data),
+        "data": None,
+    }
+    if current_mode == "LIVE" and live_data:
+        response["data"] = build_full_field_layout(live_data)
+
+    return jsonify(response)
+
+
+@app.route("/api/points/live")
+def get_live_points():
+    """Projected championship points for the race in progress"""
+    if shared_layouts is not None:
+        return Response(shared_layouts.get()["projection"], mimetype="application/json")
+
+    projection = projection_source.get()
+    if not projection:
+        return jsonify({"mode": current_mode, "data": None})
+
+    return jsonify(
+        {"mode": current_mode, "data": build_projected_points_layout(projection)}
+    )
+
+
+@app.route("/api/events")
+def get_events():
+    """
+    Race event ticker feed (lead changes, flags, pit stops, ...)
+
+    Pass the last seen `lastId` as `since` to get only newer events;
+    `types` is an optional comma-separated filter.
+    """
+    since = request.args.get("since", 0, type=int)
+    limit = max(1, min(request.args.get("limit", EVENTS_LIMIT, type=int), EVENTS_LIMIT))
+    types = request.args.get("types")
+    types = set(types.split(",")) if types else None
+
+    if shared_layouts is not None:
+        log = shared_layouts.get()["events"]
+    else:
+        log = events_source.get()
+    return jsonify(events_since(log, since, limit, types))
+
+
+@app.route("/api/history/gaps")
+def get_gap_history():
+    """
+    Gap-to-leader series per car for charts, downsampled to `points`
+
+    Every car gets at most `points` samples (LTTB, so the shape survives)
+    whatever the race length. Without `race` this is the race in progress;
+    `race` names an archived race (data/archive/<race>.npz).
+    """
+    budget = clamp_budget(request.args.get("points", type=int))
+    race = request.args.get("race")
+
+    if shared_layouts is not None:
+        history = shared_layouts.get()["gaps"]
+        load = lambda: history
+    else:
+        history = {"race": gap_history.race, "version": gap_history.version}
+        load = gap_history.matrices
+
+    if race and race != (history or {}).get("race"):
+        if archive_path(race) is None:
+            abort(404)
+        body = gap_series.get(race, "archive", budget, lambda: load_archived_history(race))
+    elif not history or not history.get("race"):
+        return jsonify({"race": None, "version": "", "budget": budget, "polls": 0, "cars": {}})
+    else:
+        body = gap_series.get(history["race"], history["version"], budget, load)
+    return Response(body, mimetype="application/json")
+
+
 @app.route("/api/status")
 def get_status():
-    """System status endpoint"""
-    try:
-        live_data = load_json("liveRace.json")
-        last_update = live_data.get("lastUpdate", "Unknown")
-    except:
-        last_update = "No data"
+    """
+    System status endpoint
+
+    Served from the poller heartbeat (one stat() per request, re-read only
+    when it changes) - liveRace.json is never parsed here.
+    """
+    global current_mode
+
+    if shared_layouts is not None:
+        current_mode = shared_layouts.get()["mode"]
+
+    status = heartbeat.status()
+    last_update = status.get("lastSuccess") or "No data"
 
     return jsonify(
-        {"mode": current_mode, "lastUpdate": last_update, "server": "running"}
+        {
+            "mode": current_mode,
+            "lastUpdate": last_update,
+            "dataAge": status["dataAge"],
+            "stale": status["stale"],
+            "poller": status,
+            "server": "running",
+        }
+    )
+
+
+def run_worker(sock, host, wake_fd):
+    """Body of one prefork worker: serve on the inherited listening socket"""
+    from werkzeug.serving import make_server
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # The parent shuts workers down
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    shared_layouts.listen(wake_fd)
+    make_server(host, sock.getsockname()[1], app, threaded=True, fd=sock.fileno()).serve_forever()
+
+
+def run_builder(writer):
+    """Body of the prefork builder process: rebuild the shared bundle per snapshot"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    writer.resume()
+    builder = LayoutBuilder(
+        writer, live_source, projection_source, mode_controller, events_source, gap_history
     )
+    builder.build_once()
+    builder.run()
+
+
+def serve_prefork(host, port, workers):
+    """
+    Production mode: N worker processes accepting on one shared socket
+
+    The parent binds the socket, creates the shared segment and one wake
+    pipe per worker, then only supervises: it forks a builder process
+    (src/layoutCache.py - builds layouts once per snapshot) and the
+    workers, and re-forks any that die. The parent never starts a thread,
+    so every fork - including respawns - happens in a single-threaded
+    process. Workers only copy pre-encoded responses out.
+    """
+    global shared_layouts
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(128)
+    sock.set_inheritable(True)
+
+    pipes = ChangePipes(workers)
+    writer = SharedLayoutWriter(notify=pipes.notify)
+    shared_layouts = SharedLayoutReader(writer.shm)
+
+    def fork(body):
+        pid = os.fork()
+        if pid == 0:
+            try:
+                body()
+            finally:
+                os._exit(0)
+        return pid
+
+    def spawn(role):
+        if role == "builder":
+            def body():
+                sock.close()
+                pipes.keep_writers()
+                run_builder(writer)
+        else:
+            def body():
+                run_worker(sock, host, pipes.keep_reader(role))
+        return fork(body)
+
+    def stop(signum, frame):
+        # A group-wide SIGTERM (timeout, systemd) arrives more than once -
+        # don't let a repeat interrupt the cleanup below
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        raise SystemExit(0)
+
+    children = {}  # pid -> "builder" or worker slot
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        children[spawn("builder")] = "builder"
+
+        # Workers have something to serve from the start
+        deadline = time.monotonic() + BUILDER_START_TIMEOUT
+        while shared_layouts.sequence() < 2 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        if shared_layouts.get() is None:
+            raise RuntimeError("layout builder produced no bundle")
+
+        for slot in range(workers):
+            children[spawn(slot)] = slot
+        pids = sorted(pid for pid, role in children.items() if role != "builder")
+        print(f"🔀 {workers} workers (PIDs {', '.join(map(str, pids))})")
+
+        while True:
+            pid, status = os.wait()
+            role = children.pop(pid, None)
+            if role is not None:
+                name = "Layout builder" if role == "builder" else "Worker"
+                print(f"⚠️  {name} {pid} exited ({status}), restarting")
+                children[spawn(role)] = role
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+        sock.close()
+        pipes.close()
+        writer.close()
 
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="NASCAR Pylon web display")
+    parser.add_argument("--host", default="0.0.0.0", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=5000, help="Port to listen on")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Prefork this many worker processes (production; one per core)")
+    args = parser.parse_args()
+
     print("=" * 60)
     print("NASCAR PYLON WEB DISPLAY")
     print("=" * 60)
     print("\nStarting web server...")
     print("Access from any device at:")
-    print("  http://localhost:5000")
-    print("  http://<your-server-ip>:5000")
+    print(f"  http://localhost:{args.port}")
+    print(f"  http://<your-server-ip>:{args.port}")
     print("\nPress Ctrl+C to stop\n")
+    if assets.missing:
+        print(f"⚠️  {len(assets.missing)} file(s) the CSS references are missing (fonts: run tools/fetchFonts.py) - "
+              "displays use installed or fallback fonts")
 
-    # Run on all interfaces so you can access remotely
-    app.run(host="0.0.0.0", port=5000, debug=False)
+    if args.workers > 1 and hasattr(os, "fork"):
+        serve_prefork(args.host, args.port, args.workers)
+    else:
+        if args.workers > 1:
+            print("⚠️  fork() not available - running a single process")
+        # Run on all interfaces so you can access remotely
+        app.run(host=args.host, port=args.port, debug=False)